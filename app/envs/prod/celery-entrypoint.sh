@@ -1,6 +1,10 @@
 #!/bin/sh
 set -eu
 
+# workers write their metrics to a subdirectory of the directory shared with the app, which serves /metrics
+if [ -n "${PROMETHEUS_MULTIPROC_DIR:-}" ]; then
+    export PROMETHEUS_MULTIPROC_DIR="$PROMETHEUS_MULTIPROC_DIR/celery"
+fi
 ./prometheus-cleanup.sh
 
 # below we define two workers types (each may have any concurrency);
@@ -1,6 +1,14 @@
 import multiprocessing
+import os
+
+from prometheus_client import multiprocess
 
 workers = 2 * multiprocessing.cpu_count() + 1
 bind = "0.0.0.0:8000"
 wsgi_app = "auto_validator.wsgi:application"
 access_logfile = "-"
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,2 +1,10 @@
 #!/bin/sh
-# No Prometheus clean up required as metrics are disabled.
+# Delete the metrics files left by the previous run of this container's processes;
+# subdirectories belong to other containers sharing the directory.
+if [ -n "${PROMETHEUS_MULTIPROC_DIR:-}" ]; then
+    if [ -d "$PROMETHEUS_MULTIPROC_DIR" ]; then
+        find "$PROMETHEUS_MULTIPROC_DIR" -maxdepth 1 -type f -name '*.db' -delete
+    else
+        mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+    fi
+fi
@@ -1,10 +1,33 @@
+"""
+ASGI application of the websocket service, which serves /ws/ only.
+
+HTTP stays on the WSGI app: Django's ASGI handler receives the whole request body before any middleware
+or view runs, which would defeat the upload checks made before the body is parsed.
+"""
+
 import os
 
+from channels.auth import AuthMiddlewareStack
+from channels.routing import ProtocolTypeRouter, URLRouter
+from channels.security.websocket import AllowedHostsOriginValidator
 from django.core.asgi import get_asgi_application
 
 # init django before importing urls
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "auto_validator.settings")
-http_app = get_asgi_application()
+get_asgi_application()
+
+from .urls import ws_urlpatterns  # noqa: E402
+
+
+async def http_not_found(scope, receive, send):
+    # answered without receiving the request body
+    await send({"type": "http.response.start", "status": 404, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"Not Found"})
 
 
-application = http_app
+application = ProtocolTypeRouter(
+    {
+        "http": http_not_found,
+        "websocket": AllowedHostsOriginValidator(AuthMiddlewareStack(URLRouter(ws_urlpatterns))),
+    }
+)
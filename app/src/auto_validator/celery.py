@@ -2,9 +2,10 @@ import logging
 import os
 
 from celery import Celery
-from celery.signals import setup_logging
+from celery.signals import setup_logging, worker_process_shutdown
 from django.conf import settings
 from django_structlog.celery.steps import DjangoStructLogInitStep
+from prometheus_client import multiprocess
 
 from .settings import configure_structlog
 
@@ -28,5 +29,11 @@ def receiver_setup_logging(loglevel, logfile, format, colorize, **kwargs):  # pr
     configure_structlog()
 
 
+@worker_process_shutdown.connect
+def receiver_worker_process_shutdown(pid, **kwargs):  # pragma: no cover
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
+
+
 def route_task(name, args, kwargs, options, task=None, **kw):
     return {"queue": "celery"}
@@ -1,12 +1,15 @@
 from django.contrib import admin
-from django.db.models import Case, IntegerField, Value, When
 from django.shortcuts import redirect
 from django.urls import path, reverse
 from rest_framework.authtoken.admin import TokenAdmin
 
 from auto_validator.core.models import (
+    ChainCursor,
+    DeletedFile,
+    FileContent,
     Hotkey,
     Operator,
+    RemediationAction,
     Server,
     Subnet,
     SubnetSlot,
@@ -25,8 +28,46 @@ TokenAdmin.raw_id_fields = ["user"]
 @admin.register(UploadedFile)
 class UploadedFileAdmin(admin.ModelAdmin):
     list_display = ("file_name", "file_size", "hotkey", "description", "created_at")
-    list_filter = ("hotkey", "created_at", "file_size")
+    list_filter = ("created_at",)
     search_fields = ("file_name",)
+    raw_id_fields = ("hotkey", "subnet_slot", "content")
+    list_select_related = ("hotkey",)
+
+
+@admin.register(DeletedFile)
+class DeletedFileAdmin(admin.ModelAdmin):
+    list_display = ("file_name", "file_size", "hotkey", "reason", "created_at", "deleted_at")
+    list_filter = ("reason", "deleted_at")
+    search_fields = ("file_name", "hotkey")
+    readonly_fields = [field.name for field in DeletedFile._meta.fields]
+
+
+@admin.register(FileContent)
+class FileContentAdmin(admin.ModelAdmin):
+    list_display = ("sha256", "size", "stored_size", "ref_count", "created_at")
+    search_fields = ("sha256",)
+    readonly_fields = [field.name for field in FileContent._meta.fields]
+
+
+class RegisteredNetworkFilter(admin.SimpleListFilter):
+    title = "registered networks"
+    parameter_name = "registered_network"
+
+    def lookups(self, request, model_admin):
+        return (
+            ("mainnet", "Mainnet"),
+            ("testnet", "Testnet"),
+            ("none", "Not registered"),
+        )
+
+    def queryset(self, request, queryset):
+        if self.value() == "mainnet":
+            return queryset.filter(registered_mainnet_netuid__isnull=False)
+        if self.value() == "testnet":
+            return queryset.filter(registered_testnet_netuid__isnull=False)
+        if self.value() == "none":
+            return queryset.filter(registered_mainnet_netuid__isnull=True, registered_testnet_netuid__isnull=True)
+        return queryset
 
 
 @admin.register(Subnet)
@@ -39,6 +80,16 @@ class SubnetAdmin(admin.ModelAdmin):
         "registered_networks",
     )
     search_fields = ("name", "slots__netuid")
+    list_filter = (RegisteredNetworkFilter,)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_registered_netuids()
+
+    def registered_networks(self, obj):
+        return obj.registered_networks()
+
+    registered_networks.admin_order_field = "registered_mainnet_netuid"
+    registered_networks.short_description = "Registered Networks"
 
     def create_server(self, request, queryset):
         subnet = queryset.first()
@@ -67,12 +118,13 @@ class SubnetSlotAdmin(admin.ModelAdmin):
         "blockchain",
         "netuid",
         "is_registered",
+        "active_since",
         "max_registration_price_RAO",
         "registration_block",
         "deregistration_block",
     )
     search_fields = ("subnet__name", "netuid")
-    list_filter = ("blockchain",)
+    list_filter = ("blockchain", "is_registered")
     list_select_related = ("subnet", "registration_block", "deregistration_block")
 
     def registration_block(self, obj):
@@ -88,24 +140,10 @@ class SubnetSlotAdmin(admin.ModelAdmin):
     def max_registration_price_RAO(self, obj):
         return f"{obj.maximum_registration_price} RAO"
 
-    def is_registered(self, obj):
-        return obj.registration_block is not None and obj.deregistration_block is None
-
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        qs = qs.annotate(
-            is_registered_sort=Case(
-                When(registration_block__isnull=False, deregistration_block__isnull=True, then=Value(1)),
-                default=Value(0),
-                output_field=IntegerField(),
-            )
-        )
         return qs.order_by("blockchain", "netuid")
 
-    is_registered.boolean = True
-    is_registered.admin_order_field = "is_registered_sort"
-    is_registered.short_description = "Is Registered"
-
 
 @admin.register(ValidatorInstance)
 class ValidatorInstanceAdmin(admin.ModelAdmin):
@@ -139,3 +177,17 @@ class OperatorAdmin(admin.ModelAdmin):
 class HotkeyAdmin(admin.ModelAdmin):
     list_display = ("hotkey", "is_mother")
     search_fields = ("hotkey",)
+
+
+@admin.register(ChainCursor)
+class ChainCursorAdmin(admin.ModelAdmin):
+    list_display = ("blockchain", "last_block", "updated_at")
+
+
+@admin.register(RemediationAction)
+class RemediationActionAdmin(admin.ModelAdmin):
+    list_display = ("validator_instance", "kind", "status", "blocks_behind", "threshold", "created_at", "finished_at")
+    list_filter = ("kind", "status", "validator_instance__subnet_slot__blockchain")
+    search_fields = ("validator_instance__hotkey__hotkey", "validator_instance__server__ip_address")
+    list_select_related = ("validator_instance__hotkey",)
+    readonly_fields = [field.name for field in RemediationAction._meta.fields]
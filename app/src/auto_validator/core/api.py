@@ -1,40 +1,154 @@
+import hashlib
 import logging
+import math
 import pathlib
 
 from django.conf import settings
-from rest_framework import mixins, parsers, routers, status, viewsets
-from rest_framework.exceptions import AuthenticationFailed
+from django.contrib.postgres.search import SearchHeadline, SearchQuery
+from django.db import transaction
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.utils.dateparse import parse_datetime
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import mixins, pagination, parsers, routers, status, viewsets
+from rest_framework.exceptions import AuthenticationFailed, Throttled, ValidationError
 from rest_framework.permissions import AllowAny
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
-from auto_validator.core.models import Hotkey, Server, UploadedFile, ValidatorInstance
-from auto_validator.core.serializers import UploadedFileSerializer
+from auto_validator.core.models import DeletedFile, Hotkey, Server, UploadedFile, ValidatorInstance
+from auto_validator.core.serializers import (
+    LogSearchResultSerializer,
+    ServerStatusSerializer,
+    UploadedFileSerializer,
+    ValidatorStatusSerializer,
+)
 from auto_validator.core.utils.utils import get_user_ip
 
+from . import metrics, tasks
 from .authentication import HotkeyAuthentication
+from .upload_handlers import UploadSizeLimitHandler, UploadTooLarge
+from .utils import log_index, rate_limit, status_updates
 from .utils.bot import trigger_bot_send_message
+from .utils.config_snapshot import config
+from .utils.redis_pool import get_redis_client
 from .utils.utils import get_dumper_commands
 
 SUBNETS_CONFIG_PATH = pathlib.Path(settings.LOCAL_SUBNETS_SCRIPTS_PATH) / "subnets.yaml"
+# allowance for the multipart boundaries and part headers around the uploaded file
+MULTIPART_OVERHEAD = 64 * 1024
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
-class FilesViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+def get_content_length(request) -> int:
+    try:
+        return int(request.headers.get("Content-Length") or 0)
+    except ValueError:
+        return 0
+
+
+def filter_uploaded_files(queryset, query_params):
+    """
+    Filter uploaded files by the `created_after`, `created_before` and `subnet` (netuid or codename) query parameters.
+    """
+    for param, lookup in (("created_after", "created_at__gte"), ("created_before", "created_at__lt")):
+        if value := query_params.get(param):
+            try:
+                created_at = parse_datetime(value)
+            except ValueError:
+                created_at = None
+            if created_at is None:
+                raise ValidationError({param: "Invalid datetime"})
+            queryset = queryset.filter(**{lookup: created_at})
+    if subnet := query_params.get("subnet"):
+        if subnet.isdigit():
+            queryset = queryset.filter(subnet_slot__netuid=int(subnet))
+        else:
+            queryset = queryset.filter(subnet_slot__subnet__codename=subnet)
+    return queryset
+
+
+class FilesCursorPagination(pagination.CursorPagination):
+    # (hotkey, created_at) is indexed, so every page is an index range scan however many files a hotkey has
+    ordering = "created_at"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class FilesViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
     serializer_class = UploadedFileSerializer
     parser_classes = [parsers.MultiPartParser]
     authentication_classes = [HotkeyAuthentication]
     permission_classes = [AllowAny]
+    pagination_class = FilesCursorPagination
+    lookup_field = "storage_file_name"
+    lookup_value_regex = "[^/]+"
+
+    def initial(self, request, *args, **kwargs):
+        # before authentication, which parses the whole multipart body to verify its signature
+        if request.method == "POST":
+            self.reject_early(request)
+            self.check_upload_rate_limit(request)
+        super().initial(request, *args, **kwargs)
+        if request.method == "POST":
+            self.charge_hotkey_upload(request)
+
+    def reject_early(self, request):
+        """
+        Reject uploads whose headers are invalid or announce a too large body, and limit the size of the rest as
+        they are being parsed.
+        """
+        HotkeyAuthentication().verify_headers(request)
+        max_size = config.API_UPLOAD_MAX_SIZE
+        if get_content_length(request) > max_size + MULTIPART_OVERHEAD:
+            raise UploadTooLarge(f"File size must be < {max_size}B")
+        request.upload_handlers.insert(0, UploadSizeLimitHandler(max_size, request))
+
+    def check_upload_rate_limit(self, request):
+        hotkey = request.headers.get("Hotkey")
+        wait = rate_limit.check_upload_rate_limit(hotkey, get_user_ip(request), get_content_length(request))
+        self.throttle_upload(wait)
+
+    def charge_hotkey_upload(self, request):
+        # only once the signature is verified, as anyone can send requests with the hotkey of a validator
+        hotkey = request.headers.get("Hotkey")
+        self.throttle_upload(rate_limit.charge_hotkey_upload(hotkey, get_content_length(request)))
+
+    def throttle_upload(self, wait: float):
+        if wait:
+            metrics.UPLOADS_RATE_LIMITED.inc()
+            if math.isinf(wait):
+                raise Throttled(detail="Upload is larger than the upload budget.")
+            raise Throttled(wait=wait)
 
     def get_queryset(self):
-        hotkey_str = self.request.headers.get("Hotkey")
+        queryset = UploadedFile.objects.filter(hotkey__hotkey=self.request.headers.get("Hotkey"))
+        if self.action != "list":
+            return queryset
+        return filter_uploaded_files(queryset, self.request.query_params)
+
+    def retrieve(self, request, *args, **kwargs):
         try:
-            hotkey = Hotkey.objects.get(hotkey=hotkey_str)
-        except Hotkey.DoesNotExist:
-            return []
-        return UploadedFile.objects.filter(hotkey=hotkey).order_by("id")
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            deleted_file = DeletedFile.objects.filter(
+                storage_file_name=kwargs["storage_file_name"], hotkey=request.headers.get("Hotkey")
+            ).first()
+            if deleted_file is None:
+                raise
+        return Response(
+            {
+                "detail": "The file was deleted by the retention policy of its subnet.",
+                "file_name": deleted_file.file_name,
+                "reason": deleted_file.reason,
+                "deleted_at": deleted_file.deleted_at,
+            },
+            status=status.HTTP_410_GONE,
+        )
 
+    @metrics.UPLOAD_DURATION.time()
     def perform_create(self, serializer):
         note = self.request.headers.get("Note")
         hotkey_str = self.request.headers.get("Hotkey")
@@ -48,13 +162,19 @@ class FilesViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, viewsets.Gene
         except ValidatorInstance.DoesNotExist:
             raise AuthenticationFailed("Invalid Hotkey")
         uploaded_file = serializer.save(
+            subnet_slot=subnetslot,
             meta_info={
                 "note": note,
                 "hotkey": hotkey_str,
                 "subnet_name": subnetslot.subnet.name,
                 "netuid": subnetslot.netuid,
-            }
+            },
         )
+        metrics.UPLOAD_SIZE.observe(uploaded_file.file_size)
+        transaction.on_commit(
+            lambda: status_updates.publish_upload(uploaded_file, subnetslot.subnet.name, subnetslot.netuid)
+        )
+        transaction.on_commit(lambda: tasks.index_uploaded_file.delay(uploaded_file.id))
         file_url = uploaded_file.get_full_url(self.request)
         trigger_bot_send_message(
             channel_name=channel_name, message=(f"{note}\n" f"New validator logs:\n" f"{file_url}"), realm=realm
@@ -79,6 +199,84 @@ class DumperCommandsViewSet(viewsets.ViewSet):
             return Response({"error": "SubnetID not found"}, status=status.HTTP_404_NOT_FOUND)
 
 
+class StatusCursorPagination(pagination.CursorPagination):
+    ordering = "id"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class CachedListMixin:
+    """
+    Serve list responses from a short-lived Redis cache shared by all workers, with an ETag for conditional GETs.
+
+    Responses are cached by URL only, so this is for data that is the same for all authenticated users.
+    """
+
+    def list(self, request, *args, **kwargs):
+        redis_client = get_redis_client()
+        cache_key = "api_cache:" + hashlib.sha256(request.build_absolute_uri().encode()).hexdigest()
+        content = redis_client.get(cache_key)
+        if content is None:
+            response = super().list(request, *args, **kwargs)
+            content = JSONRenderer().render(response.data)
+            redis_client.set(cache_key, content, ex=settings.STATUS_API_CACHE_SECONDS)
+        etag = quote_etag(hashlib.sha256(content).hexdigest())
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return HttpResponseNotModified(headers={"ETag": etag})
+        return HttpResponse(content, content_type="application/json", headers={"ETag": etag})
+
+
+class ValidatorStatusViewSet(CachedListMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    queryset = ValidatorInstance.objects.select_related("hotkey", "subnet_slot__subnet", "server")
+    serializer_class = ValidatorStatusSerializer
+    pagination_class = StatusCursorPagination
+
+
+class ServerStatusViewSet(CachedListMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    queryset = Server.objects.select_related("validator_instances__hotkey", "validator_instances__subnet_slot__subnet")
+    serializer_class = ServerStatusSerializer
+    pagination_class = StatusCursorPagination
+
+
+class LogSearchPagination(pagination.CursorPagination):
+    ordering = "-created_at"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class LogSearchViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Search the indexed uploads, newest first.
+
+    `q` is a web search style query over the error lines and tracebacks, `exception` an exception type raised
+    in the log; results can be narrowed down with `hotkey`, `subnet`, `created_after` and `created_before`.
+    """
+
+    serializer_class = LogSearchResultSerializer
+    pagination_class = LogSearchPagination
+
+    def get_queryset(self):
+        query_params = self.request.query_params
+        queryset = UploadedFile.objects.filter(log_index__isnull=False).select_related(
+            "hotkey", "subnet_slot__subnet", "log_index"
+        )
+        queryset = filter_uploaded_files(queryset, query_params)
+        if hotkey := query_params.get("hotkey"):
+            queryset = queryset.filter(hotkey__hotkey=hotkey)
+        if exception := query_params.get("exception"):
+            queryset = queryset.filter(log_index__exceptions__contains=[exception])
+        if q := query_params.get("q"):
+            query = SearchQuery(q, config=log_index.SEARCH_CONFIG, search_type="websearch")
+            queryset = queryset.filter(log_index__search_vector=query).annotate(
+                headline=SearchHeadline(
+                    "log_index__excerpt", query, config=log_index.SEARCH_CONFIG, max_fragments=3, min_words=5
+                )
+            )
+        return queryset
+
+
 class APIRootView(routers.DefaultRouter.APIRootView):
     description = "api-root"
 
@@ -90,3 +288,6 @@ class APIRouter(routers.DefaultRouter):
 router = APIRouter()
 router.register(r"files", FilesViewSet, basename="file")
 router.register(r"commands", DumperCommandsViewSet, basename="commands")
+router.register(r"validators", ValidatorStatusViewSet, basename="validator")
+router.register(r"servers", ServerStatusViewSet, basename="server")
+router.register(r"log-search", LogSearchViewSet, basename="log-search")
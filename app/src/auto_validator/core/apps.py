@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = "auto_validator.core"
+
+    def ready(self):
+        # connects the receiver dropping the snapshot when a setting is changed
+        from .utils import config_snapshot  # noqa: F401
@@ -5,30 +5,54 @@ from bittensor import Keypair
 from django.conf import settings
 from rest_framework import authentication, exceptions
 
+from . import metrics
 from .models import Hotkey
 
 
+def authentication_failed(reason: str, detail: str) -> exceptions.AuthenticationFailed:
+    metrics.AUTHENTICATION_FAILURES.labels(reason=reason).inc()
+    return exceptions.AuthenticationFailed(detail)
+
+
 class HotkeyAuthentication(authentication.BaseAuthentication):
     def authenticate(self, request):
+        if request.method.upper() == "GET":
+            return (None, None)
+        with metrics.AUTHENTICATION_DURATION.time():
+            return self.authenticate_signed_request(request)
+
+    def verify_headers(self, request):
+        """
+        Check what can be checked from the headers alone; uploads do so before their body is parsed.
+        """
+        if getattr(request, "_hotkey_headers_verified", False):
+            return
         hotkey_address = request.headers.get("Hotkey")
         nonce = request.headers.get("Nonce")
         signature = request.headers.get("Signature")
-        method = request.method.upper()
-        url = request.build_absolute_uri()
-
-        if method == "GET":
-            return (None, None)
 
         if not hotkey_address or not nonce or not signature:
-            raise exceptions.AuthenticationFailed("Missing authentication headers.")
+            raise authentication_failed("missing_headers", "Missing authentication headers.")
 
-        nonce_float = float(nonce)
+        try:
+            nonce_float = float(nonce)
+        except ValueError:
+            raise authentication_failed("invalid_nonce", "Invalid nonce")
         current_time = time.time()
         if abs(current_time - nonce_float) > int(settings.SIGNATURE_EXPIRE_DURATION):
-            raise exceptions.AuthenticationFailed("Invalid nonce")
+            raise authentication_failed("invalid_nonce", "Invalid nonce")
 
         if not Hotkey.objects.filter(hotkey=hotkey_address).exists():
-            raise exceptions.AuthenticationFailed("Unauthorized hotkey.")
+            raise authentication_failed("unknown_hotkey", "Unauthorized hotkey.")
+        request._hotkey_headers_verified = True
+
+    def authenticate_signed_request(self, request):
+        self.verify_headers(request)
+        hotkey_address = request.headers.get("Hotkey")
+        nonce = request.headers.get("Nonce")
+        signature = request.headers.get("Signature")
+        method = request.method.upper()
+        url = request.build_absolute_uri()
 
         client_headers = {
             "Nonce": nonce,
@@ -54,9 +78,9 @@ class HotkeyAuthentication(authentication.BaseAuthentication):
                 data=data_to_sign, signature=bytes.fromhex(signature)
             )
         except Exception as e:
-            raise exceptions.AuthenticationFailed(f"Signature verification failed: {e}")
+            raise authentication_failed("invalid_signature", f"Signature verification failed: {e}")
 
         if not is_valid:
-            raise exceptions.AuthenticationFailed("Invalid signature.")
+            raise authentication_failed("invalid_signature", "Invalid signature.")
 
         return (None, None)
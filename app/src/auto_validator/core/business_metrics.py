@@ -0,0 +1,126 @@
+"""
+Gauges computed from the database when metrics are scraped.
+
+Each group of gauges comes from a single grouped query, and the results are shared by all web workers
+through Redis for `BUSINESS_METRICS_CACHE_SECONDS`, so frequent scrapes cost one round of queries per interval.
+"""
+
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from .models import SubnetSlot, UploadedFile, ValidatorInstance
+from .utils.redis_pool import get_redis_client
+
+CACHE_KEY = "business_metrics"
+SUBNET_LABELS = ["subnet", "blockchain"]
+UPLOAD_WINDOWS = {"1h": timedelta(hours=1), "24h": timedelta(days=1)}
+
+GAUGES = {
+    "auto_validator_registered_slots": ("Registered subnet slots", SUBNET_LABELS),
+    "auto_validator_validator_instances": ("Validator instances", SUBNET_LABELS),
+    "auto_validator_running_validator_instances": ("Validator instances which are up", SUBNET_LABELS),
+    "auto_validator_validators_behind": (
+        "Validators which last set weights more than METRICS_VALIDATOR_BEHIND_BLOCKS blocks ago",
+        SUBNET_LABELS,
+    ),
+    "auto_validator_validators_over_restart_threshold": (
+        "Validators which last set weights more than the restart threshold of their slot ago",
+        SUBNET_LABELS,
+    ),
+    "auto_validator_validators_over_reinstall_threshold": (
+        "Validators which last set weights more than the reinstall threshold of their slot ago",
+        SUBNET_LABELS,
+    ),
+    "auto_validator_uploaded_files": ("Files uploaded by validators in the window", [*SUBNET_LABELS, "window"]),
+    "auto_validator_uploaded_files_bytes": (
+        "Size of the files uploaded by validators in the window",
+        [*SUBNET_LABELS, "window"],
+    ),
+}
+
+Samples = dict[str, list[tuple[list[str], float]]]
+
+
+def collect_slots(samples: Samples) -> None:
+    rows = (
+        SubnetSlot.objects.registered().values_list("subnet__name", "blockchain").annotate(count=Count("id")).order_by()
+    )
+    for subnet_name, blockchain, count in rows:
+        samples["auto_validator_registered_slots"].append(([subnet_name or "", blockchain], count))
+
+
+def collect_validator_instances(samples: Samples) -> None:
+    # a threshold of 0 means it is not configured for the slot
+    over_restart = Q(subnet_slot__restart_threshold__gt=0, last_updated__gt=F("subnet_slot__restart_threshold"))
+    over_reinstall = Q(subnet_slot__reinstall_threshold__gt=0, last_updated__gt=F("subnet_slot__reinstall_threshold"))
+    rows = (
+        ValidatorInstance.objects.values_list("subnet_slot__subnet__name", "subnet_slot__blockchain")
+        .annotate(
+            total=Count("id"),
+            running=Count("id", filter=Q(status=True)),
+            behind=Count("id", filter=Q(last_updated__gt=settings.METRICS_VALIDATOR_BEHIND_BLOCKS)),
+            over_restart=Count("id", filter=over_restart),
+            over_reinstall=Count("id", filter=over_reinstall),
+        )
+        .order_by()
+    )
+    for subnet_name, blockchain, total, running, behind, restart, reinstall in rows:
+        labels = [subnet_name or "", blockchain]
+        samples["auto_validator_validator_instances"].append((labels, total))
+        samples["auto_validator_running_validator_instances"].append((labels, running))
+        samples["auto_validator_validators_behind"].append((labels, behind))
+        samples["auto_validator_validators_over_restart_threshold"].append((labels, restart))
+        samples["auto_validator_validators_over_reinstall_threshold"].append((labels, reinstall))
+
+
+def collect_uploads(samples: Samples) -> None:
+    now = timezone.now()
+    annotations = {}
+    for window, duration in UPLOAD_WINDOWS.items():
+        in_window = Q(created_at__gte=now - duration)
+        annotations[f"files_{window}"] = Count("id", filter=in_window)
+        annotations[f"bytes_{window}"] = Sum("file_size", filter=in_window)
+    rows = (
+        UploadedFile.objects.filter(created_at__gte=now - max(UPLOAD_WINDOWS.values()))
+        .values(subnet=F("subnet_slot__subnet__name"), blockchain=F("subnet_slot__blockchain"))
+        .annotate(**annotations)
+        .order_by()
+    )
+    for row in rows:
+        for window in UPLOAD_WINDOWS:
+            labels = [row["subnet"] or "", row["blockchain"] or "", window]
+            samples["auto_validator_uploaded_files"].append((labels, row[f"files_{window}"]))
+            samples["auto_validator_uploaded_files_bytes"].append((labels, row[f"bytes_{window}"] or 0))
+
+
+def compute_business_metrics() -> Samples:
+    samples: Samples = {name: [] for name in GAUGES}
+    collect_slots(samples)
+    collect_validator_instances(samples)
+    collect_uploads(samples)
+    return samples
+
+
+def get_business_metrics() -> Samples:
+    redis_client = get_redis_client()
+    if cached := redis_client.get(CACHE_KEY):
+        return json.loads(cached)
+    samples = compute_business_metrics()
+    redis_client.set(CACHE_KEY, json.dumps(samples), ex=settings.BUSINESS_METRICS_CACHE_SECONDS)
+    return samples
+
+
+class BusinessMetricsCollector(Collector):
+    def collect(self):
+        samples = get_business_metrics()
+        for name, (documentation, labels) in GAUGES.items():
+            gauge = GaugeMetricFamily(name, documentation, labels=labels)
+            for label_values, value in samples.get(name, []):
+                gauge.add_metric(label_values, value)
+            yield gauge
@@ -0,0 +1,26 @@
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .utils.status_updates import GROUP_NAME
+
+
+class ValidatorStatusConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Pushes batches of validator status, upload and installation updates to staff dashboards.
+
+    Each `status.batch` message from `flush_status_updates` becomes one frame:
+    `{"type": "status_batch", "validators": [...], "uploads": [...], "installs": [...]}`.
+    """
+
+    async def connect(self):
+        user = self.scope.get("user")
+        if user is None or not user.is_staff:
+            await self.close()
+            return
+        await self.channel_layer.group_add(GROUP_NAME, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        await self.channel_layer.group_discard(GROUP_NAME, self.channel_name)
+
+    async def status_batch(self, event):
+        await self.send_json({"type": "status_batch", **event["batch"]})
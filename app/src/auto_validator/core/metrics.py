@@ -0,0 +1,118 @@
+"""
+Prometheus metrics of the API, the Celery tasks and the Discord bot.
+
+In production the web and the Celery worker processes run with `PROMETHEUS_MULTIPROC_DIR` set, so
+each process writes its samples to files in that directory (Celery workers in a subdirectory of it)
+and `metrics_view` aggregates all of them.
+"""
+
+import glob
+import os
+
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from .business_metrics import BusinessMetricsCollector
+
+UPLOAD_SIZE_BUCKETS = tuple(2**exponent for exponent in range(10, 31, 2))
+
+AUTHENTICATION_DURATION = Histogram(
+    "auto_validator_authentication_duration_seconds",
+    "Time spent authenticating a hotkey-signed request",
+)
+AUTHENTICATION_FAILURES = Counter(
+    "auto_validator_authentication_failures",
+    "Hotkey-signed requests rejected by authentication",
+    ["reason"],
+)
+UPLOAD_DURATION = Histogram(
+    "auto_validator_upload_duration_seconds",
+    "Time spent storing an uploaded file and notifying its subnet channel",
+)
+UPLOAD_SIZE = Histogram(
+    "auto_validator_upload_size_bytes",
+    "Size of the uploaded files",
+    buckets=UPLOAD_SIZE_BUCKETS,
+)
+UPLOADS_RATE_LIMITED = Counter(
+    "auto_validator_uploads_rate_limited",
+    "Uploads rejected for exceeding the upload budget of their hotkey or server IP",
+)
+UPLOAD_COMPRESSION_RATIO = Histogram(
+    "auto_validator_upload_compression_ratio",
+    "Uncompressed to compressed size of newly stored upload content",
+    buckets=(1, 1.5, 2, 3, 5, 10, 20, 50, 100),
+)
+UPLOAD_BYTES_SAVED = Counter(
+    "auto_validator_upload_bytes_saved",
+    "Storage saved by compressing uploads and by storing identical content once",
+    ["reason"],
+)
+VALIDATOR_STATUS_UPDATE_DURATION = Histogram(
+    "auto_validator_validator_status_update_duration_seconds",
+    "Time spent polling the chain for the validators of a subnet slot",
+)
+FETCH_SUBNET_SCRIPTS_DURATION = Histogram(
+    "auto_validator_fetch_subnet_scripts_duration_seconds",
+    "Time spent cloning the subnet scripts repository",
+    buckets=(1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+REMEDIATION_ACTIONS = Counter(
+    "auto_validator_remediation_actions",
+    "Restarts and reinstalls of stale validators",
+    ["kind", "status"],
+)
+RETENTION_DELETED_FILES = Counter(
+    "auto_validator_retention_deleted_files",
+    "Uploaded files deleted by the retention policies",
+    ["reason"],
+)
+RETENTION_RECLAIMED_BYTES = Counter(
+    "auto_validator_retention_reclaimed_bytes",
+    "Storage reclaimed by deleting uploaded files",
+    ["reason"],
+)
+DISCORD_SEND_DURATION = Histogram(
+    "auto_validator_discord_send_duration_seconds",
+    "Time until a message is delivered to a subnet channel, including coalescing and rate limiting",
+    ["realm"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+DISCORD_SEND_QUEUE_DEPTH = Gauge(
+    "auto_validator_discord_send_queue_depth",
+    "Messages waiting to be sent to Discord channels",
+    multiprocess_mode="livemax",
+)
+
+
+class RecursiveMultiProcessCollector(multiprocess.MultiProcessCollector):
+    """
+    Collect the samples of all processes, including those writing to subdirectories of the metrics directory.
+    """
+
+    def collect(self):
+        files = glob.glob(os.path.join(self._path, "**/*.db"), recursive=True)
+        return self.merge(files, accumulate=True)
+
+
+def get_registry() -> CollectorRegistry:
+    registry = CollectorRegistry()
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        RecursiveMultiProcessCollector(registry)
+    else:
+        registry.register(REGISTRY)
+    registry.register(BusinessMetricsCollector())
+    return registry
+
+
+def metrics_view(request):
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
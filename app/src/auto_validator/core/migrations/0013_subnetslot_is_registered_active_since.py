@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-19 06:26
+
+from django.db import migrations, models
+
+
+def backfill_registration_state(apps, schema_editor):
+    SubnetSlot = apps.get_model("core", "SubnetSlot")
+    slots = SubnetSlot.objects.select_related("registration_block")
+    for slot in slots:
+        slot.is_registered = slot.registration_block_id is not None and (
+            slot.deregistration_block_id is None or slot.registration_block_id > slot.deregistration_block_id
+        )
+        slot.active_since = slot.registration_block.timestamp if slot.is_registered else None
+    SubnetSlot.objects.bulk_update(slots, ["is_registered", "active_since"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0012_rename_hw_requirements_subnet_hardware_description_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="subnetslot",
+            name="active_since",
+            field=models.DateTimeField(
+                blank=True,
+                db_comment="Timestamp of the registration block while the slot is registered",
+                editable=False,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="subnetslot",
+            name="is_registered",
+            field=models.BooleanField(
+                db_comment="Denormalized from registration_block and deregistration_block, maintained on save",
+                default=False,
+                editable=False,
+            ),
+        ),
+        migrations.RunPython(backfill_registration_state, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="subnetslot",
+            index=models.Index(
+                condition=models.Q(("is_registered", True)),
+                fields=["blockchain", "netuid"],
+                name="subnetslot_registered_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 06:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0013_subnetslot_is_registered_active_since"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChainCursor",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "blockchain",
+                    models.CharField(
+                        choices=[("mainnet", "Mainnet"), ("testnet", "Testnet")], max_length=50, unique=True
+                    ),
+                ),
+                (
+                    "last_block",
+                    models.PositiveIntegerField(db_comment="Last finalized block scanned for registration events"),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
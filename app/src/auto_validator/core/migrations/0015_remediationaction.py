@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-19 07:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0014_chaincursor"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RemediationAction",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("kind", models.CharField(choices=[("restart", "Restart"), ("reinstall", "Reinstall")], max_length=20)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("running", "Running"), ("succeeded", "Succeeded"), ("failed", "Failed")],
+                        default="running",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "blocks_behind",
+                    models.PositiveIntegerField(db_comment="`last_updated` of the validator when the action started"),
+                ),
+                ("threshold", models.IntegerField(db_comment="Threshold of the subnet slot which was exceeded")),
+                ("message", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "validator_instance",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="remediation_actions",
+                        to="core.validatorinstance",
+                    ),
+                ),
+            ],
+        ),
+    ]
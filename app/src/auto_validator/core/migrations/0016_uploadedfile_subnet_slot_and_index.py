@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 07:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0015_remediationaction"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="uploadedfile",
+            name="subnet_slot",
+            field=models.ForeignKey(
+                blank=True,
+                db_comment="Subnet slot of the validator which uploaded the file",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="uploaded_files",
+                to="core.subnetslot",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="uploadedfile",
+            index=models.Index(fields=["hotkey", "created_at"], name="uploadedfile_hotkey_created"),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-19 07:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0016_uploadedfile_subnet_slot_and_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeletedFile",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("storage_file_name", models.CharField(max_length=4095, unique=True)),
+                ("hotkey", models.CharField(max_length=48)),
+                ("file_name", models.CharField(max_length=4095)),
+                ("file_size", models.PositiveBigIntegerField(db_comment="File size in bytes")),
+                ("created_at", models.DateTimeField(db_comment="When the file was uploaded")),
+                ("deleted_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "reason",
+                    models.CharField(
+                        choices=[("max_age", "Max age"), ("max_bytes", "Max bytes per hotkey")], max_length=20
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="subnet",
+            name="log_max_bytes_per_hotkey",
+            field=models.PositiveBigIntegerField(
+                blank=True,
+                help_text="Bytes of uploaded log files kept per hotkey, oldest are deleted first, 0 for no limit; empty uses the default",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="subnet",
+            name="log_retention_days",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="Days to keep uploaded log files, 0 to keep them forever; empty uses the default",
+                null=True,
+            ),
+        ),
+    ]
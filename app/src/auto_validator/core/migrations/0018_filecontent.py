@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-19 07:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0017_subnet_log_retention_deletedfile"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FileContent",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "sha256",
+                    models.CharField(db_comment="SHA-256 of the uncompressed content", max_length=64, unique=True),
+                ),
+                ("storage_file_name", models.CharField(db_comment="File name (id) in Django Storage", max_length=4095)),
+                ("size", models.PositiveBigIntegerField(db_comment="Uncompressed size in bytes")),
+                ("stored_size", models.PositiveBigIntegerField(db_comment="Compressed size in bytes")),
+                (
+                    "ref_count",
+                    models.PositiveIntegerField(
+                        db_comment="Uploaded files with this content; unreferenced content is deleted by the retention task",
+                        default=0,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="uploadedfile",
+            name="content",
+            field=models.ForeignKey(
+                blank=True,
+                db_comment="Compressed content shared with identical files; `storage_file_name` then only identifies the file",
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="uploaded_files",
+                to="core.filecontent",
+            ),
+        ),
+    ]
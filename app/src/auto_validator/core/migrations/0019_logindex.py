@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-19 07:21
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0018_filecontent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LogIndex",
+            fields=[
+                (
+                    "uploaded_file",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="log_index",
+                        serialize=False,
+                        to="core.uploadedfile",
+                    ),
+                ),
+                ("excerpt", models.TextField(db_comment="Error lines and tracebacks of the log, truncated")),
+                (
+                    "search_vector",
+                    django.contrib.postgres.search.SearchVectorField(
+                        db_comment="Full-text index of `excerpt`", null=True
+                    ),
+                ),
+                (
+                    "exceptions",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.CharField(max_length=255),
+                        db_comment="Exception types raised in the log",
+                        default=list,
+                        size=None,
+                    ),
+                ),
+                ("error_count", models.PositiveIntegerField(default=0)),
+                ("traceback_count", models.PositiveIntegerField(default=0)),
+                ("first_timestamp", models.DateTimeField(blank=True, null=True)),
+                ("last_timestamp", models.DateTimeField(blank=True, null=True)),
+                ("indexed_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(fields=["search_vector"], name="logindex_search_vector"),
+                    django.contrib.postgres.indexes.GinIndex(fields=["exceptions"], name="logindex_exceptions"),
+                ],
+            },
+        ),
+    ]
@@ -1,8 +1,13 @@
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.core.files.storage import default_storage
 from django.db import models
-from django.db.models import F, Q
+from django.db.models import OuterRef, Q, Subquery
+from django.urls import reverse
+
+BLOCKCHAIN_CHOICES = [("mainnet", "Mainnet"), ("testnet", "Testnet")]
 
 
 def validate_hotkey_length(value):
@@ -20,6 +25,27 @@ class UploadedFile(models.Model):
         db_comment="File name (id) in Django Storage",
     )
     file_size = models.PositiveBigIntegerField(db_comment="File size in bytes")
+    subnet_slot = models.ForeignKey(
+        "SubnetSlot",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="uploaded_files",
+        db_comment="Subnet slot of the validator which uploaded the file",
+    )
+    content = models.ForeignKey(
+        "FileContent",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="uploaded_files",
+        db_comment="Compressed content shared with identical files; `storage_file_name` then only identifies the file",
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["hotkey", "created_at"], name="uploadedfile_hotkey_created"),
+        ]
 
     def __str__(self):
         return f"{self.file_name!r} uploaded by {self.hotkey}"
@@ -28,14 +54,85 @@ class UploadedFile(models.Model):
         """
         Return the full URL to the file, including the domain.
         """
-        relative_url = default_storage.url(self.storage_file_name)
-        return request.build_absolute_uri(relative_url)
+        return request.build_absolute_uri(self.url)
 
     @property
     def url(self):
+        if self.content_id is not None:
+            # compressed files are decompressed by the download view unless the client accepts zstd
+            return reverse("uploaded-file-download", kwargs={"storage_file_name": self.storage_file_name})
         return default_storage.url(self.storage_file_name)
 
 
+class FileContent(models.Model):
+    """
+    Zstd-compressed content of uploaded files, stored once however many files have it,
+    see `auto_validator.core.utils.file_content`.
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True, db_comment="SHA-256 of the uncompressed content")
+    storage_file_name = models.CharField(max_length=4095, db_comment="File name (id) in Django Storage")
+    size = models.PositiveBigIntegerField(db_comment="Uncompressed size in bytes")
+    stored_size = models.PositiveBigIntegerField(db_comment="Compressed size in bytes")
+    ref_count = models.PositiveIntegerField(
+        default=0, db_comment="Uploaded files with this content; unreferenced content is deleted by the retention task"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.sha256
+
+
+class LogIndex(models.Model):
+    """
+    Searchable summary of an uploaded log, built after the upload, see `auto_validator.core.utils.log_index`.
+    """
+
+    uploaded_file = models.OneToOneField(
+        UploadedFile, on_delete=models.CASCADE, primary_key=True, related_name="log_index"
+    )
+    excerpt = models.TextField(db_comment="Error lines and tracebacks of the log, truncated")
+    search_vector = SearchVectorField(null=True, db_comment="Full-text index of `excerpt`")
+    exceptions = ArrayField(
+        models.CharField(max_length=255), default=list, db_comment="Exception types raised in the log"
+    )
+    error_count = models.PositiveIntegerField(default=0)
+    traceback_count = models.PositiveIntegerField(default=0)
+    first_timestamp = models.DateTimeField(null=True, blank=True)
+    last_timestamp = models.DateTimeField(null=True, blank=True)
+    indexed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="logindex_search_vector"),
+            GinIndex(fields=["exceptions"], name="logindex_exceptions"),
+        ]
+
+    def __str__(self):
+        return f"Index of {self.uploaded_file}"
+
+
+class DeletedFile(models.Model):
+    """
+    Tombstone of an uploaded file removed by the retention policy of its subnet, see `auto_validator.core.utils.retention`.
+    """
+
+    class Reason(models.TextChoices):
+        MAX_AGE = "max_age", "Max age"
+        MAX_BYTES = "max_bytes", "Max bytes per hotkey"
+
+    storage_file_name = models.CharField(max_length=4095, unique=True)
+    hotkey = models.CharField(max_length=48)
+    file_name = models.CharField(max_length=4095)
+    file_size = models.PositiveBigIntegerField(db_comment="File size in bytes")
+    created_at = models.DateTimeField(db_comment="When the file was uploaded")
+    deleted_at = models.DateTimeField(auto_now_add=True)
+    reason = models.CharField(max_length=20, choices=Reason.choices)
+
+    def __str__(self):
+        return f"{self.file_name!r} uploaded by {self.hotkey}, deleted ({self.reason})"
+
+
 class Block(models.Model):
     serial_number = models.IntegerField(primary_key=True, unique=True)
     timestamp = models.DateTimeField()
@@ -44,6 +141,32 @@ class Block(models.Model):
         return f"{self.serial_number}"
 
 
+class SubnetSlotQuerySet(models.QuerySet):
+    def registered(self):
+        return self.filter(is_registered=True)
+
+
+class SubnetQuerySet(models.QuerySet):
+    def with_registered_netuids(self):
+        """
+        Annotate each subnet with the netuid of its first registered mainnet and testnet slot (or None).
+        """
+        registered_slots = SubnetSlot.objects.registered().filter(subnet=OuterRef("pk")).order_by("id")
+        return self.annotate(
+            registered_mainnet_netuid=Subquery(registered_slots.filter(blockchain="mainnet").values("netuid")[:1]),
+            registered_testnet_netuid=Subquery(registered_slots.filter(blockchain="testnet").values("netuid")[:1]),
+        )
+
+
+class ChainCursor(models.Model):
+    blockchain = models.CharField(max_length=50, choices=BLOCKCHAIN_CHOICES, unique=True)
+    last_block = models.PositiveIntegerField(db_comment="Last finalized block scanned for registration events")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.blockchain} @ {self.last_block}"
+
+
 class Subnet(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField(null=True, blank=True)
@@ -56,35 +179,34 @@ class Subnet(models.Model):
     maintainer_discord_ids = ArrayField(models.CharField(max_length=255), null=True, blank=True)
     github_repo = models.CharField(max_length=255, null=True, blank=True)
     hardware_description = models.TextField(max_length=4095, null=True, blank=True)
+    log_retention_days = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Days to keep uploaded log files, 0 to keep them forever; empty uses the default",
+    )
+    log_max_bytes_per_hotkey = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        help_text="Bytes of uploaded log files kept per hotkey, oldest are deleted first, 0 for no limit; "
+        "empty uses the default",
+    )
     allowed_secrets = ArrayField(models.CharField(max_length=255), null=True, blank=True)
     dumper_commands = ArrayField(models.CharField(max_length=255), null=True, blank=True)
 
+    objects = SubnetQuerySet.as_manager()
+
     def registered_networks(self):
-        mainnet_slots = self.slots.filter(
-            Q(
-                Q(registration_block__isnull=False, deregistration_block__isnull=True)
-                | Q(
-                    registration_block__isnull=False,
-                    deregistration_block__isnull=False,
-                    registration_block__gt=F("deregistration_block"),
-                )
-            ),
-            blockchain="mainnet",
-        )
-        testnet_slots = self.slots.filter(
-            Q(
-                Q(registration_block__isnull=False, deregistration_block__isnull=True)
-                | Q(
-                    registration_block__isnull=False,
-                    deregistration_block__isnull=False,
-                    registration_block__gt=F("deregistration_block"),
-                )
-            ),
-            blockchain="testnet",
-        )
+        if hasattr(self, "registered_mainnet_netuid"):
+            mainnet_netuid, testnet_netuid = self.registered_mainnet_netuid, self.registered_testnet_netuid
+        else:
+            mainnet_netuid, testnet_netuid = (
+                Subnet.objects.with_registered_netuids()
+                .values_list("registered_mainnet_netuid", "registered_testnet_netuid")
+                .get(pk=self.pk)
+            )
 
-        mainnet_indicator = f"sn{mainnet_slots.first().netuid}" if mainnet_slots.exists() else ""
-        testnet_indicator = f"t{testnet_slots.first().netuid}" if testnet_slots.exists() else ""
+        mainnet_indicator = f"sn{mainnet_netuid}" if mainnet_netuid is not None else ""
+        testnet_indicator = f"t{testnet_netuid}" if testnet_netuid is not None else ""
 
         return f"{mainnet_indicator}{testnet_indicator}" or "-"
 
@@ -94,7 +216,7 @@ class Subnet(models.Model):
 
 class SubnetSlot(models.Model):
     subnet = models.ForeignKey(Subnet, on_delete=models.PROTECT, null=True, blank=True, related_name="slots")
-    blockchain = models.CharField(max_length=50, choices=[("mainnet", "Mainnet"), ("testnet", "Testnet")])
+    blockchain = models.CharField(max_length=50, choices=BLOCKCHAIN_CHOICES)
     netuid = models.IntegerField()
     maximum_registration_price = models.IntegerField(default=0, help_text="Maximum registration price in RAO")
     registration_block = models.ForeignKey(
@@ -103,14 +225,55 @@ class SubnetSlot(models.Model):
     deregistration_block = models.ForeignKey(
         "Block", on_delete=models.PROTECT, null=True, blank=True, related_name="deregistration_slots"
     )
+    is_registered = models.BooleanField(
+        default=False,
+        editable=False,
+        db_comment="Denormalized from registration_block and deregistration_block, maintained on save",
+    )
+    active_since = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_comment="Timestamp of the registration block while the slot is registered",
+    )
     restart_threshold = models.IntegerField(default=0)
     reinstall_threshold = models.IntegerField(default=0)
 
+    objects = SubnetSlotQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["blockchain", "netuid"],
+                condition=Q(is_registered=True),
+                name="subnetslot_registered_idx",
+            ),
+        ]
+
     def __str__(self):
         subnet_name = self.subnet.name if self.subnet else "No subnet"
-        suffix = " (unregistered)" if self.registration_block and not self.registration_block else ""
+        suffix = " (unregistered)" if not self.is_registered else ""
         return f"{self.blockchain} / sn{self.netuid}: {subnet_name} {suffix}"
 
+    def save(self, *args, **kwargs):
+        self.refresh_registration_state()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"registration_block", "deregistration_block"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "is_registered", "active_since"}
+        super().save(*args, **kwargs)
+
+    def refresh_registration_state(self):
+        """
+        Recompute `is_registered` and `active_since` from the registration and deregistration blocks.
+
+        A slot is registered if it has a registration block and either no deregistration block
+        or one that precedes the (re-)registration.
+        """
+        self.is_registered = self.registration_block_id is not None and (
+            self.deregistration_block_id is None or self.registration_block_id > self.deregistration_block_id
+        )
+        self.active_since = self.registration_block.timestamp if self.is_registered else None
+
 
 class Hotkey(models.Model):
     hotkey = models.CharField(max_length=48, validators=[validate_hotkey_length], unique=True)
@@ -135,6 +298,35 @@ class ValidatorInstance(models.Model):
         return str(self.hotkey)
 
 
+class RemediationAction(models.Model):
+    """
+    Audit log of the restarts and reinstalls of stale validators, see `auto_validator.core.utils.remediation`.
+    """
+
+    class Kind(models.TextChoices):
+        RESTART = "restart", "Restart"
+        REINSTALL = "reinstall", "Reinstall"
+
+    class Status(models.TextChoices):
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    validator_instance = models.ForeignKey(
+        ValidatorInstance, on_delete=models.CASCADE, related_name="remediation_actions"
+    )
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.RUNNING)
+    blocks_behind = models.PositiveIntegerField(db_comment="`last_updated` of the validator when the action started")
+    threshold = models.IntegerField(db_comment="Threshold of the subnet slot which was exceeded")
+    message = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.kind} of {self.validator_instance} ({self.status})"
+
+
 class Operator(models.Model):
     name = models.CharField(max_length=255)
     discord_id = models.CharField(max_length=255, unique=True)
@@ -1,10 +1,14 @@
 import secrets
 
-from constance import config
+from django.conf import settings
 from django.core.files.storage import default_storage
+from django.db import transaction
 from rest_framework import serializers
 
-from auto_validator.core.models import Hotkey, UploadedFile
+from auto_validator.core.models import Hotkey, Server, UploadedFile, ValidatorInstance
+from auto_validator.core.utils.config_snapshot import config
+from auto_validator.core.utils.file_content import store_content
+from auto_validator.core.utils.storage import get_storage_urls
 
 
 def uploaded_file_size_validator(value):
@@ -12,20 +16,37 @@ def uploaded_file_size_validator(value):
         raise serializers.ValidationError(f"File size must be < {config.API_UPLOAD_MAX_SIZE}B")
 
 
+class UploadedFileListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        # generate the URLs of the whole page at once instead of one by one
+        uploaded_files = list(data)
+        self.child.storage_urls = get_storage_urls(
+            obj.storage_file_name for obj in uploaded_files if obj.content_id is None
+        )
+        return super().to_representation(uploaded_files)
+
+
 class UploadedFileSerializer(serializers.ModelSerializer):
     file = serializers.FileField(write_only=True, validators=[uploaded_file_size_validator])
     url = serializers.SerializerMethodField()
 
     class Meta:
         model = UploadedFile
-        fields = ("file_name", "file_size", "description", "url", "file")
+        fields = ("file_name", "file_size", "description", "url", "file", "created_at")
         read_only_fields = ("file_name", "file_size", "created_at")
+        list_serializer_class = UploadedFileListSerializer
+
+    storage_urls: dict[str, str] = {}
 
     def get_url(self, obj):
+        if obj.content_id is not None:
+            url = obj.url
+        elif (url := self.storage_urls.get(obj.storage_file_name)) is None:
+            url = get_storage_urls([obj.storage_file_name])[obj.storage_file_name]
         request = self.context.get("request")
         if request:
-            return obj.get_full_url(request)
-        return obj.url
+            return request.build_absolute_uri(url)
+        return url
 
     def create(self, validated_data):
         file = validated_data.pop("file")
@@ -37,14 +58,116 @@ class UploadedFileSerializer(serializers.ModelSerializer):
         subnet_name = meta_info["subnet_name"]
         netuid = meta_info["netuid"]
         semi_random_name = f"{subnet_name}-{netuid}-{hotkey_str}-{secrets.token_urlsafe(32)}-{file.name}"
-        filename_in_storage = default_storage.save(semi_random_name, file, max_length=4095)
         hotkey = Hotkey.objects.get(hotkey=hotkey_str)
 
-        return UploadedFile.objects.create(
-            hotkey=hotkey,
-            file_name=file.name,
-            file_size=file.size,
-            description=meta_info["note"],
-            storage_file_name=filename_in_storage,
-            **validated_data,
+        # a reference to the content is only added along with the file holding it
+        with transaction.atomic():
+            if settings.UPLOADED_FILES_COMPRESSION:
+                # the name only identifies the file, its content is stored under its hash
+                validated_data["content"] = store_content(file)
+                filename_in_storage = semi_random_name
+            else:
+                filename_in_storage = default_storage.save(semi_random_name, file, max_length=4095)
+
+            return UploadedFile.objects.create(
+                hotkey=hotkey,
+                file_name=file.name,
+                file_size=file.size,
+                description=meta_info["note"],
+                storage_file_name=filename_in_storage,
+                **validated_data,
+            )
+
+
+class FieldSelectionMixin:
+    """
+    Limit the serialized fields to those in the comma-separated `fields` query parameter, if given.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is not None and (fields := request.query_params.get("fields")):
+            selected = set(fields.split(","))
+            for field_name in set(self.fields) - selected:
+                self.fields.pop(field_name)
+
+
+class ValidatorStatusSerializer(FieldSelectionMixin, serializers.ModelSerializer):
+    hotkey = serializers.CharField(source="hotkey.hotkey", default=None)
+    subnet = serializers.CharField(source="subnet_slot.subnet.name", default=None)
+    codename = serializers.CharField(source="subnet_slot.subnet.codename", default=None)
+    blockchain = serializers.CharField(source="subnet_slot.blockchain")
+    netuid = serializers.IntegerField(source="subnet_slot.netuid")
+    ip_address = serializers.CharField(source="server.ip_address")
+
+    class Meta:
+        model = ValidatorInstance
+        fields = (
+            "id",
+            "hotkey",
+            "subnet",
+            "codename",
+            "blockchain",
+            "netuid",
+            "ip_address",
+            "status",
+            "last_updated",
+            "uses_child_hotkey",
+            "created_at",
+        )
+
+
+class ServerStatusSerializer(FieldSelectionMixin, serializers.ModelSerializer):
+    validator = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Server
+        fields = ("id", "name", "ip_address", "description", "created_at", "validator")
+
+    def get_validator(self, obj):
+        try:
+            validator = obj.validator_instances
+        except ValidatorInstance.DoesNotExist:
+            return None
+        return {
+            "id": validator.id,
+            "hotkey": validator.hotkey.hotkey if validator.hotkey else None,
+            "subnet": validator.subnet_slot.subnet.name if validator.subnet_slot.subnet else None,
+            "blockchain": validator.subnet_slot.blockchain,
+            "netuid": validator.subnet_slot.netuid,
+            "status": validator.status,
+            "last_updated": validator.last_updated,
+        }
+
+
+class LogSearchResultSerializer(UploadedFileSerializer):
+    file = None
+    hotkey = serializers.CharField(source="hotkey.hotkey")
+    subnet = serializers.CharField(source="subnet_slot.subnet.codename", default=None)
+    netuid = serializers.IntegerField(source="subnet_slot.netuid", default=None)
+    exceptions = serializers.ListField(source="log_index.exceptions", child=serializers.CharField())
+    error_count = serializers.IntegerField(source="log_index.error_count")
+    traceback_count = serializers.IntegerField(source="log_index.traceback_count")
+    first_timestamp = serializers.DateTimeField(source="log_index.first_timestamp")
+    last_timestamp = serializers.DateTimeField(source="log_index.last_timestamp")
+    headline = serializers.CharField(default=None)
+
+    class Meta(UploadedFileSerializer.Meta):
+        fields = (
+            "id",
+            "hotkey",
+            "subnet",
+            "netuid",
+            "file_name",
+            "file_size",
+            "description",
+            "url",
+            "created_at",
+            "exceptions",
+            "error_count",
+            "traceback_count",
+            "first_timestamp",
+            "last_timestamp",
+            "headline",
         )
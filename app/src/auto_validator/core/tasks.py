@@ -1,3 +1,4 @@
+import dataclasses
 import os
 import shutil
 
@@ -10,11 +11,21 @@ from git import GitCommandError, Repo
 
 from auto_validator.celery import app
 
+from . import metrics
 from .models import SubnetSlot, ValidatorInstance
+from .utils import log_index, remediation, retention, status_updates
+from .utils.registration_watcher import CursorConflict, SubstrateRegistrationEventSource, watch_registrations
 
 GITHUB_SUBNETS_SCRIPTS_PATH = settings.GITHUB_SUBNETS_SCRIPTS_PATH
 LOCAL_SUBNETS_SCRIPTS_PATH = settings.LOCAL_SUBNETS_SCRIPTS_PATH
 
+CHAIN_ENDPOINTS = {
+    "mainnet": settings.MAINNET_CHAIN_ENDPOINT,
+    "testnet": settings.TESTNET_CHAIN_ENDPOINT,
+}
+# keep each run well below CELERY_TASK_TIME_LIMIT; the next scheduled run continues from the cursor
+REGISTRATION_WATCHER_MAX_BATCHES = 20
+
 logger = structlog.wrap_logger(get_task_logger(__name__))
 
 
@@ -32,6 +43,7 @@ def schedule_update_validator_status():
 
 
 @shared_task
+@metrics.VALIDATOR_STATUS_UPDATE_DURATION.time()
 def update_validator_status_for_slot(slot_id):
     try:
         slot = SubnetSlot.objects.get(id=slot_id)
@@ -50,6 +62,9 @@ def update_validator_status_for_slot(slot_id):
                 validator.last_updated = current_block - last_updated
                 validator.save()
                 logger.info(f"Validator:{validator.hotkey}, subnet slot:{slot} was successfully updated!")
+                if settings.REMEDIATION_ENABLED and remediation.get_required_action(slot, validator.last_updated):
+                    remediate_validator_instance.delay(validator.id)
+            status_updates.publish_validator_statuses(validators)
         else:
             logger.warning(f"No validators found for subnet slot with ID {slot.id}.")
     except Exception:
@@ -58,6 +73,27 @@ def update_validator_status_for_slot(slot_id):
         subtensor.close()
 
 
+@shared_task(soft_time_limit=remediation.ACTION_TIME_LIMIT, time_limit=remediation.ACTION_HARD_TIME_LIMIT)
+def remediate_validator_instance(instance_id):
+    remediation.remediate_validator(instance_id)
+
+
+@shared_task(time_limit=retention.RETENTION_TIME_LIMIT)
+def apply_uploaded_files_retention():
+    report = retention.apply_retention_policies()
+    return dataclasses.asdict(report)
+
+
+@shared_task
+def index_uploaded_file(uploaded_file_id):
+    log_index.index_uploaded_file(uploaded_file_id)
+
+
+@shared_task
+def flush_status_updates():
+    status_updates.flush_status_updates()
+
+
 def fetch_last_updated_from_metagraph(metagraph, public_key):
     return metagraph.last_update[metagraph.hotkeys.index(public_key)]
 
@@ -68,6 +104,7 @@ def schedule_fetch_subnet_scripts():
 
 
 @shared_task
+@metrics.FETCH_SUBNET_SCRIPTS_DURATION.time()
 def fetch_subnet_scripts():
     logger.info("Fetching subnet scripts")
     try:
@@ -83,3 +120,24 @@ def fetch_subnet_scripts():
 
     logger.info("Successfully fetched subnet scripts")
     return
+
+
+@app.task
+def schedule_watch_chain_registrations():
+    for blockchain in CHAIN_ENDPOINTS:
+        watch_chain_registrations.delay(blockchain)
+
+
+@shared_task
+def watch_chain_registrations(blockchain):
+    coldkey = settings.BITTENSOR_COLDKEY_SS58_ADDRESS or (
+        bt.Wallet(name=settings.BITTENSOR_WALLET_NAME, path=str(settings.BITTENSOR_WALLET_PATH)).coldkeypub.ss58_address
+    )
+    source = SubstrateRegistrationEventSource(CHAIN_ENDPOINTS[blockchain])
+    try:
+        processed = watch_registrations(blockchain, source, coldkey, max_batches=REGISTRATION_WATCHER_MAX_BATCHES)
+        logger.info("Scanned %s blocks on %s", processed, blockchain)
+    except CursorConflict:
+        logger.warning("Registration watcher for %s is already running", blockchain)
+    finally:
+        source.close()
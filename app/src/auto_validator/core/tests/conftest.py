@@ -1,11 +1,17 @@
+import io
+import os
 from collections.abc import Generator
 
 import bittensor as bt
 import pytest
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
 from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 
 from auto_validator.core.models import Hotkey, Server, Subnet, SubnetSlot, ValidatorInstance
+from auto_validator.core.utils.redis_pool import get_redis_client, get_redis_connection_pool
+from auto_validator.wsgi import application as wsgi_application
 
 
 @pytest.fixture
@@ -63,12 +69,79 @@ def validator_instance(subnet_slot, server, hotkey):
     return validator_instance
 
 
+@pytest.fixture
+def redis_client(settings):
+    """
+    Empty Redis database, separate for each xdist worker.
+    """
+    settings.REDIS_DB = int(os.environ.get("PYTEST_XDIST_WORKER", "gw0").removeprefix("gw")) % 16
+    get_redis_connection_pool.cache_clear()
+    redis_client = get_redis_client()
+    redis_client.flushdb()
+    yield redis_client
+    redis_client.flushdb()
+    get_redis_connection_pool.cache_clear()
+
+
 @pytest.fixture
 def api_client():
     client = APIClient()
     return client
 
 
+class CountingInput(io.BytesIO):
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def readline(self, size=-1):
+        data = super().readline(size)
+        self.bytes_read += len(data)
+        return data
+
+
+@pytest.fixture
+def wsgi_upload():
+    """
+    Post an upload through the WSGI application, as gunicorn does, and return the response status with the
+    number of body bytes the application read.
+    """
+
+    def post(body: bytes, headers: dict[str, str], remote_addr: str = "10.0.0.1") -> tuple[int, int]:
+        wsgi_input = CountingInput(body)
+        environ = {
+            "REQUEST_METHOD": "POST",
+            "PATH_INFO": "/api/v1/files/",
+            "SERVER_NAME": "testserver",
+            "SERVER_PORT": "80",
+            "REMOTE_ADDR": remote_addr,
+            "CONTENT_TYPE": "multipart/form-data; boundary=boundary",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": wsgi_input,
+            "wsgi.url_scheme": "http",
+            **{f"HTTP_{name.upper()}": value for name, value in headers.items()},
+        }
+        statuses = []
+        # the connection is closed around each request, which would end the transaction of the test
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+        try:
+            response = wsgi_application(environ, lambda status, headers: statuses.append(status))
+            b"".join(response)
+            response.close()
+        finally:
+            request_started.connect(close_old_connections)
+            request_finished.connect(close_old_connections)
+        return int(statuses[0].split()[0]), wsgi_input.bytes_read
+
+    return post
+
+
 @pytest.fixture
 def eq():
     class EqualityMock:
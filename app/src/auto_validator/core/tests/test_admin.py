@@ -0,0 +1,81 @@
+import pytest
+from django.urls import reverse
+from django.utils.timezone import now
+
+from auto_validator.core.models import Block, Subnet, SubnetSlot
+
+SUBNET_CHANGELIST_URL = reverse("admin:core_subnet_changelist")
+
+pytestmark = pytest.mark.django_db
+
+
+def create_subnets(count):
+    registration_block = Block.objects.create(serial_number=100, timestamp=now())
+    deregistration_block = Block.objects.create(serial_number=200, timestamp=now())
+    for i in range(count):
+        subnet = Subnet.objects.create(name=f"subnet_{i}", codename=f"subnet_{i}")
+        SubnetSlot.objects.create(subnet=subnet, blockchain="mainnet", netuid=i, registration_block=registration_block)
+        SubnetSlot.objects.create(
+            subnet=subnet,
+            blockchain="testnet",
+            netuid=i,
+            registration_block=registration_block,
+            deregistration_block=deregistration_block,
+        )
+
+
+@pytest.mark.parametrize("subnet_count", [1, 50])
+def test_subnet_changelist_query_count_does_not_depend_on_subnet_count(
+    admin_client, django_assert_num_queries, subnet_count
+):
+    create_subnets(subnet_count)
+    admin_client.get(SUBNET_CHANGELIST_URL)  # warm up session and content type caches
+
+    with django_assert_num_queries(5):
+        response = admin_client.get(SUBNET_CHANGELIST_URL)
+
+    assert response.status_code == 200
+    assert "sn0" in response.content.decode()
+
+
+def test_registered_networks():
+    create_subnets(1)
+    subnet = Subnet.objects.get()
+    SubnetSlot.objects.create(
+        subnet=subnet,
+        blockchain="testnet",
+        netuid=7,
+        registration_block=Block.objects.get(serial_number=200),
+        deregistration_block=Block.objects.get(serial_number=100),
+    )
+
+    assert subnet.registered_networks() == "sn0t7"
+    assert Subnet.objects.with_registered_netuids().get().registered_networks() == "sn0t7"
+    assert Subnet.objects.create(name="unregistered").registered_networks() == "-"
+
+
+@pytest.mark.parametrize(
+    "registered_network, expected_names",
+    [
+        ("mainnet", ["subnet_0"]),
+        ("testnet", []),
+        ("none", ["unregistered"]),
+    ],
+)
+def test_subnet_changelist_registered_network_filter(admin_client, registered_network, expected_names):
+    create_subnets(1)
+    Subnet.objects.create(name="unregistered", codename="unregistered")
+
+    response = admin_client.get(SUBNET_CHANGELIST_URL, {"registered_network": registered_network})
+
+    assert response.status_code == 200
+    assert sorted(subnet.name for subnet in response.context["cl"].result_list) == expected_names
+
+
+def test_subnet_changelist_sorts_by_registered_networks(admin_client):
+    create_subnets(3)
+
+    response = admin_client.get(SUBNET_CHANGELIST_URL, {"o": "-5"})
+
+    assert response.status_code == 200
+    assert [subnet.name for subnet in response.context["cl"].result_list] == ["subnet_2", "subnet_1", "subnet_0"]
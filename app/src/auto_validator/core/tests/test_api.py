@@ -2,17 +2,19 @@ import io
 import json
 import re
 import time
+from datetime import timedelta
 
 import pytest
+from django.utils import timezone
 from rest_framework import status
 
-from auto_validator.core.models import Hotkey, UploadedFile
+from auto_validator.core.models import Hotkey, SubnetSlot, UploadedFile
 
 V1_FILES_URL = "/api/v1/files/"
 
 
 @pytest.mark.django_db
-def test_file_upload_with_valid_signature(api_client, wallet, validator_instance):
+def test_file_upload_with_valid_signature(api_client, wallet, validator_instance, redis_client):
     file_content = io.BytesIO(b"file content")
     file_content.name = "testfile.txt"
 
@@ -58,10 +60,11 @@ def test_file_upload_with_valid_signature(api_client, wallet, validator_instance
     assert uploaded_file.description == ""
     assert uploaded_file.hotkey.hotkey == wallet.hotkey.ss58_address
     assert uploaded_file.file_size == 12
+    assert uploaded_file.subnet_slot == validator_instance.subnet_slot
 
 
 @pytest.mark.django_db
-def test_file_upload_with_invalid_signature(api_client, wallet, validator_instance):
+def test_file_upload_with_invalid_signature(api_client, wallet, validator_instance, redis_client):
     file_content = io.BytesIO(b"file content")
     file_content.name = "testfile.txt"
 
@@ -101,7 +104,7 @@ def test_file_upload_with_missing_hotkey(api_client):
 
 
 @pytest.mark.django_db
-def test_file_upload_with_invalid_hotkey(api_client, wallet):
+def test_file_upload_with_invalid_hotkey(api_client, wallet, redis_client):
     file_content = io.BytesIO(b"file content")
     file_content.name = "testfile.txt"
 
@@ -133,7 +136,7 @@ def test_list_files(api_client, hotkey):
     response = api_client.get(V1_FILES_URL, headers={"Hotkey": hotkey.hotkey, "Note": ""})
 
     assert response.status_code == status.HTTP_200_OK
-    response_data = response.json()
+    response_data = response.json()["results"]
     assert len(response_data) == 2
     assert response_data[0]["file_name"] == "file1.txt"
     assert response_data[0]["file_size"] == 1
@@ -148,4 +151,61 @@ def test_list_files(api_client, hotkey):
 @pytest.mark.django_db
 def test_list_files_empty(api_client):
     response = api_client.get(V1_FILES_URL, headers={"Hotkey": ""})
-    assert (response.status_code, response.json()) == (status.HTTP_200_OK, [])
+    assert (response.status_code, response.json()["results"]) == (status.HTTP_200_OK, [])
+
+
+def create_files(hotkey, count, subnet_slot=None):
+    now = timezone.now()
+    for index in range(count):
+        uploaded_file = UploadedFile.objects.create(
+            file_name=f"file{index}.txt",
+            file_size=index,
+            hotkey=hotkey,
+            storage_file_name=f"file{index}.txt",
+            subnet_slot=subnet_slot,
+        )
+        # created_at is auto_now_add
+        uploaded_file.created_at = now - timedelta(hours=count - index)
+        uploaded_file.save()
+
+
+@pytest.mark.django_db
+def test_list_files_cursor_pagination(api_client, hotkey, django_assert_num_queries):
+    create_files(hotkey, 5)
+
+    url = f"{V1_FILES_URL}?page_size=2"
+    pages = []
+    while url:
+        # each page is a single query, with the URLs generated in bulk
+        with django_assert_num_queries(1):
+            page = api_client.get(url, headers={"Hotkey": hotkey.hotkey}).json()
+        pages.append([uploaded_file["file_name"] for uploaded_file in page["results"]])
+        url = page["next"]
+
+    assert pages == [["file0.txt", "file1.txt"], ["file2.txt", "file3.txt"], ["file4.txt"]]
+
+
+@pytest.mark.django_db
+def test_list_files_filters(api_client, hotkey, subnet_slot):
+    create_files(hotkey, 4, subnet_slot=subnet_slot)
+    other_slot = SubnetSlot.objects.create(subnet=subnet_slot.subnet, netuid=7, blockchain="testnet")
+    UploadedFile.objects.create(
+        file_name="other.txt", file_size=1, hotkey=hotkey, storage_file_name="other.txt", subnet_slot=other_slot
+    )
+
+    def list_file_names(query):
+        response = api_client.get(f"{V1_FILES_URL}?{query}", headers={"Hotkey": hotkey.hotkey})
+        return [uploaded_file["file_name"] for uploaded_file in response.json()["results"]]
+
+    middle = UploadedFile.objects.get(file_name="file1.txt").created_at
+    created_after = middle.isoformat().replace("+00:00", "Z")
+    assert list_file_names(f"created_after={created_after}&subnet=1") == ["file1.txt", "file2.txt", "file3.txt"]
+    assert list_file_names(f"created_before={created_after}") == ["file0.txt"]
+    assert list_file_names("subnet=7") == ["other.txt"]
+    subnet_slot.subnet.codename = "test"
+    subnet_slot.subnet.save()
+    assert len(list_file_names("subnet=test")) == 5
+    assert list_file_names("subnet=other") == []
+
+    response = api_client.get(f"{V1_FILES_URL}?created_after=yesterday", headers={"Hotkey": hotkey.hotkey})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,51 @@
+import json
+import time
+
+import pytest
+
+from auto_validator.core.utils.bot import (
+    BOT_COMMANDS_STREAM,
+    BotNotifier,
+    bot_notifier,
+    get_bot_command_stats,
+    trigger_bot_send_message,
+)
+
+
+@pytest.mark.django_db
+def test_trigger_bot_send_message_is_sent_after_commit(django_capture_on_commit_callbacks, monkeypatch):
+    sent = []
+    monkeypatch.setattr(bot_notifier, "send", sent.append)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        trigger_bot_send_message(channel_name="sn1", message="New validator logs", realm="mainnet")
+        assert sent == []
+
+    assert sent == [
+        {"action": "send_message", "channel_name": "sn1", "message": "New validator logs", "realm": "mainnet"}
+    ]
+
+
+def test_bot_notifier_enqueues_burst_of_commands(redis_client):
+    notifier = BotNotifier()
+
+    for i in range(250):
+        notifier.send({"action": "send_message", "message": str(i)})
+    notifier.flush()
+    deadline = time.monotonic() + 5
+    while redis_client.xlen(BOT_COMMANDS_STREAM) < 250 and time.monotonic() < deadline:
+        time.sleep(0.01)  # the background thread may still be executing its last pipeline
+
+    entries = redis_client.xrange(BOT_COMMANDS_STREAM)
+    assert sorted((json.loads(fields[b"command"])["message"] for _, fields in entries), key=int) == [
+        str(i) for i in range(250)
+    ]
+    assert get_bot_command_stats() == {
+        "lag": 250,
+        "pending": 0,
+        "dead_letter": 0,
+        "enqueued": 250,
+        "acked": 0,
+        "retried": 0,
+        "dead_lettered": 0,
+    }
@@ -0,0 +1,95 @@
+import os
+import time
+
+import pytest
+from constance.models import Constance
+from constance.test import override_config
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from auto_validator.core.utils import config_snapshot
+from auto_validator.core.utils.config_snapshot import config
+
+V1_FILES_URL = "/api/v1/files/"
+
+pytestmark = pytest.mark.django_db
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@pytest.fixture(autouse=True)
+def empty_snapshot(redis_client):
+    # the subscriber drops the snapshot once subscribed, which would make the hits counted below vary
+    if config._subscriber_pid != os.getpid():
+        generation = config._generation
+        config.ensure_subscribed()
+        wait_for(lambda: config._generation != generation)
+    config.invalidate()
+    yield
+    config.invalidate()
+
+
+@pytest.fixture
+def backend_hits():
+    """
+    Reads of the configured constance backend: "mget" for a read of several settings and "get" for one.
+    """
+    table = connection.ops.quote_name(Constance._meta.db_table)
+    with CaptureQueriesContext(connection) as queries:
+        yield lambda: [
+            "mget" if " IN (" in query["sql"] else "get"
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT") and table in query["sql"]
+        ]
+
+
+def test_uploads_read_settings_from_the_snapshot(api_client, backend_hits, wallet, validator_instance):
+    for _ in range(3):
+        headers = {"Hotkey": wallet.hotkey.ss58_address, "Nonce": str(time.time()), "Signature": "00"}
+        response = api_client.post(V1_FILES_URL, {"file": b"log"}, format="multipart", headers=headers)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    # the upload size limit and the rate limits of all three requests come from a single read
+    assert backend_hits() == ["mget"]
+
+
+def test_changed_settings_are_read_right_away(backend_hits):
+    assert config.API_UPLOAD_MAX_SIZE == 100 * 1024 * 1024
+
+    with override_config(API_UPLOAD_MAX_SIZE=1000):
+        assert config.API_UPLOAD_MAX_SIZE == 1000
+    assert config.API_UPLOAD_MAX_SIZE == 100 * 1024 * 1024
+    # override_config reads the original value with a get of its own
+    assert [method for method in backend_hits() if method == "mget"] == ["mget"] * 3
+
+
+def test_snapshot_expires(settings, monkeypatch, backend_hits):
+    settings.CONSTANCE_SNAPSHOT_TTL = 10
+    now = time.monotonic()
+    monkeypatch.setattr(config_snapshot.time, "monotonic", lambda: now)
+    config.UPLOAD_RATE_LIMIT_REQUESTS
+    config.UPLOAD_RATE_LIMIT_BYTES
+    assert len(backend_hits()) == 1
+
+    now += 11
+    config.UPLOAD_RATE_LIMIT_REQUESTS
+    assert len(backend_hits()) == 2
+
+
+def test_unknown_setting():
+    with pytest.raises(AttributeError):
+        config.UNKNOWN
+
+
+def test_snapshot_is_dropped_when_another_process_changes_settings(backend_hits):
+    config.API_UPLOAD_MAX_SIZE
+    config_snapshot.publish_invalidation()
+    wait_for(lambda: config._values is None)
+    config.API_UPLOAD_MAX_SIZE
+    assert len(backend_hits()) == 2
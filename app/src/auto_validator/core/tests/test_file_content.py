@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+import pytest
+import zstandard
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError
+from django.utils import timezone
+
+from auto_validator.core.models import FileContent, UploadedFile
+from auto_validator.core.serializers import UploadedFileSerializer
+from auto_validator.core.utils import retention
+from auto_validator.core.utils.file_content import store_content
+
+pytestmark = pytest.mark.django_db
+
+LOG = b"2024-01-01 00:00:00 | INFO | validator | set weights\n" * 1000
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+def upload(hotkey, name, data=LOG):
+    content = store_content(SimpleUploadedFile(name, data))
+    return UploadedFile.objects.create(
+        hotkey=hotkey, file_name=name, file_size=len(data), storage_file_name=f"random-{name}", content=content
+    )
+
+
+def test_identical_content_is_stored_once(hotkey, media_root):
+    first = upload(hotkey, "first.log")
+    second = upload(hotkey, "second.log")
+    other = upload(hotkey, "other.log", b"something else")
+
+    assert first.content == second.content != other.content
+    content = FileContent.objects.get(id=first.content_id)
+    assert (content.ref_count, content.size) == (2, len(LOG))
+    assert content.stored_size < len(LOG) / 10
+    stored = (media_root / content.storage_file_name).read_bytes()
+    assert zstandard.ZstdDecompressor().decompress(stored) == LOG
+    assert first.url == "/files/random-first.log"
+
+
+def test_failed_upload_does_not_keep_a_reference(settings, monkeypatch, hotkey):
+    settings.UPLOADED_FILES_COMPRESSION = True
+    content = upload(hotkey, "first.log").content
+    meta_info = {"hotkey": hotkey.hotkey, "subnet_name": "subnet", "netuid": 1, "note": None}
+
+    def failing_create(**kwargs):
+        raise DatabaseError("insert failed")
+
+    monkeypatch.setattr(UploadedFile.objects, "create", failing_create)
+    with pytest.raises(DatabaseError):
+        UploadedFileSerializer().create({"file": SimpleUploadedFile("second.log", LOG), "meta_info": meta_info})
+
+    content.refresh_from_db()
+    assert content.ref_count == 1
+
+
+def test_download_is_decompressed_unless_zstd_is_accepted(client, hotkey):
+    uploaded_file = upload(hotkey, "validator.log")
+
+    response = client.get(uploaded_file.url)
+    assert response["Content-Type"] == "application/octet-stream"
+    assert b"".join(response.streaming_content) == LOG
+    assert "Content-Encoding" not in response
+
+    response = client.get(uploaded_file.url, HTTP_ACCEPT_ENCODING="gzip, zstd")
+    assert response["Content-Encoding"] == "zstd"
+    assert int(response["Content-Length"]) == uploaded_file.content.stored_size
+    assert zstandard.ZstdDecompressor().decompress(b"".join(response.streaming_content)) == LOG
+
+
+def test_retention_deletes_content_without_references(settings, hotkey, media_root):
+    settings.UPLOADED_FILES_RETENTION_DAYS = 1
+    old, recent = upload(hotkey, "old.log"), upload(hotkey, "recent.log")
+    UploadedFile.objects.filter(id=old.id).update(created_at=timezone.now() - timedelta(days=2))
+    content_path = media_root / old.content.storage_file_name
+
+    retention.apply_retention_policies()
+    assert FileContent.objects.get().ref_count == 1
+    assert content_path.exists()
+
+    UploadedFile.objects.filter(id=recent.id).update(created_at=timezone.now() - timedelta(days=2))
+    report = retention.apply_retention_policies()
+    assert not FileContent.objects.exists()
+    assert not content_path.exists()
+    assert report.contents_deleted == 1
@@ -0,0 +1,101 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework import status
+
+from auto_validator.core.models import Hotkey, SubnetSlot, UploadedFile
+from auto_validator.core.utils.file_content import store_content
+from auto_validator.core.utils.log_index import index_uploaded_file, summarize_log
+
+V1_LOG_SEARCH_URL = "/api/v1/log-search/"
+
+pytestmark = pytest.mark.django_db
+
+LOG = """\
+validator-1  | 2024-05-01 10:00:00.123 | INFO | Starting validator
+validator-1  | 2024-05-01 10:00:05.456 | ERROR | Failed to set weights: SubstrateRequestException
+validator-1  | Traceback (most recent call last):
+validator-1  |   File "/app/neurons/validator.py", line 42, in forward
+validator-1  |     await self.query_miners()
+validator-1  | bittensor.errors.ChainConnectionError: connection refused
+validator-1  | 2024-05-01 10:01:00,000 | INFO | Retrying
+"""
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+@pytest.fixture
+def token_client(api_client, auth_token):
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {auth_token.key}")
+    return api_client
+
+
+def upload(hotkey, name, data, subnet_slot=None):
+    uploaded_file = UploadedFile.objects.create(
+        hotkey=hotkey,
+        file_name=name,
+        file_size=len(data),
+        storage_file_name=f"random-{name}",
+        content=store_content(SimpleUploadedFile(name, data.encode())),
+        subnet_slot=subnet_slot,
+    )
+    index_uploaded_file(uploaded_file.id)
+    return uploaded_file
+
+
+def test_summarize_log():
+    summary = summarize_log(LOG.splitlines())
+
+    assert (summary.error_count, summary.traceback_count) == (1, 1)
+    assert list(summary.exceptions) == ["SubstrateRequestException", "bittensor.errors.ChainConnectionError"]
+    assert summary.first_timestamp == datetime(2024, 5, 1, 10, 0, 0, 123000, tzinfo=UTC)
+    assert summary.last_timestamp == datetime(2024, 5, 1, 10, 1, tzinfo=UTC)
+    assert "Starting validator" not in summary.excerpt
+    assert 'File "/app/neurons/validator.py", line 42, in forward' in summary.excerpt
+
+
+def test_index_uncompressed_file(settings, hotkey, tmp_path):
+    (tmp_path / "plain.log").write_text(LOG)
+    uploaded_file = UploadedFile.objects.create(
+        hotkey=hotkey, file_name="plain.log", file_size=len(LOG), storage_file_name="plain.log"
+    )
+
+    log_index = index_uploaded_file(uploaded_file.id)
+
+    assert log_index.traceback_count == 1
+
+
+def test_search_uploads(token_client, hotkey, subnet_slot, django_assert_max_num_queries):
+    subnet_slot.subnet.codename = "test"
+    subnet_slot.subnet.save()
+    crashed = upload(hotkey, "crashed.log", LOG, subnet_slot=subnet_slot)
+    upload(hotkey, "healthy.log", "2024-05-01 10:00:00 | INFO | all good\n", subnet_slot=subnet_slot)
+    other_slot = SubnetSlot.objects.create(netuid=2, blockchain="mainnet")
+    upload(Hotkey.objects.create(hotkey="other_hotkey"), "other.log", LOG, subnet_slot=other_slot)
+
+    def search(query):
+        response = token_client.get(f"{V1_LOG_SEARCH_URL}?{query}")
+        assert response.status_code == status.HTTP_200_OK
+        return [result["file_name"] for result in response.json()["results"]]
+
+    week_ago = (crashed.created_at - timedelta(days=7)).isoformat().replace("+00:00", "Z")
+    assert search(f"exception=bittensor.errors.ChainConnectionError&subnet=test&created_after={week_ago}") == [
+        "crashed.log"
+    ]
+    assert search("exception=ValueError") == []
+    assert sorted(search("q=refused")) == ["crashed.log", "other.log"]
+    assert search("q=refused -weights") == []
+
+    with django_assert_max_num_queries(2):
+        result = token_client.get(f"{V1_LOG_SEARCH_URL}?q=forward&subnet=1").json()["results"][0]
+    assert result["subnet"] == "test"
+    assert result["traceback_count"] == 1
+    assert "<b>forward</b>" in result["headline"]
+
+
+def test_search_requires_authentication(api_client):
+    assert api_client.get(V1_LOG_SEARCH_URL).status_code == status.HTTP_401_UNAUTHORIZED
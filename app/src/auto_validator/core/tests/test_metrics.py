@@ -0,0 +1,110 @@
+import io
+import time
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from freezegun import freeze_time
+from prometheus_client import REGISTRY
+from rest_framework import status
+
+from auto_validator.core.business_metrics import CACHE_KEY
+from auto_validator.core.models import Server, Subnet, SubnetSlot, UploadedFile, ValidatorInstance
+
+METRICS_URL = "/metrics"
+
+
+@pytest.mark.django_db
+def test_metrics_view_reports_business_gauges(client, settings, redis_client, validator_instance):
+    settings.METRICS_VALIDATOR_BEHIND_BLOCKS = 100
+    slot = validator_instance.subnet_slot
+    slot.restart_threshold = 120
+    slot.reinstall_threshold = 200
+    slot.save()
+    validator_instance.last_updated = 150
+    validator_instance.status = True
+    validator_instance.save()
+    UploadedFile.objects.create(
+        hotkey=validator_instance.hotkey,
+        subnet_slot=slot,
+        file_name="a.log",
+        storage_file_name="a.log",
+        file_size=10,
+    )
+    with freeze_time(timezone.now() - timedelta(hours=2)):
+        UploadedFile.objects.create(
+            hotkey=validator_instance.hotkey,
+            subnet_slot=slot,
+            file_name="b.log",
+            storage_file_name="b.log",
+            file_size=20,
+        )
+
+    response = client.get(METRICS_URL)
+
+    assert response.status_code == status.HTTP_200_OK
+    content = response.content.decode()
+    labels = 'blockchain="mainnet",subnet="test_subnet"'
+    assert f"auto_validator_validator_instances{{{labels}}} 1.0" in content
+    assert f"auto_validator_running_validator_instances{{{labels}}} 1.0" in content
+    assert f"auto_validator_validators_behind{{{labels}}} 1.0" in content
+    assert f"auto_validator_validators_over_restart_threshold{{{labels}}} 1.0" in content
+    assert f"auto_validator_validators_over_reinstall_threshold{{{labels}}} 0.0" in content
+    assert f'auto_validator_uploaded_files{{{labels},window="1h"}} 1.0' in content
+    assert f'auto_validator_uploaded_files{{{labels},window="24h"}} 2.0' in content
+    assert f'auto_validator_uploaded_files_bytes{{{labels},window="24h"}} 30.0' in content
+    assert "auto_validator_authentication_duration_seconds_bucket" in content
+
+
+@pytest.mark.django_db
+def test_uploads_are_counted_once_per_subnet(client, redis_client, validator_instance):
+    other_slot = SubnetSlot.objects.create(
+        subnet=Subnet.objects.create(name="other_subnet"), netuid=2, blockchain="mainnet"
+    )
+    other_server = Server.objects.create(name="other_server", ip_address="127.0.0.2")
+    ValidatorInstance.objects.create(subnet_slot=other_slot, server=other_server, hotkey=validator_instance.hotkey)
+    UploadedFile.objects.create(
+        hotkey=validator_instance.hotkey,
+        subnet_slot=validator_instance.subnet_slot,
+        file_name="a.log",
+        storage_file_name="a.log",
+        file_size=10,
+    )
+
+    content = client.get(METRICS_URL).content.decode()
+
+    labels = 'blockchain="mainnet",subnet="test_subnet"'
+    assert f'auto_validator_uploaded_files{{{labels},window="1h"}} 1.0' in content
+    assert f'auto_validator_uploaded_files_bytes{{{labels},window="1h"}} 10.0' in content
+    assert 'auto_validator_uploaded_files{blockchain="mainnet",subnet="other_subnet"' not in content
+
+
+@pytest.mark.django_db
+def test_business_metrics_are_cached(client, redis_client, validator_instance, django_assert_num_queries):
+    with django_assert_num_queries(3):
+        client.get(METRICS_URL)
+    with django_assert_num_queries(0):
+        client.get(METRICS_URL)
+    redis_client.delete(CACHE_KEY)
+    with django_assert_num_queries(3):
+        client.get(METRICS_URL)
+
+
+@pytest.mark.django_db
+def test_authentication_failures_are_counted(api_client, wallet, validator_instance):
+    def get_failures():
+        return REGISTRY.get_sample_value("auto_validator_authentication_failures_total", {"reason": "invalid_nonce"})
+
+    failures_before = get_failures() or 0
+    file_content = io.BytesIO(b"file content")
+    file_content.name = "testfile.txt"
+    headers = {
+        "Nonce": str(time.time() - 3600),
+        "Hotkey": wallet.hotkey.ss58_address,
+        "Signature": "00",
+    }
+
+    response = api_client.post("/api/v1/files/", {"file": file_content}, format="multipart", headers=headers)
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert get_failures() == failures_before + 1
@@ -0,0 +1,33 @@
+import pytest
+from django.utils.timezone import now
+
+from auto_validator.core.models import Block, SubnetSlot
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def blocks():
+    return [Block.objects.create(serial_number=serial_number, timestamp=now()) for serial_number in (100, 200, 300)]
+
+
+def test_subnet_slot_registration_state_follows_blocks(subnet_slot, blocks):
+    first, second, third = blocks
+    assert (subnet_slot.is_registered, subnet_slot.active_since) == (False, None)
+
+    subnet_slot.registration_block = first
+    subnet_slot.save(update_fields=["registration_block"])
+    subnet_slot.refresh_from_db()
+    assert (subnet_slot.is_registered, subnet_slot.active_since) == (True, first.timestamp)
+
+    subnet_slot.deregistration_block = second
+    subnet_slot.save()
+    subnet_slot.refresh_from_db()
+    assert (subnet_slot.is_registered, subnet_slot.active_since) == (False, None)
+
+    subnet_slot.registration_block = third
+    subnet_slot.save()
+    subnet_slot.refresh_from_db()
+    assert (subnet_slot.is_registered, subnet_slot.active_since) == (True, third.timestamp)
+
+    assert list(SubnetSlot.objects.registered().values_list("blockchain", "netuid")) == [("mainnet", 1)]
@@ -0,0 +1,102 @@
+import json
+import time
+
+import pytest
+from constance.test import override_config
+from rest_framework import status
+
+from auto_validator.core.authentication import HotkeyAuthentication
+from auto_validator.core.utils import rate_limit
+
+V1_FILES_URL = "/api/v1/files/"
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def authentication_calls(monkeypatch):
+    calls = []
+
+    def authenticate(self, request):
+        calls.append(request)
+        return (None, None)
+
+    monkeypatch.setattr(HotkeyAuthentication, "authenticate", authenticate)
+    monkeypatch.setattr(HotkeyAuthentication, "verify_headers", lambda self, request: None)
+    return calls
+
+
+def post_upload(api_client, hotkey, size=100, ip_address="10.0.0.1"):
+    return api_client.post(
+        V1_FILES_URL,
+        b"x" * size,
+        content_type="multipart/form-data; boundary=boundary",
+        headers={"Hotkey": hotkey},
+        REMOTE_ADDR=ip_address,
+    )
+
+
+@override_config(UPLOAD_RATE_LIMIT_REQUESTS=2, UPLOAD_RATE_LIMIT_BYTES=0)
+def test_uploads_over_the_request_budget_are_rejected_before_authentication(
+    api_client, redis_client, authentication_calls
+):
+    for _ in range(2):
+        assert post_upload(api_client, "hotkey").status_code != status.HTTP_429_TOO_MANY_REQUESTS
+
+    response = post_upload(api_client, "hotkey")
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert 0 < int(response.headers["Retry-After"]) <= rate_limit.RATE_LIMIT_PERIOD / 2
+    assert len(authentication_calls) == 2
+
+    # the server IP has its own budget
+    assert post_upload(api_client, "other_hotkey").status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert post_upload(api_client, "other_hotkey", ip_address="10.0.0.2").status_code != 429
+
+
+@override_config(UPLOAD_RATE_LIMIT_REQUESTS=0, UPLOAD_RATE_LIMIT_BYTES=1000)
+def test_byte_budget(api_client, redis_client, authentication_calls):
+    assert post_upload(api_client, "hotkey", size=600).status_code != status.HTTP_429_TOO_MANY_REQUESTS
+    assert post_upload(api_client, "hotkey", size=600).status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert post_upload(api_client, "hotkey", size=300).status_code != status.HTTP_429_TOO_MANY_REQUESTS
+
+    response = post_upload(api_client, "hotkey", size=2000, ip_address="10.0.0.2")
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert "Retry-After" not in response.headers
+
+
+@override_config(UPLOAD_RATE_LIMIT_REQUESTS=2, UPLOAD_RATE_LIMIT_BYTES=0)
+def test_unsigned_uploads_do_not_use_up_the_budget_of_the_hotkey(api_client, redis_client, hotkey, monkeypatch):
+    headers = {"Hotkey": hotkey.hotkey, "Nonce": str(time.time()), "Signature": "00"}
+    statuses = [
+        api_client.post(V1_FILES_URL, {"file": b"x"}, format="multipart", headers=headers).status_code for _ in range(3)
+    ]
+    # the IP sending them does use up its own budget
+    assert statuses == [status.HTTP_403_FORBIDDEN, status.HTTP_403_FORBIDDEN, status.HTTP_429_TOO_MANY_REQUESTS]
+
+    monkeypatch.setattr(HotkeyAuthentication, "authenticate", lambda self, request: (None, None))
+    monkeypatch.setattr(HotkeyAuthentication, "verify_headers", lambda self, request: None)
+    for _ in range(2):
+        assert post_upload(api_client, hotkey.hotkey, ip_address="10.0.0.2").status_code != 429
+    assert post_upload(api_client, hotkey.hotkey, ip_address="10.0.0.3").status_code == 429
+
+
+@override_config(UPLOAD_RATE_LIMIT_REQUESTS=1, UPLOAD_RATE_LIMIT_BYTES=0)
+def test_rate_limited_upload_is_not_received(redis_client, authentication_calls, wsgi_upload):
+    body = b"x" * 100 * 1024
+    assert wsgi_upload(body, {"Hotkey": "hotkey"})[0] != status.HTTP_429_TOO_MANY_REQUESTS
+
+    status_code, bytes_read = wsgi_upload(body, {"Hotkey": "hotkey"})
+
+    assert status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert bytes_read == 0
+
+
+def test_subnet_budget_overrides(validator_instance):
+    validator_instance.subnet_slot.subnet.codename = "apex"
+    validator_instance.subnet_slot.subnet.save()
+
+    with override_config(UPLOAD_RATE_LIMIT_SUBNETS=json.dumps({"apex": {"requests": 5}})):
+        assert rate_limit.get_upload_budget(rate_limit.get_subnet_codename(validator_instance.hotkey.hotkey)) == (
+            rate_limit.UploadBudget(requests=5, bytes=2 * 1024**3)
+        )
+        assert rate_limit.get_upload_budget("other").requests == 60
@@ -0,0 +1,157 @@
+import json
+import pathlib
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from django.utils.timezone import now
+
+from auto_validator.core.models import Block, ChainCursor, SubnetSlot
+from auto_validator.core.utils.registration_watcher import (
+    ChainEvent,
+    CursorConflict,
+    SubstrateRegistrationEventSource,
+    watch_registrations,
+)
+
+COLDKEY = "5CoLDKeYoURSxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx1"
+RECORDED_EVENTS_PATH = pathlib.Path(__file__).parent / "fixtures" / "registration_events.json"
+
+pytestmark = pytest.mark.django_db
+
+
+class RecordedEventSource:
+    def __init__(self, finalized_block):
+        self.finalized_block = finalized_block
+        self.fetched_ranges = []
+        self.events = [
+            ChainEvent(**{**event, "timestamp": datetime.fromisoformat(event["timestamp"])})
+            for event in json.loads(RECORDED_EVENTS_PATH.read_text())
+        ]
+
+    def get_finalized_block_number(self):
+        return self.finalized_block
+
+    def fetch_events(self, start_block, end_block):
+        self.fetched_ranges.append((start_block, end_block))
+        return [event for event in self.events if start_block <= event.block_number <= end_block]
+
+
+class FakeSubstrate:
+    """
+    Substrate node whose event records hold the runtime they were decoded with.
+    """
+
+    def __init__(self, spec_versions, change_sets=None):
+        self.spec_versions = spec_versions
+        self.change_sets = change_sets or {}
+        self.runtime = None
+        self.storage_requests = []
+
+    def init_runtime(self, block_hash):
+        self.runtime = self.spec_versions[block_hash]
+
+    def create_storage_key(self, pallet, storage_function):
+        runtime = self.runtime
+        key = MagicMock()
+        key.to_hex.return_value = f"0x{storage_function}"
+        if storage_function == "Events":
+            record = {"module_id": "SubtensorModule", "event_id": "NetworkRemoved", "attributes": runtime}
+            key.decode_scale_value.return_value.value = [record]
+        else:
+            key.decode_scale_value.return_value.value = 1_700_000_000_000
+        return key
+
+    def batch_rpc_request(self, method, params_list):
+        if method == "chain_getBlockHash":
+            return [f"0x{number}" for (number,) in params_list]
+        if method == "state_getRuntimeVersion":
+            return [{"specVersion": self.spec_versions[block_hash]} for (block_hash,) in params_list]
+        self.storage_requests.append([block_hash for _, block_hash in params_list])
+        change_sets = [{"changes": [["0xEvents", "0x00"], ["0xNow", "0x00"]]}]
+        return [self.change_sets.get(block_hash, change_sets) for _, block_hash in params_list]
+
+
+def make_source(substrate):
+    source = SubstrateRegistrationEventSource.__new__(SubstrateRegistrationEventSource)
+    source.substrate = substrate
+    source._batch_rpc_request = substrate.batch_rpc_request
+    return source
+
+
+def test_substrate_events_are_decoded_with_the_runtime_of_their_block():
+    substrate = FakeSubstrate({"0x1": 200, "0x2": 200, "0x3": 201, "0x4": 201})
+
+    events = make_source(substrate).fetch_events(1, 4)
+
+    assert [(event.block_number, event.attributes) for event in events] == [(1, 200), (2, 200), (3, 201), (4, 201)]
+    assert substrate.storage_requests == [["0x1", "0x2"], ["0x3", "0x4"]]
+
+
+def test_substrate_blocks_without_stored_events_have_no_events():
+    change_sets = {
+        "0x1": [],
+        "0x2": [{"changes": [["0xEvents", None], ["0xNow", None]]}],
+        "0x3": [{"changes": [["0xNow", "0x00"]]}],
+    }
+    substrate = FakeSubstrate({"0x1": 200, "0x2": 200, "0x3": 200, "0x4": 200}, change_sets)
+
+    events = make_source(substrate).fetch_events(1, 4)
+
+    assert [event.block_number for event in events] == [4]
+
+
+@pytest.fixture
+def held_slot():
+    block = Block.objects.create(serial_number=3000000, timestamp=now())
+    return SubnetSlot.objects.create(blockchain="mainnet", netuid=7, registration_block=block)
+
+
+def test_watch_registrations_resumes_from_cursor(held_slot):
+    ChainCursor.objects.create(blockchain="mainnet", last_block=4000000)
+    source = RecordedEventSource(finalized_block=4002500)
+
+    assert watch_registrations("mainnet", source, COLDKEY, max_batches=2) == 1000
+    assert ChainCursor.objects.get(blockchain="mainnet").last_block == 4001000
+    assert list(SubnetSlot.objects.registered().values_list("netuid", flat=True)) == [12]
+
+    assert watch_registrations("mainnet", source, COLDKEY) == 1500
+    assert ChainCursor.objects.get(blockchain="mainnet").last_block == 4002500
+    assert source.fetched_ranges == [
+        (4000001, 4000500),
+        (4000501, 4001000),
+        (4001001, 4001500),
+        (4001501, 4002000),
+        (4002001, 4002500),
+    ]
+
+    held_slot.refresh_from_db()
+    assert (held_slot.is_registered, held_slot.deregistration_block_id) == (False, 4000650)
+    slot = SubnetSlot.objects.registered().get()
+    assert (slot.netuid, slot.registration_block_id, slot.deregistration_block_id) == (12, 4002400, 4001900)
+    assert slot.active_since == datetime.fromisoformat("2024-10-01T19:36:00+00:00")
+    assert not SubnetSlot.objects.filter(netuid=13).exists()
+    assert set(Block.objects.values_list("serial_number", flat=True)) == {3000000, 4000120, 4000650, 4001900, 4002400}
+
+
+def test_watch_registrations_starts_at_finalized_block_without_cursor():
+    source = RecordedEventSource(finalized_block=4002500)
+
+    assert watch_registrations("testnet", source, COLDKEY) == 0
+    assert ChainCursor.objects.get(blockchain="testnet").last_block == 4002500
+    assert source.fetched_ranges == []
+
+
+def test_watch_registrations_cursor_conflict(monkeypatch):
+    ChainCursor.objects.create(blockchain="mainnet", last_block=4000000)
+    source = RecordedEventSource(finalized_block=4000100)
+
+    def fetch_events_racing_with_another_watcher(start_block, end_block):
+        ChainCursor.objects.filter(blockchain="mainnet").update(last_block=4000100)
+        return []
+
+    monkeypatch.setattr(source, "fetch_events", fetch_events_racing_with_another_watcher)
+
+    with pytest.raises(CursorConflict):
+        watch_registrations("mainnet", source, COLDKEY)
+    assert ChainCursor.objects.get(blockchain="mainnet").last_block == 4000100
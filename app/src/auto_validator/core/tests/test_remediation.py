@@ -0,0 +1,112 @@
+from unittest.mock import MagicMock
+
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+
+from auto_validator.core.models import Hotkey, RemediationAction, Server, SubnetSlot, ValidatorInstance
+from auto_validator.core.utils import remediation
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def actions(monkeypatch):
+    actions = {
+        RemediationAction.Kind.RESTART: MagicMock(return_value="restarted"),
+        RemediationAction.Kind.REINSTALL: MagicMock(return_value="reinstalled"),
+    }
+    monkeypatch.setattr(remediation, "ACTIONS", actions)
+    return actions
+
+
+@pytest.fixture
+def stale_slot(subnet):
+    return SubnetSlot.objects.create(
+        subnet=subnet, netuid=5, blockchain="mainnet", restart_threshold=100, reinstall_threshold=1000
+    )
+
+
+def create_validator(slot, index, last_updated):
+    return ValidatorInstance.objects.create(
+        subnet_slot=slot,
+        server=Server.objects.create(name=f"server_{index}", ip_address=f"10.0.0.{index}"),
+        hotkey=Hotkey.objects.create(hotkey=f"{index:048d}"),
+        last_updated=last_updated,
+    )
+
+
+@pytest.mark.parametrize(
+    "blocks_behind,action",
+    [
+        (None, None),
+        (100, None),
+        (101, (RemediationAction.Kind.RESTART, 100)),
+        (1001, (RemediationAction.Kind.REINSTALL, 1000)),
+    ],
+)
+def test_get_required_action(stale_slot, blocks_behind, action):
+    assert remediation.get_required_action(stale_slot, blocks_behind) == action
+
+
+def test_get_required_action_ignores_disabled_thresholds(subnet_slot):
+    assert remediation.get_required_action(subnet_slot, 10**6) is None
+
+
+def test_remediate_validator_records_action_and_applies_cooldown(redis_client, actions, stale_slot):
+    validator = create_validator(stale_slot, 1, last_updated=150)
+
+    action = remediation.remediate_validator(validator.id)
+
+    assert (action.kind, action.status, action.message) == ("restart", "succeeded", "restarted")
+    assert (action.blocks_behind, action.threshold) == (150, 100)
+    assert action.finished_at is not None
+    actions[RemediationAction.Kind.RESTART].assert_called_once()
+
+    assert remediation.remediate_validator(validator.id) is None
+    assert RemediationAction.objects.count() == 1
+
+
+def test_remediate_validator_records_failure(redis_client, actions, stale_slot):
+    validator = create_validator(stale_slot, 1, last_updated=5000)
+    actions[RemediationAction.Kind.REINSTALL].side_effect = remediation.RemediationError("installer failed")
+
+    action = remediation.remediate_validator(validator.id)
+
+    assert (action.kind, action.status, action.message) == ("reinstall", "failed", "installer failed")
+    assert not redis_client.zcard(remediation.BUDGET_KEY)
+
+
+def test_remediate_validator_records_timeout(redis_client, actions, stale_slot):
+    validator = create_validator(stale_slot, 1, last_updated=5000)
+    actions[RemediationAction.Kind.REINSTALL].side_effect = SoftTimeLimitExceeded()
+
+    action = remediation.remediate_validator(validator.id)
+
+    assert (action.status, action.message) == ("failed", f"Timed out after {remediation.ACTION_TIME_LIMIT} seconds")
+    assert action.finished_at is not None
+    assert not redis_client.zcard(remediation.BUDGET_KEY)
+
+
+def test_remediate_validator_respects_concurrency_budget(redis_client, settings, actions, stale_slot):
+    settings.REMEDIATION_MAX_CONCURRENT_ACTIONS = 1
+    validator = create_validator(stale_slot, 1, last_updated=150)
+    budget = remediation.ConcurrencyBudget(redis_client, remediation.BUDGET_KEY, limit=1, lease_seconds=60)
+    token = budget.acquire()
+
+    assert remediation.remediate_validator(validator.id) is None
+    assert budget.acquire() is None
+
+    budget.release(token)
+    assert remediation.remediate_validator(validator.id).status == "succeeded"
+
+
+def test_remediate_validator_holds_off_when_many_validators_are_stale(redis_client, settings, actions, stale_slot):
+    settings.REMEDIATION_MAX_STALE_VALIDATORS = 2
+    validators = [create_validator(stale_slot, index, last_updated=150) for index in range(3)]
+
+    assert remediation.remediate_validator(validators[0].id) is None
+    assert not RemediationAction.objects.exists()
+
+    validators[2].last_updated = 10
+    validators[2].save()
+    assert remediation.remediate_validator(validators[0].id).status == "succeeded"
@@ -0,0 +1,102 @@
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from django.utils import timezone
+from rest_framework import status
+
+from auto_validator.core.models import DeletedFile, Hotkey, SubnetSlot, UploadedFile
+from auto_validator.core.utils import retention
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def now():
+    return timezone.now()
+
+
+def create_file(hotkey, name, created_at, file_size=1, subnet_slot=None):
+    uploaded_file = UploadedFile.objects.create(
+        file_name=name, file_size=file_size, hotkey=hotkey, storage_file_name=name, subnet_slot=subnet_slot
+    )
+    # created_at is auto_now_add
+    UploadedFile.objects.filter(id=uploaded_file.id).update(created_at=created_at)
+    return uploaded_file
+
+
+def remaining_files():
+    return set(UploadedFile.objects.values_list("file_name", flat=True))
+
+
+def test_max_age_uses_subnet_overrides(settings, hotkey, subnet_slot, now):
+    settings.UPLOADED_FILES_RETENTION_DAYS = 30
+    subnet_slot.subnet.log_retention_days = 7
+    subnet_slot.subnet.save()
+    create_file(hotkey, "old_default.txt", now - timedelta(days=31))
+    create_file(hotkey, "recent_default.txt", now - timedelta(days=10))
+    create_file(hotkey, "old_subnet.txt", now - timedelta(days=10), subnet_slot=subnet_slot)
+    create_file(hotkey, "recent_subnet.txt", now - timedelta(days=1), subnet_slot=subnet_slot)
+
+    report = retention.apply_retention_policies(now)
+
+    assert remaining_files() == {"recent_default.txt", "recent_subnet.txt"}
+    assert report.files_deleted == {"max_age": 2}
+    deleted_file = DeletedFile.objects.get(storage_file_name="old_subnet.txt")
+    assert (deleted_file.hotkey, deleted_file.reason) == (hotkey.hotkey, "max_age")
+
+
+def test_max_bytes_per_hotkey_deletes_oldest_files(settings, hotkey, subnet_slot, now):
+    settings.UPLOADED_FILES_MAX_BYTES_PER_HOTKEY = 10
+    other_slot = SubnetSlot.objects.create(netuid=2, blockchain="mainnet")
+    for age in range(4):
+        create_file(hotkey, f"file{age}.txt", now - timedelta(hours=age), file_size=4, subnet_slot=subnet_slot)
+    create_file(hotkey, "other_subnet.txt", now - timedelta(hours=5), file_size=8, subnet_slot=other_slot)
+    other_hotkey = Hotkey.objects.create(hotkey="other_hotkey")
+    create_file(other_hotkey, "other_hotkey.txt", now - timedelta(hours=5), file_size=8, subnet_slot=subnet_slot)
+
+    report = retention.apply_retention_policies(now)
+
+    assert remaining_files() == {"file0.txt", "file1.txt", "other_subnet.txt", "other_hotkey.txt"}
+    assert (report.files_deleted, report.bytes_reclaimed) == ({"max_bytes": 2}, {"max_bytes": 8})
+
+
+def test_s3_objects_are_deleted_in_batches(settings, monkeypatch, hotkey, now):
+    settings.UPLOADED_FILES_RETENTION_DAYS = 1
+    monkeypatch.setattr(retention, "DELETE_BATCH_SIZE", 2)
+    s3_storage = MagicMock()
+    s3_storage._normalize_name.side_effect = lambda name: f"logs/{name}"
+    s3_storage.bucket.meta.client.delete_objects.side_effect = [
+        {},
+        {"Errors": [{"Key": "logs/file3.txt", "Message": "Access Denied"}]},
+    ]
+    monkeypatch.setattr(retention, "default_storage", s3_storage)
+    for index in range(4):
+        create_file(hotkey, f"file{index}.txt", now - timedelta(days=2))
+
+    report = retention.apply_retention_policies(now)
+
+    delete_requests = [call.kwargs["Delete"] for call in s3_storage.bucket.meta.client.delete_objects.call_args_list]
+    assert [[obj["Key"] for obj in request["Objects"]] for request in delete_requests] == [
+        ["logs/file0.txt", "logs/file1.txt"],
+        ["logs/file2.txt", "logs/file3.txt"],
+    ]
+    # the file which could not be deleted from storage is kept for the next run
+    assert remaining_files() == {"file3.txt"}
+    assert (report.batches, report.failed_storage_deletes, report.files_deleted) == (2, 1, {"max_age": 3})
+
+
+def test_deleted_file_is_gone(api_client, settings, hotkey, now):
+    settings.UPLOADED_FILES_RETENTION_DAYS = 1
+    create_file(hotkey, "old.txt", now - timedelta(days=2))
+    create_file(hotkey, "recent.txt", now)
+    retention.apply_retention_policies(now)
+
+    def get_file(storage_file_name):
+        return api_client.get(f"/api/v1/files/{storage_file_name}/", headers={"Hotkey": hotkey.hotkey})
+
+    assert get_file("recent.txt").json()["url"] == "http://testserver/media/recent.txt"
+    response = get_file("old.txt")
+    assert response.status_code == status.HTTP_410_GONE
+    assert response.json()["reason"] == "max_age"
+    assert get_file("unknown.txt").status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,97 @@
+import pytest
+from rest_framework import status
+
+from auto_validator.core.models import Hotkey, Server, ValidatorInstance
+
+V1_VALIDATORS_URL = "/api/v1/validators/"
+V1_SERVERS_URL = "/api/v1/servers/"
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def token_client(api_client, auth_token, redis_client):
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {auth_token.key}")
+    return api_client
+
+
+def create_validators(subnet_slot, count):
+    for index in range(count):
+        server = Server.objects.create(name=f"server_{index}", ip_address=f"10.0.0.{index}")
+        hotkey = Hotkey.objects.create(hotkey=f"{index:048d}")
+        ValidatorInstance.objects.create(
+            subnet_slot=subnet_slot, server=server, hotkey=hotkey, last_updated=index, status=index % 2 == 0
+        )
+    Server.objects.create(name="spare", ip_address="10.0.1.1")
+
+
+def test_status_api_requires_authentication(api_client):
+    assert api_client.get(V1_VALIDATORS_URL).status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.parametrize("count", [1, 20])
+def test_validators_are_listed_with_one_query(token_client, subnet_slot, django_assert_num_queries, count):
+    create_validators(subnet_slot, count)
+
+    # token lookup and the validators
+    with django_assert_num_queries(2):
+        response = token_client.get(V1_VALIDATORS_URL)
+
+    assert response.status_code == status.HTTP_200_OK
+    results = response.json()["results"]
+    assert len(results) == count
+    assert results[0] == {
+        "id": results[0]["id"],
+        "hotkey": f"{0:048d}",
+        "subnet": "test_subnet",
+        "codename": None,
+        "blockchain": "mainnet",
+        "netuid": 1,
+        "ip_address": "10.0.0.0",
+        "status": True,
+        "last_updated": 0,
+        "uses_child_hotkey": False,
+        "created_at": results[0]["created_at"],
+    }
+
+
+def test_validators_cursor_pagination_and_field_selection(token_client, subnet_slot):
+    create_validators(subnet_slot, 5)
+
+    url = f"{V1_VALIDATORS_URL}?page_size=2&fields=id,last_updated"
+    pages = []
+    while url:
+        page = token_client.get(url).json()
+        pages.append(page["results"])
+        url = page["next"]
+
+    assert [[validator["last_updated"] for validator in page] for page in pages] == [[0, 1], [2, 3], [4]]
+    assert set(pages[0][0]) == {"id", "last_updated"}
+
+
+def test_servers_include_their_validator(token_client, subnet_slot, django_assert_num_queries):
+    create_validators(subnet_slot, 3)
+
+    with django_assert_num_queries(2):
+        response = token_client.get(V1_SERVERS_URL)
+
+    servers = {server["name"]: server for server in response.json()["results"]}
+    assert servers["server_1"]["validator"]["last_updated"] == 1
+    assert servers["server_1"]["validator"]["status"] is False
+    assert servers["spare"]["validator"] is None
+
+
+def test_status_api_is_cached_and_supports_conditional_get(token_client, subnet_slot, django_assert_num_queries):
+    create_validators(subnet_slot, 2)
+    response = token_client.get(V1_VALIDATORS_URL)
+    etag = response.headers["ETag"]
+
+    ValidatorInstance.objects.update(status=False)
+    # only the token lookup; the stale response is served from the cache
+    with django_assert_num_queries(1):
+        cached_response = token_client.get(V1_VALIDATORS_URL)
+    assert cached_response.content == response.content
+
+    not_modified = token_client.get(V1_VALIDATORS_URL, HTTP_IF_NONE_MATCH=etag)
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified.headers["ETag"] == etag
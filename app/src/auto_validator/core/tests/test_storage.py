@@ -0,0 +1,26 @@
+from unittest.mock import MagicMock
+
+from auto_validator.core.utils import storage
+
+
+def test_signed_urls_are_cached(redis_client, monkeypatch):
+    signing_storage = MagicMock(querystring_auth=True, querystring_expire=3600)
+    signing_storage.url.side_effect = lambda name: f"https://bucket.s3.amazonaws.com/{name}?Signature=1"
+    monkeypatch.setattr(storage, "default_storage", signing_storage)
+
+    assert storage.get_storage_urls(["a.txt", "b.txt"]) == {
+        "a.txt": "https://bucket.s3.amazonaws.com/a.txt?Signature=1",
+        "b.txt": "https://bucket.s3.amazonaws.com/b.txt?Signature=1",
+    }
+    assert signing_storage.url.call_count == 2
+
+    urls = storage.get_storage_urls(["a.txt", "b.txt", "c.txt"])
+
+    assert urls["a.txt"] == "https://bucket.s3.amazonaws.com/a.txt?Signature=1"
+    assert signing_storage.url.call_count == 3
+    assert 0 < redis_client.ttl(storage.SIGNED_URL_KEY.format(storage_file_name="c.txt")) <= 1800
+
+
+def test_unsigned_urls_are_not_cached(redis_client):
+    assert storage.get_storage_urls(["a.txt"]) == {"a.txt": "/media/a.txt"}
+    assert not redis_client.keys("storage_url:*")
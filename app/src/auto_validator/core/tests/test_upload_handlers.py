@@ -0,0 +1,105 @@
+import asyncio
+import io
+import time
+
+import pytest
+from channels.testing import ApplicationCommunicator
+from constance.test import override_config
+from rest_framework import parsers, status
+
+from auto_validator.asgi import application as asgi_application
+
+V1_FILES_URL = "/api/v1/files/"
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def parsed_bodies(monkeypatch):
+    parsed_bodies = []
+    parse = parsers.MultiPartParser.parse
+
+    def recording_parse(self, *args, **kwargs):
+        parsed_bodies.append(args)
+        return parse(self, *args, **kwargs)
+
+    monkeypatch.setattr(parsers.MultiPartParser, "parse", recording_parse)
+    return parsed_bodies
+
+
+def post_upload(api_client, hotkey, size=100, nonce=None):
+    file = io.BytesIO(b"x" * size)
+    file.name = "dump.log"
+    headers = {"Hotkey": hotkey, "Nonce": str(nonce or time.time()), "Signature": "00"}
+    return api_client.post(V1_FILES_URL, {"file": file}, format="multipart", headers=headers)
+
+
+@pytest.mark.parametrize(
+    "hotkey_known,nonce_age",
+    [
+        (True, 3600),
+        (False, 0),
+    ],
+)
+def test_invalid_headers_are_rejected_before_parsing(
+    api_client, redis_client, parsed_bodies, hotkey, hotkey_known, nonce_age
+):
+    response = post_upload(api_client, hotkey.hotkey if hotkey_known else "unknown", nonce=time.time() - nonce_age)
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert not parsed_bodies
+
+
+@override_config(API_UPLOAD_MAX_SIZE=1000)
+def test_too_large_content_length_is_rejected_before_parsing(api_client, redis_client, parsed_bodies, hotkey):
+    response = post_upload(api_client, hotkey.hotkey, size=100 * 1024)
+
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert not parsed_bodies
+
+
+@override_config(API_UPLOAD_MAX_SIZE=1000)
+def test_too_large_file_is_rejected_while_parsing(api_client, redis_client, parsed_bodies, hotkey):
+    response = post_upload(api_client, hotkey.hotkey, size=5000)
+
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert len(parsed_bodies) == 1
+
+
+@override_config(API_UPLOAD_MAX_SIZE=1000)
+def test_small_file_is_parsed(api_client, redis_client, parsed_bodies, hotkey):
+    response = post_upload(api_client, hotkey.hotkey, size=500)
+
+    # the signature is checked once the body is parsed
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert response.json()["detail"] == "Signature verification failed: Invalid SR25519 signature."
+    assert len(parsed_bodies) == 1
+
+
+@override_config(API_UPLOAD_MAX_SIZE=1000)
+def test_too_large_upload_is_not_received_by_the_wsgi_application(redis_client, wsgi_upload, hotkey):
+    headers = {"Hotkey": hotkey.hotkey, "Nonce": str(time.time()), "Signature": "00"}
+
+    status_code, bytes_read = wsgi_upload(b"x" * 100 * 1024, headers)
+
+    assert status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert bytes_read == 0
+
+
+def test_upload_is_not_received_by_the_asgi_application():
+    async def main():
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": "/api/v1/files/",
+            "headers": [(b"content-length", b"102400"), (b"content-type", b"multipart/form-data; boundary=b")],
+        }
+        communicator = ApplicationCommunicator(asgi_application, scope)
+        await communicator.send_input({"type": "http.request", "body": b"x" * 100 * 1024})
+        response = await communicator.receive_output()
+        await communicator.receive_output()
+        # Django's ASGI handler would receive the whole body before the view could reject it
+        assert response["status"] == status.HTTP_404_NOT_FOUND
+        assert communicator.input_queue.qsize() == 1
+
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from asgiref.sync import sync_to_async
+from channels.testing.websocket import WebsocketCommunicator
+from django.contrib.auth.models import AnonymousUser
+
+from auto_validator.core.consumers import ValidatorStatusConsumer
+from auto_validator.core.models import Server, ValidatorInstance
+from auto_validator.core.utils import status_updates
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def connect(user):
+    communicator = WebsocketCommunicator(ValidatorStatusConsumer.as_asgi(), "/ws/v1/validator-status/")
+    communicator.scope["user"] = user
+    return communicator
+
+
+@pytest.fixture
+def staff_user(django_user_model):
+    return django_user_model.objects.create_user(username="operator", password="operator", is_staff=True)
+
+
+@pytest.fixture
+def validators(validator_instance):
+    validators = [validator_instance]
+    for index in range(1, 500):
+        server = Server.objects.create(name=f"server_{index}", ip_address=f"10.0.{index // 256}.{index % 256}")
+        validators.append(
+            ValidatorInstance(subnet_slot=validator_instance.subnet_slot, server=server, last_updated=index)
+        )
+    ValidatorInstance.objects.bulk_create(validators[1:])
+    return validators
+
+
+def test_anonymous_user_is_rejected():
+    async def main():
+        communicator = connect(AnonymousUser())
+        connected, _ = await communicator.connect()
+        assert not connected
+
+    asyncio.run(main())
+
+
+def test_status_updates_are_sent_as_one_frame_per_tick(redis_client, monkeypatch, staff_user, validators):
+    schedule_flush = MagicMock()
+    monkeypatch.setattr(status_updates, "schedule_flush", schedule_flush)
+
+    async def main():
+        communicator = connect(staff_user)
+        connected, _ = await communicator.connect()
+        assert connected
+
+        await sync_to_async(status_updates.publish_validator_statuses)(validators)
+        validators[1].status = True
+        await sync_to_async(status_updates.publish_validator_statuses)([validators[1]])
+        await sync_to_async(status_updates.publish_install_progress)("10.0.0.1", "apex", "running installer")
+        schedule_flush.assert_called_once()
+        assert await sync_to_async(status_updates.flush_status_updates)() == 501
+
+        frame = await communicator.receive_json_from()
+        assert frame["type"] == "status_batch"
+        assert len(frame["validators"]) == 500
+        assert {"id": validators[1].id, "status": True, "last_updated": 1} in frame["validators"]
+        assert frame["installs"] == [
+            {"ip_address": "10.0.0.1", "subnet": "apex", "step": "running installer", "at": frame["installs"][0]["at"]}
+        ]
+        assert frame["uploads"] == []
+        assert await communicator.receive_nothing()
+
+        assert await sync_to_async(status_updates.flush_status_updates)() == 0
+        assert await communicator.receive_nothing()
+        await communicator.disconnect()
+
+    asyncio.run(main())
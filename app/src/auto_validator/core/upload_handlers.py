@@ -0,0 +1,28 @@
+from django.core.files.uploadhandler import FileUploadHandler
+from rest_framework import exceptions, status
+
+
+class UploadTooLarge(exceptions.APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Upload is too large."
+    default_code = "upload_too_large"
+
+
+class UploadSizeLimitHandler(FileUploadHandler):
+    """
+    Abort the upload as soon as a file grows over `max_size`, instead of after spooling all of it.
+
+    It has to come first in `request.upload_handlers`, so that it sees the data before the handlers storing it.
+    """
+
+    def __init__(self, max_size: int, request=None):
+        super().__init__(request)
+        self.max_size = max_size
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_size:
+            raise UploadTooLarge(f"File size must be < {self.max_size}B")
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
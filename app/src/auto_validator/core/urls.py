@@ -7,6 +7,7 @@ from drf_spectacular.views import (
 from rest_framework.authtoken.views import obtain_auth_token
 
 from .api import router
+from .views import download_uploaded_file
 
 urlpatterns = [
     path(
@@ -23,4 +24,5 @@ urlpatterns = [
     path("api/v1/", include(router.urls)),
     path("api-auth/", include("rest_framework.urls")),
     path("api-token-auth/", obtain_auth_token, name="api-token-auth"),
+    path("files/<path:storage_file_name>", download_uploaded_file, name="uploaded-file-download"),
 ]
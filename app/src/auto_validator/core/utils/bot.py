@@ -1,9 +1,127 @@
+import atexit
 import json
+import logging
+import os
+import queue
+import threading
 
 import redis
+from django.db import transaction
+
+from .redis_pool import get_redis_client
+
+BOT_COMMANDS_STREAM = "bot_commands:stream"
+BOT_COMMANDS_DEAD_LETTER_STREAM = "bot_commands:dead_letter"
+BOT_COMMANDS_STATS_KEY = "bot_commands:stats"
+BOT_COMMANDS_GROUP = "discord_bot"
+# acknowledged entries are deleted by the bot, so this only caps the backlog of a bot that is down for long
+BOT_COMMANDS_STREAM_MAX_LENGTH = 100_000
+MAX_COMMANDS_PER_PIPELINE = 100
+
+logger = logging.getLogger(__name__)
+
+
+class BotNotifier:
+    """
+    Appends bot commands to the bot command stream from a background thread.
+
+    Commands that pile up while a publish is in flight are sent together in a single pipeline,
+    so a burst of uploads costs one Redis round-trip per batch instead of one per upload.
+    """
+
+    def __init__(self):
+        self._queue: queue.SimpleQueue[str] = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def send(self, command: dict) -> None:
+        self._ensure_worker()
+        self._queue.put(json.dumps(command))
+
+    def flush(self) -> None:
+        """
+        Publish all queued commands from the calling thread.
+        """
+        while commands := self._drain():
+            self._publish(commands)
+
+    def _ensure_worker(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # threads do not survive a fork, so (prefork) workers start their own
+            self._queue = queue.SimpleQueue()
+            self._thread = threading.Thread(target=self._run, name="bot-notifier", daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def _run(self) -> None:
+        while True:
+            commands = [self._queue.get()]
+            commands.extend(self._drain(MAX_COMMANDS_PER_PIPELINE - 1))
+            self._publish(commands)
+
+    def _drain(self, limit: int = MAX_COMMANDS_PER_PIPELINE) -> list[str]:
+        commands: list[str] = []
+        while len(commands) < limit:
+            try:
+                commands.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return commands
+
+    def _publish(self, commands: list[str]) -> None:
+        try:
+            with get_redis_client().pipeline(transaction=False) as pipe:
+                for command in commands:
+                    pipe.xadd(
+                        BOT_COMMANDS_STREAM,
+                        {"command": command},
+                        maxlen=BOT_COMMANDS_STREAM_MAX_LENGTH,
+                        approximate=True,
+                    )
+                pipe.hincrby(BOT_COMMANDS_STATS_KEY, "enqueued", len(commands))
+                pipe.execute()
+        except redis.RedisError:
+            logger.exception("Failed to enqueue %d bot commands", len(commands))
+
+
+bot_notifier = BotNotifier()
+atexit.register(bot_notifier.flush)
 
 
 def trigger_bot_send_message(channel_name: str, message: str, realm: str):
-    redis_client = redis.Redis(host="localhost", port=8379, db=0)
+    """
+    Queue a message for the bot once the current transaction commits; never blocks on Redis.
+    """
     command = {"action": "send_message", "channel_name": channel_name, "message": message, "realm": realm}
-    redis_client.publish("bot_commands", json.dumps(command))
+    transaction.on_commit(lambda: bot_notifier.send(command))
+
+
+def get_bot_command_stats() -> dict[str, int]:
+    """
+    Backlog and throughput counters of the bot command stream.
+
+    `lag` counts commands not yet delivered to the bot, `pending` those delivered but not acknowledged;
+    the remaining counters are cumulative.
+    """
+    redis_client = get_redis_client()
+    with redis_client.pipeline(transaction=False) as pipe:
+        pipe.xlen(BOT_COMMANDS_STREAM)
+        pipe.xlen(BOT_COMMANDS_DEAD_LETTER_STREAM)
+        pipe.hgetall(BOT_COMMANDS_STATS_KEY)
+        length, dead_letter_length, counters = pipe.execute()
+    try:
+        pending = redis_client.xpending(BOT_COMMANDS_STREAM, BOT_COMMANDS_GROUP)["pending"]
+    except redis.ResponseError:  # the bot has not created its consumer group yet
+        pending = 0
+    return {
+        "lag": length - pending,
+        "pending": pending,
+        "dead_letter": dead_letter_length,
+        **{name: 0 for name in ("enqueued", "acked", "retried", "dead_lettered")},
+        **{name.decode(): int(value) for name, value in counters.items()},
+    }
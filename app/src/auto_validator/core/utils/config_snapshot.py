@@ -0,0 +1,99 @@
+"""
+Process-local snapshot of the constance settings for hot request paths.
+
+`constance.config` reads a value from its database backend on every attribute access. `config` here has the
+same interface, but reads all the values with one query and keeps them for `CONSTANCE_SNAPSHOT_TTL` seconds.
+A change made through constance drops the snapshot of the process making it right away and, once committed,
+those of all other processes through Redis pub/sub; a process which misses the message uses the old values
+until the TTL expires at most.
+"""
+
+import logging
+import os
+import threading
+import time
+
+import redis
+from constance.signals import config_updated
+from constance.utils import get_values as get_constance_values
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import receiver
+
+from .redis_pool import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "constance:invalidate"
+RESUBSCRIBE_DELAY = 5
+
+
+class ConfigSnapshot:
+    def __init__(self):
+        self._values: dict | None = None
+        self._expires_at = 0.0
+        self._generation = 0
+        self._subscriber_pid: int | None = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, key):
+        if key.startswith("_"):
+            raise AttributeError(key)
+        try:
+            return self.get_values()[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def get_values(self) -> dict:
+        values = self._values
+        if values is not None and time.monotonic() < self._expires_at:
+            return values
+        self.ensure_subscribed()
+        with self._lock:
+            generation = self._generation
+            values = get_constance_values()
+            # values read before an invalidation are used, but not kept
+            if generation == self._generation:
+                self._values = values
+                self._expires_at = time.monotonic() + settings.CONSTANCE_SNAPSHOT_TTL
+        return values
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._values = None
+
+    def ensure_subscribed(self) -> None:
+        # a forked worker does not inherit the thread of its parent
+        if settings.CONSTANCE_SNAPSHOT_TTL <= 0 or self._subscriber_pid == os.getpid():
+            return
+        self._subscriber_pid = os.getpid()
+        threading.Thread(target=self.listen_for_invalidations, name="constance-snapshot", daemon=True).start()
+
+    def listen_for_invalidations(self) -> None:
+        while True:
+            try:
+                pubsub = get_redis_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                # changes published while not subscribed were missed
+                self.invalidate()
+                for _message in pubsub.listen():
+                    self.invalidate()
+            except redis.RedisError:
+                logger.warning("Lost the constance invalidation subscription", exc_info=True)
+                time.sleep(RESUBSCRIBE_DELAY)
+
+
+config = ConfigSnapshot()
+
+
+def publish_invalidation() -> None:
+    try:
+        get_redis_client().publish(INVALIDATION_CHANNEL, 1)
+    except redis.RedisError:
+        logger.exception("Failed to publish the constance invalidation")
+
+
+@receiver(config_updated)
+def invalidate_config_snapshot(sender, key, old_value, new_value, **kwargs):
+    config.invalidate()
+    transaction.on_commit(publish_invalidation)
@@ -0,0 +1,71 @@
+"""
+Compressed, content-addressed storage of uploaded files, enabled by `UPLOADED_FILES_COMPRESSION`.
+
+An upload is streamed through a zstd compressor into a temporary file while it is hashed. Content is stored
+once per SHA-256 as a `FileContent`, whose `ref_count` counts the uploaded files having it; content no
+longer referenced is deleted by the retention task.
+"""
+
+import hashlib
+import logging
+import tempfile
+
+import zstandard
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+
+from .. import metrics
+from ..models import FileContent
+
+logger = logging.getLogger(__name__)
+
+# compressed uploads up to this size are kept in memory until stored
+SPOOL_MAX_SIZE = 8 * 2**20
+CHUNK_SIZE = 2**16
+
+
+def store_content(file) -> FileContent:
+    """
+    Store the compressed content of the uploaded file, unless identical content is stored already.
+    """
+    sha256 = hashlib.sha256()
+    compressor = zstandard.ZstdCompressor(level=settings.UPLOADED_FILES_ZSTD_LEVEL)
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as compressed:
+        with compressor.stream_writer(compressed, size=file.size, closefd=False) as writer:
+            for chunk in file.chunks(CHUNK_SIZE):
+                sha256.update(chunk)
+                writer.write(chunk)
+        stored_size = compressed.tell()
+        digest = sha256.hexdigest()
+
+        with transaction.atomic():
+            # the lock keeps the retention task from deleting the content while it gets a new reference
+            content, created = FileContent.objects.select_for_update().get_or_create(
+                sha256=digest, defaults={"size": file.size, "stored_size": stored_size, "ref_count": 1}
+            )
+            if created:
+                compressed.seek(0)
+                content.storage_file_name = default_storage.save(
+                    f"content/{digest}.zst", File(compressed), max_length=4095
+                )
+                content.save(update_fields=["storage_file_name"])
+            else:
+                FileContent.objects.filter(id=content.id).update(ref_count=F("ref_count") + 1)
+
+    if created:
+        metrics.UPLOAD_COMPRESSION_RATIO.observe(file.size / max(stored_size, 1))
+        metrics.UPLOAD_BYTES_SAVED.labels(reason="compression").inc(max(file.size - stored_size, 0))
+    else:
+        logger.info("Upload of %s bytes deduplicated with content %s", file.size, digest)
+        metrics.UPLOAD_BYTES_SAVED.labels(reason="deduplication").inc(file.size)
+    return content
+
+
+def open_decompressed(content: FileContent):
+    """
+    Return a file-like object reading the uncompressed content.
+    """
+    return zstandard.ZstdDecompressor().stream_reader(default_storage.open(content.storage_file_name, "rb"))
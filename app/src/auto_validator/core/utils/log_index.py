@@ -0,0 +1,148 @@
+"""
+Indexing of uploaded logs for the log search API.
+
+After an upload, the `index_uploaded_file` task streams the log from storage, decompressing it if it is
+stored compressed, and keeps only what is worth searching for: error lines, tracebacks with the exception
+types they end with, and the range of the timestamps of the lines. These are stored as a `LogIndex` with a
+full-text vector, so searches never read the files themselves.
+"""
+
+import datetime
+import logging
+import re
+from collections.abc import Iterable, Iterator
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import LogIndex, UploadedFile
+from .file_content import CHUNK_SIZE, open_decompressed
+
+logger = logging.getLogger(__name__)
+
+# text search configuration which keeps exception and module names as they are, without stemming
+SEARCH_CONFIG = "simple"
+MAX_EXCERPT_CHARS = 500_000
+MAX_LINE_CHARS = 1000
+
+# prefix of `docker compose logs` lines, e.g. "validator-1  | "
+COMPOSE_PREFIX_RE = re.compile(r"^[\w.-]+\s+\|\s?")
+TIMESTAMP_RE = re.compile(r"^\[?(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?)")
+ERROR_LINE_RE = re.compile(r"\b(?:ERROR|CRITICAL|FATAL)\b")
+EXCEPTION_NAME_RE = re.compile(r"\b((?:[a-z_][\w]*\.)*[A-Z]\w*(?:Error|Exception))\b")
+TRACEBACK_START = "Traceback (most recent call last):"
+TRACEBACK_END_RE = re.compile(r"^((?:[A-Za-z_]\w*\.)*[A-Za-z_]\w*)(?::|$)")
+
+
+class LogSummary:
+    def __init__(self):
+        self.excerpt_lines: list[str] = []
+        self.excerpt_chars = 0
+        self.exceptions: dict[str, None] = {}
+        self.error_count = 0
+        self.traceback_count = 0
+        self.first_timestamp = None
+        self.last_timestamp = None
+
+    def add_excerpt(self, line: str) -> None:
+        if self.excerpt_chars < MAX_EXCERPT_CHARS:
+            line = line[:MAX_LINE_CHARS]
+            self.excerpt_lines.append(line)
+            self.excerpt_chars += len(line) + 1
+
+    def add_timestamp(self, line: str) -> None:
+        if not (match := TIMESTAMP_RE.match(line)):
+            return
+        try:
+            timestamp = parse_datetime(match.group(1).replace(",", "."))
+        except ValueError:
+            return
+        if timestamp is None:
+            return
+        if timezone.is_naive(timestamp):
+            timestamp = timezone.make_aware(timestamp, datetime.UTC)
+        if self.first_timestamp is None or timestamp < self.first_timestamp:
+            self.first_timestamp = timestamp
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+
+    @property
+    def excerpt(self) -> str:
+        return "\n".join(self.excerpt_lines)
+
+
+def iter_lines(reader, max_bytes: int) -> Iterator[str]:
+    remainder = b""
+    read = 0
+    while read < max_bytes and (chunk := reader.read(CHUNK_SIZE)):
+        if not read and b"\0" in chunk:
+            logger.info("Not indexing a binary file")
+            return
+        read += len(chunk)
+        *lines, remainder = (remainder + chunk).split(b"\n")
+        for line in lines:
+            yield line.decode(errors="replace").rstrip("\r")
+    if remainder:
+        yield remainder.decode(errors="replace").rstrip("\r")
+
+
+def summarize_log(lines: Iterable[str]) -> LogSummary:
+    summary = LogSummary()
+    in_traceback = False
+    for line in lines:
+        line = COMPOSE_PREFIX_RE.sub("", line, count=1)
+        summary.add_timestamp(line)
+        if in_traceback:
+            if line[:1].isspace():
+                summary.add_excerpt(line)
+                continue
+            in_traceback = False
+            if match := TRACEBACK_END_RE.match(line):
+                summary.exceptions[match.group(1)] = None
+                summary.add_excerpt(line)
+                continue
+        if line.startswith(TRACEBACK_START):
+            in_traceback = True
+            summary.traceback_count += 1
+            summary.add_excerpt(line)
+        elif ERROR_LINE_RE.search(line):
+            summary.error_count += 1
+            summary.exceptions.update(dict.fromkeys(EXCEPTION_NAME_RE.findall(line)))
+            summary.add_excerpt(line)
+    return summary
+
+
+def open_log(uploaded_file: UploadedFile):
+    if uploaded_file.content is not None:
+        return open_decompressed(uploaded_file.content)
+    return default_storage.open(uploaded_file.storage_file_name, "rb")
+
+
+def index_uploaded_file(uploaded_file_id: int) -> LogIndex | None:
+    try:
+        uploaded_file = UploadedFile.objects.select_related("content").get(id=uploaded_file_id)
+    except UploadedFile.DoesNotExist:
+        logger.warning("Uploaded file %s does not exist", uploaded_file_id)
+        return None
+
+    with open_log(uploaded_file) as reader:
+        summary = summarize_log(iter_lines(reader, settings.LOG_INDEX_MAX_BYTES))
+    log_index, _ = LogIndex.objects.update_or_create(
+        uploaded_file=uploaded_file,
+        defaults={
+            "excerpt": summary.excerpt,
+            "exceptions": list(summary.exceptions),
+            "error_count": summary.error_count,
+            "traceback_count": summary.traceback_count,
+            "first_timestamp": summary.first_timestamp,
+            "last_timestamp": summary.last_timestamp,
+        },
+    )
+    LogIndex.objects.filter(pk=log_index.pk).update(search_vector=SearchVector("excerpt", config=SEARCH_CONFIG))
+    logger.info(
+        "Indexed %s: %s error lines, %s tracebacks", uploaded_file, summary.error_count, summary.traceback_count
+    )
+    return log_index
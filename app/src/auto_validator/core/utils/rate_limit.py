@@ -0,0 +1,140 @@
+"""
+Token-bucket rate limiting of file uploads per hotkey and per server IP.
+
+Each hotkey and each IP has a bucket of upload requests and a bucket of uploaded bytes, refilled over
+`RATE_LIMIT_PERIOD` up to the budget set in constance, optionally overridden per subnet codename with
+`UPLOAD_RATE_LIMIT_SUBNETS`. An upload costs one request and its Content-Length in bytes. The limit is
+checked from the headers only, before the multipart body is parsed and its signature verified, so rejected
+uploads cost one Redis round trip and one query. Since hotkeys are public, only the buckets of the IP are
+taken from then; those of the hotkey are only checked, and taken from once the signature is verified, so
+that unsigned requests cannot use up the budget of a validator. This saves receiving the body of rejected
+uploads as long as they are served by the WSGI app and streamed to it by nginx, see `auto_validator.asgi`.
+"""
+
+import dataclasses
+import json
+import logging
+import math
+import time
+from collections.abc import Collection
+
+import redis
+
+from ..models import ValidatorInstance
+from .config_snapshot import config
+from .redis_pool import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_PERIOD = 60 * 60
+BUCKET_KEY = "upload_rate_limit:{scope}:{identity}:{unit}"
+
+
+@dataclasses.dataclass(frozen=True)
+class UploadBudget:
+    requests: int
+    bytes: int
+
+
+def get_subnet_codename(hotkey: str) -> str | None:
+    return (
+        ValidatorInstance.objects.filter(hotkey__hotkey=hotkey)
+        .values_list("subnet_slot__subnet__codename", flat=True)
+        .first()
+    )
+
+
+def get_upload_budget(subnet_codename: str | None) -> UploadBudget:
+    """
+    Return the budget per period of the subnet; a budget of 0 is unlimited.
+    """
+    budget = UploadBudget(config.UPLOAD_RATE_LIMIT_REQUESTS, config.UPLOAD_RATE_LIMIT_BYTES)
+    if subnet_codename is None:
+        return budget
+    try:
+        overrides = json.loads(config.UPLOAD_RATE_LIMIT_SUBNETS or "{}")
+    except ValueError:
+        logger.error("UPLOAD_RATE_LIMIT_SUBNETS is not valid JSON")
+        return budget
+    override = overrides.get(subnet_codename) or {}
+    return UploadBudget(override.get("requests", budget.requests), override.get("bytes", budget.bytes))
+
+
+def take_tokens(
+    redis_client: redis.Redis, buckets: dict[str, tuple[int, int]], now: float, check_only: Collection[str] = ()
+) -> float:
+    """
+    Take the cost from each of the {key: (capacity, cost)} buckets, all or none of them; the buckets in
+    `check_only` need to have enough tokens, but are not taken from.
+
+    Return 0 if they were taken, otherwise the seconds until they could be.
+    """
+
+    def take(pipe: redis.client.Pipeline) -> float:
+        tokens = {}
+        wait = 0.0
+        for key, (capacity, cost) in buckets.items():
+            available, updated_at = pipe.hmget(key, "tokens", "updated_at")
+            refill_rate = capacity / RATE_LIMIT_PERIOD
+            if available is None:
+                available = capacity
+            else:
+                available = min(capacity, float(available) + (now - float(updated_at)) * refill_rate)
+            if cost > capacity:
+                wait = math.inf
+            elif available < cost:
+                wait = max(wait, (cost - available) / refill_rate)
+            tokens[key] = available - cost
+        if wait:
+            return wait
+        pipe.multi()
+        for key, available in tokens.items():
+            if key in check_only:
+                continue
+            pipe.hset(key, mapping={"tokens": available, "updated_at": now})
+            pipe.expire(key, RATE_LIMIT_PERIOD)
+        return 0.0
+
+    return redis_client.transaction(take, *buckets, value_from_callable=True)
+
+
+def get_buckets(budget: UploadBudget, scopes: dict[str, str], content_length: int) -> dict[str, tuple[int, int]]:
+    buckets = {}
+    for scope, identity in scopes.items():
+        for unit, capacity, cost in (("requests", budget.requests, 1), ("bytes", budget.bytes, content_length)):
+            if capacity:
+                buckets[BUCKET_KEY.format(scope=scope, identity=identity, unit=unit)] = (capacity, cost)
+    return buckets
+
+
+def take_upload_tokens(hotkey: str, buckets: dict[str, tuple[int, int]], check_only: Collection[str] = ()) -> float:
+    if not buckets:
+        return 0.0
+    try:
+        return take_tokens(get_redis_client(), buckets, time.time(), check_only)
+    except redis.RedisError:
+        # uploads are more important than their limits
+        logger.exception("Failed to check the upload rate limit of %s", hotkey)
+        return 0.0
+
+
+def check_upload_rate_limit(hotkey: str, ip_address: str, content_length: int) -> float:
+    """
+    Take an upload of `content_length` bytes from the budget of the IP, if the hotkey has enough budget left.
+
+    Return 0 if the upload is allowed, otherwise the seconds after which it would be.
+    """
+    budget = get_upload_budget(get_subnet_codename(hotkey))
+    buckets = get_buckets(budget, {"hotkey": hotkey, "ip": ip_address}, content_length)
+    hotkey_buckets = get_buckets(budget, {"hotkey": hotkey}, content_length)
+    return take_upload_tokens(hotkey, buckets, check_only=hotkey_buckets)
+
+
+def charge_hotkey_upload(hotkey: str, content_length: int) -> float:
+    """
+    Take an upload of `content_length` bytes from the budget of the hotkey, whose signature was verified.
+
+    Return 0 if it was taken, otherwise the seconds after which it could be.
+    """
+    budget = get_upload_budget(get_subnet_codename(hotkey))
+    return take_upload_tokens(hotkey, get_buckets(budget, {"hotkey": hotkey}, content_length))
@@ -0,0 +1,37 @@
+from functools import cache
+
+import redis
+import redis.asyncio
+from django.conf import settings
+
+
+@cache
+def get_redis_connection_pool() -> redis.ConnectionPool:
+    """
+    Process-wide Redis connection pool shared by the API, Celery tasks and the Discord bot.
+
+    redis-py resets the pool's connections after a fork, so the cached pool is safe to use in
+    gunicorn and Celery prefork workers.
+    """
+    return redis.ConnectionPool(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+    )
+
+
+def get_redis_client() -> redis.Redis:
+    return redis.Redis(connection_pool=get_redis_connection_pool())
+
+
+def get_async_redis_client() -> redis.asyncio.Redis:
+    """
+    Redis client for asyncio code; its pool is bound to the event loop it is first used in.
+    """
+    return redis.asyncio.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+    )
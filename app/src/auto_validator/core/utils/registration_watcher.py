@@ -0,0 +1,257 @@
+"""
+Follows finalized blocks and keeps `Block` and `SubnetSlot` registration state in sync with the chain.
+
+Events are fetched by `SubstrateRegistrationEventSource` in JSON-RPC batches, turned into registration
+changes for our coldkey and applied together with the persisted `ChainCursor`, so a restarted watcher
+resumes from the last committed block.
+"""
+
+import itertools
+import json
+import logging
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, Protocol
+
+from django.db import transaction
+from scalecodec import ScaleBytes  # type: ignore
+from substrateinterface import SubstrateInterface  # type: ignore
+from substrateinterface.exceptions import SubstrateRequestException  # type: ignore
+
+from ..models import Block, ChainCursor, SubnetSlot
+
+logger = logging.getLogger(__name__)
+
+REGISTRATION_EVENT_IDS = ("NetworkAdded", "NetworkRemoved")
+BLOCKS_PER_BATCH = 500
+BLOCKS_PER_RPC_BATCH = 100
+
+
+class CursorConflict(Exception):
+    """Another watcher advanced the cursor of the same blockchain in the meantime."""
+
+
+@dataclass(frozen=True)
+class ChainEvent:
+    block_number: int
+    timestamp: datetime
+    event_id: str
+    attributes: Any
+    signer: str | None = None
+
+    @property
+    def netuid(self) -> int:
+        return self.attributes[0] if isinstance(self.attributes, list | tuple) else self.attributes
+
+
+@dataclass(frozen=True)
+class RegistrationChange:
+    block_number: int
+    timestamp: datetime
+    netuid: int
+    registered: bool
+
+
+class RegistrationEventSource(Protocol):
+    def get_finalized_block_number(self) -> int: ...
+
+    def fetch_events(self, start_block: int, end_block: int) -> list[ChainEvent]: ...
+
+
+class SubstrateRegistrationEventSource:
+    """
+    Reads `SubtensorModule` network registration events from a substrate node.
+
+    Block hashes, runtime versions and `System.Events`/`Timestamp.Now` storage are requested as JSON-RPC
+    batches of `BLOCKS_PER_RPC_BATCH` calls per websocket frame instead of one round-trip per block. Events
+    are decoded with the runtime of their block, so a batch is split wherever the runtime was upgraded.
+    """
+
+    def __init__(self, url: str):
+        self.substrate = SubstrateInterface(url=url)
+
+    def close(self):
+        self.substrate.close()
+
+    def get_finalized_block_number(self) -> int:
+        return self.substrate.get_block_number(self.substrate.get_chain_finalised_head())
+
+    def fetch_events(self, start_block: int, end_block: int) -> list[ChainEvent]:
+        block_numbers = range(start_block, end_block + 1)
+        block_hashes = self._batch_rpc_request("chain_getBlockHash", [[number] for number in block_numbers])
+        runtime_versions = self._batch_rpc_request(
+            "state_getRuntimeVersion", [[block_hash] for block_hash in block_hashes]
+        )
+
+        block_records = []
+        # a runtime upgrade can change the event types, so blocks are decoded with the runtime they were made with
+        runtimes = itertools.groupby(
+            zip(block_numbers, block_hashes, runtime_versions), key=lambda block: block[2]["specVersion"]
+        )
+        for _, runtime_blocks in runtimes:
+            blocks = [(block_number, block_hash) for block_number, block_hash, _ in runtime_blocks]
+            block_records.extend(self._fetch_registration_records(blocks))
+
+        events = []
+        for block_number, block_hash, timestamp, records in block_records:
+            extrinsics = None
+            for record in records:
+                signer = None
+                if record["event_id"] == "NetworkAdded" and record["extrinsic_idx"] is not None:
+                    extrinsics = extrinsics or self.substrate.get_block(block_hash=block_hash)["extrinsics"]
+                    signer = extrinsics[record["extrinsic_idx"]].value.get("address")
+                events.append(
+                    ChainEvent(
+                        block_number=block_number,
+                        timestamp=timestamp,
+                        event_id=record["event_id"],
+                        attributes=record["attributes"],
+                        signer=signer,
+                    )
+                )
+        return events
+
+    def _fetch_registration_records(self, blocks: list[tuple[int, str]]) -> list[tuple[int, str, datetime, list]]:
+        """
+        Return the registration event records of the (number, hash) blocks, which all have the same runtime.
+        """
+        self.substrate.init_runtime(block_hash=blocks[-1][1])
+        events_key = self.substrate.create_storage_key("System", "Events")
+        timestamp_key = self.substrate.create_storage_key("Timestamp", "Now")
+        storage = self._batch_rpc_request(
+            "state_queryStorageAt",
+            [[[events_key.to_hex(), timestamp_key.to_hex()], block_hash] for _, block_hash in blocks],
+        )
+
+        block_records = []
+        for (block_number, block_hash), change_sets in zip(blocks, storage):
+            changes = dict(change_sets[0]["changes"]) if change_sets else {}
+            # pruned state has no events, which are skipped rather than failing every following run
+            if changes.get(events_key.to_hex()) is None:
+                logger.warning("No events stored for block %s", block_number)
+                continue
+            records = events_key.decode_scale_value(ScaleBytes(changes[events_key.to_hex()])).value
+            records = [
+                record
+                for record in records
+                if record["module_id"] == "SubtensorModule" and record["event_id"] in REGISTRATION_EVENT_IDS
+            ]
+            if not records:
+                continue
+            timestamp_ms = timestamp_key.decode_scale_value(ScaleBytes(changes[timestamp_key.to_hex()])).value
+            timestamp = datetime.fromtimestamp(timestamp_ms / 1000, tz=UTC)
+            block_records.append((block_number, block_hash, timestamp, records))
+        return block_records
+
+    def _batch_rpc_request(self, method: str, params_list: Sequence[list]) -> list:
+        results = []
+        for offset in range(0, len(params_list), BLOCKS_PER_RPC_BATCH):
+            payload = []
+            for params in params_list[offset : offset + BLOCKS_PER_RPC_BATCH]:
+                payload.append({"jsonrpc": "2.0", "method": method, "params": params, "id": self.substrate.request_id})
+                self.substrate.request_id += 1
+            self.substrate.websocket.send(json.dumps(payload))
+            responses = {response["id"]: response for response in json.loads(self.substrate.websocket.recv())}
+            for request in payload:
+                response = responses[request["id"]]
+                if "error" in response:
+                    raise SubstrateRequestException(response["error"]["message"])
+                results.append(response["result"])
+        return results
+
+
+def get_registration_changes(events: Iterable[ChainEvent], coldkey: str) -> list[RegistrationChange]:
+    """
+    Translate raw chain events to registration changes of our slots.
+
+    Only networks added by `coldkey` count as our registrations; any removed network is reported, since
+    it only affects slots we currently hold.
+    """
+    changes = []
+    for event in sorted(events, key=lambda event: event.block_number):
+        if event.event_id == "NetworkAdded" and event.signer != coldkey:
+            continue
+        changes.append(
+            RegistrationChange(
+                block_number=event.block_number,
+                timestamp=event.timestamp,
+                netuid=event.netuid,
+                registered=event.event_id == "NetworkAdded",
+            )
+        )
+    return changes
+
+
+def apply_registration_changes(
+    blockchain: str, changes: Sequence[RegistrationChange], last_block: int, new_last_block: int
+) -> None:
+    """
+    Store blocks of `changes`, update the affected slots and advance the cursor, all in one transaction.
+
+    The cursor is advanced only if it still points at `last_block`, so concurrently running watchers
+    cannot apply the same range twice.
+    """
+    with transaction.atomic():
+        advanced = ChainCursor.objects.filter(blockchain=blockchain, last_block=last_block).update(
+            last_block=new_last_block
+        )
+        if not advanced:
+            raise CursorConflict(f"{blockchain} cursor moved away from block {last_block}")
+
+        Block.objects.bulk_create(
+            {
+                change.block_number: Block(serial_number=change.block_number, timestamp=change.timestamp)
+                for change in changes
+            }.values(),
+            ignore_conflicts=True,
+        )
+        for change in changes:
+            if change.registered:
+                _register_slot(blockchain, change)
+            else:
+                _deregister_slot(blockchain, change)
+
+
+def _register_slot(blockchain: str, change: RegistrationChange) -> None:
+    slot = SubnetSlot.objects.filter(blockchain=blockchain, netuid=change.netuid).order_by("-id").first()
+    if slot is None or slot.is_registered:
+        slot = SubnetSlot(blockchain=blockchain, netuid=change.netuid)
+    slot.registration_block_id = change.block_number
+    slot.save()
+    logger.info("Registered %s", slot)
+
+
+def _deregister_slot(blockchain: str, change: RegistrationChange) -> None:
+    for slot in SubnetSlot.objects.registered().filter(blockchain=blockchain, netuid=change.netuid):
+        slot.deregistration_block_id = change.block_number
+        slot.save()
+        logger.info("Deregistered %s", slot)
+
+
+def watch_registrations(
+    blockchain: str,
+    source: RegistrationEventSource,
+    coldkey: str,
+    max_batches: int | None = None,
+) -> int:
+    """
+    Scan finalized blocks since the persisted cursor and return the number of blocks processed.
+
+    A blockchain without a cursor starts at the current finalized block instead of rescanning its history.
+    """
+    finalized_block = source.get_finalized_block_number()
+    cursor, _ = ChainCursor.objects.get_or_create(blockchain=blockchain, defaults={"last_block": finalized_block})
+    last_block = cursor.last_block
+    batches = itertools.count() if max_batches is None else range(max_batches)
+    for _ in batches:
+        if last_block >= finalized_block:
+            break
+        end_block = min(last_block + BLOCKS_PER_BATCH, finalized_block)
+        changes = get_registration_changes(source.fetch_events(last_block + 1, end_block), coldkey)
+        apply_registration_changes(blockchain, changes, last_block, end_block)
+        logger.info(
+            "Scanned %s blocks %s-%s: %s registration changes", blockchain, last_block + 1, end_block, len(changes)
+        )
+        last_block = end_block
+    return last_block - cursor.last_block
@@ -0,0 +1,188 @@
+"""
+Restarts and reinstalls validators which stopped setting weights.
+
+`update_validator_status_for_slot` hands every validator whose blocks since its last update exceed a
+threshold of its subnet slot to `remediate_validator`. An instance is acted on at most once per
+`REMEDIATION_COOLDOWN_SECONDS`, at most `REMEDIATION_MAX_CONCURRENT_ACTIONS` actions run at once, and
+none run while more than `REMEDIATION_MAX_STALE_VALIDATORS` validators of the blockchain are stale, as
+that points to a chain or status polling problem rather than to the validators themselves.
+Every action is recorded as a `RemediationAction`.
+"""
+
+import logging
+import time
+import uuid
+
+import redis
+from celery.exceptions import SoftTimeLimitExceeded
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .. import metrics
+from ..models import RemediationAction, SubnetSlot, ValidatorInstance
+from .redis_pool import get_redis_client
+from .ssh import SSH_Manager
+from .utils import get_remote_path, install_validator_on_remote_server
+
+logger = logging.getLogger(__name__)
+
+COOLDOWN_KEY = "remediation:cooldown:{instance_id}"
+BUDGET_KEY = "remediation:running"
+# reinstalling copies the subnet scripts and runs the installer, which takes much longer than other tasks
+ACTION_TIME_LIMIT = 30 * 60
+# the worker is only killed if the action did not stop in time to be recorded as failed
+ACTION_HARD_TIME_LIMIT = ACTION_TIME_LIMIT + 60
+
+
+class RemediationError(Exception):
+    pass
+
+
+class ConcurrencyBudget:
+    """
+    Redis semaphore shared by all workers; leases expire, so a killed worker does not hold one forever.
+    """
+
+    def __init__(self, redis_client: redis.Redis, key: str, limit: int, lease_seconds: int):
+        self.redis_client = redis_client
+        self.key = key
+        self.limit = limit
+        self.lease_seconds = lease_seconds
+
+    def acquire(self) -> str | None:
+        token = uuid.uuid4().hex
+        now = time.time()
+        with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(self.key, "-inf", now)
+            pipe.zadd(self.key, {token: now + self.lease_seconds})
+            pipe.zcard(self.key)
+            _removed, _added, leases = pipe.execute()
+        if leases > self.limit:
+            self.release(token)
+            return None
+        return token
+
+    def release(self, token: str) -> None:
+        self.redis_client.zrem(self.key, token)
+
+
+def get_required_action(
+    subnet_slot: SubnetSlot, blocks_behind: int | None
+) -> tuple[RemediationAction.Kind, int] | None:
+    """
+    Return the action for a validator of the slot and the threshold it exceeds; a threshold of 0 is disabled.
+    """
+    if blocks_behind is None:
+        return None
+    if 0 < subnet_slot.reinstall_threshold < blocks_behind:
+        return RemediationAction.Kind.REINSTALL, subnet_slot.reinstall_threshold
+    if 0 < subnet_slot.restart_threshold < blocks_behind:
+        return RemediationAction.Kind.RESTART, subnet_slot.restart_threshold
+    return None
+
+
+def count_stale_validators(blockchain: str) -> int:
+    over_restart = Q(subnet_slot__restart_threshold__gt=0, last_updated__gt=F("subnet_slot__restart_threshold"))
+    over_reinstall = Q(subnet_slot__reinstall_threshold__gt=0, last_updated__gt=F("subnet_slot__reinstall_threshold"))
+    return ValidatorInstance.objects.filter(over_restart | over_reinstall, subnet_slot__blockchain=blockchain).count()
+
+
+def get_subnet_codename(instance: ValidatorInstance) -> str:
+    subnet = instance.subnet_slot.subnet
+    if subnet is None or not subnet.codename:
+        raise RemediationError(f"Subnet slot {instance.subnet_slot} has no subnet codename")
+    return subnet.codename
+
+
+def restart_validator(instance: ValidatorInstance) -> str:
+    server = instance.server
+    command = settings.REMEDIATION_RESTART_COMMAND.format(remote_path=get_remote_path(get_subnet_codename(instance)))
+    ssh_manager = SSH_Manager(
+        server.ip_address, settings.REMEDIATION_SSH_USER, server.ssh_private_key, settings.REMEDIATION_SSH_PASSPHRASE
+    )
+    if not ssh_manager.connect():
+        raise RemediationError(f"Could not connect to {server.ip_address}")
+    try:
+        return ssh_manager.execute_command(command)
+    finally:
+        ssh_manager.close()
+
+
+def reinstall_validator(instance: ValidatorInstance) -> str:
+    server = instance.server
+    result = install_validator_on_remote_server(
+        get_subnet_codename(instance),
+        instance.subnet_slot.blockchain,
+        instance.subnet_slot.netuid,
+        server.ip_address,
+        settings.REMEDIATION_SSH_USER,
+        server.ssh_private_key,
+        settings.REMEDIATION_SSH_PASSPHRASE,
+    )
+    if result["status"] != "success":
+        raise RemediationError(result["message"])
+    return result["message"]
+
+
+ACTIONS = {
+    RemediationAction.Kind.RESTART: restart_validator,
+    RemediationAction.Kind.REINSTALL: reinstall_validator,
+}
+
+
+def remediate_validator(instance_id: int) -> RemediationAction | None:
+    """
+    Restart or reinstall the validator if it is still over a threshold; return the recorded action, if any.
+    """
+    try:
+        instance = ValidatorInstance.objects.select_related("subnet_slot__subnet", "server").get(id=instance_id)
+    except ValidatorInstance.DoesNotExist:
+        logger.warning("Validator instance %s does not exist", instance_id)
+        return None
+    slot = instance.subnet_slot
+    required_action = get_required_action(slot, instance.last_updated)
+    if required_action is None:
+        return None
+    kind, threshold = required_action
+
+    stale_validators = count_stale_validators(slot.blockchain)
+    if stale_validators > settings.REMEDIATION_MAX_STALE_VALIDATORS:
+        logger.warning("Not remediating %s: %s validators on %s are stale", instance, stale_validators, slot.blockchain)
+        return None
+
+    redis_client = get_redis_client()
+    cooldown_key = COOLDOWN_KEY.format(instance_id=instance.id)
+    if not redis_client.set(cooldown_key, kind, nx=True, ex=settings.REMEDIATION_COOLDOWN_SECONDS):
+        logger.info("Not remediating %s: it was remediated recently", instance)
+        return None
+    budget = ConcurrencyBudget(
+        redis_client, BUDGET_KEY, settings.REMEDIATION_MAX_CONCURRENT_ACTIONS, lease_seconds=ACTION_HARD_TIME_LIMIT
+    )
+    if (token := budget.acquire()) is None:
+        # let the next status update try again
+        redis_client.delete(cooldown_key)
+        logger.info("Not remediating %s: %s actions are already running", instance, budget.limit)
+        return None
+
+    action = RemediationAction.objects.create(
+        validator_instance=instance, kind=kind, blocks_behind=instance.last_updated, threshold=threshold
+    )
+    logger.info("Starting %s of %s, %s blocks behind", kind, instance, instance.last_updated)
+    try:
+        action.message = ACTIONS[kind](instance) or ""
+        action.status = RemediationAction.Status.SUCCEEDED
+    except SoftTimeLimitExceeded:
+        logger.error("Failed to %s %s in %s seconds", kind, instance, ACTION_TIME_LIMIT)
+        action.message = f"Timed out after {ACTION_TIME_LIMIT} seconds"
+        action.status = RemediationAction.Status.FAILED
+    except Exception as e:
+        logger.exception("Failed to %s %s", kind, instance)
+        action.message = str(e)
+        action.status = RemediationAction.Status.FAILED
+    finally:
+        budget.release(token)
+        action.finished_at = timezone.now()
+        action.save(update_fields=["message", "status", "finished_at"])
+    metrics.REMEDIATION_ACTIONS.labels(kind=kind, status=action.status).inc()
+    return action
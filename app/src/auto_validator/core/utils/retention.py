@@ -0,0 +1,210 @@
+"""
+Retention of uploaded log files.
+
+Files are kept for `UPLOADED_FILES_RETENTION_DAYS` and up to `UPLOADED_FILES_MAX_BYTES_PER_HOTKEY` bytes per
+hotkey and subnet, oldest first; subnets can override either with `log_retention_days` and
+`log_max_bytes_per_hotkey`. Expired files are deleted in batches of `DELETE_BATCH_SIZE`: their storage objects
+with a single DeleteObjects request on S3, then their rows in one transaction which leaves a `DeletedFile`
+tombstone for each, so that the API answers 410 Gone for them. Compressed files only release their reference
+to their `FileContent`, which is deleted once no file references it.
+"""
+
+import dataclasses
+import logging
+from collections import Counter
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F, Q, QuerySet, Sum, Window
+from django.utils import timezone
+
+from .. import metrics
+from ..models import DeletedFile, FileContent, Subnet, UploadedFile
+
+logger = logging.getLogger(__name__)
+
+# the maximum number of keys of an S3 DeleteObjects request
+DELETE_BATCH_SIZE = 1000
+# keep each run well below RETENTION_TIME_LIMIT; the next scheduled run continues where this one stopped
+MAX_BATCHES = 100
+RETENTION_TIME_LIMIT = 30 * 60
+
+BATCH_FIELDS = ("id", "storage_file_name", "file_name", "file_size", "created_at", "hotkey__hotkey", "content_id")
+
+
+@dataclasses.dataclass(frozen=True)
+class RetentionPolicy:
+    max_age_days: int
+    max_bytes_per_hotkey: int
+
+
+@dataclasses.dataclass
+class RetentionReport:
+    files_deleted: dict[str, int] = dataclasses.field(default_factory=dict)
+    bytes_reclaimed: dict[str, int] = dataclasses.field(default_factory=dict)
+    batches: int = 0
+    failed_storage_deletes: int = 0
+    contents_deleted: int = 0
+    content_bytes_reclaimed: int = 0
+
+    def add(self, reason: str, files: int, size: int) -> None:
+        self.files_deleted[reason] = self.files_deleted.get(reason, 0) + files
+        self.bytes_reclaimed[reason] = self.bytes_reclaimed.get(reason, 0) + size
+        metrics.RETENTION_DELETED_FILES.labels(reason=reason).inc(files)
+        metrics.RETENTION_RECLAIMED_BYTES.labels(reason=reason).inc(size)
+
+    @property
+    def total_bytes_reclaimed(self) -> int:
+        return sum(self.bytes_reclaimed.values())
+
+
+def get_policies() -> list[tuple[Q, RetentionPolicy]]:
+    """
+    Return the policies with the files they apply to; files of subnets without an override use the default one.
+    """
+    default = RetentionPolicy(settings.UPLOADED_FILES_RETENTION_DAYS, settings.UPLOADED_FILES_MAX_BYTES_PER_HOTKEY)
+    overrides = Subnet.objects.filter(
+        Q(log_retention_days__isnull=False) | Q(log_max_bytes_per_hotkey__isnull=False)
+    ).values_list("id", "log_retention_days", "log_max_bytes_per_hotkey")
+
+    policies = []
+    for subnet_id, max_age_days, max_bytes_per_hotkey in overrides:
+        policy = RetentionPolicy(
+            default.max_age_days if max_age_days is None else max_age_days,
+            default.max_bytes_per_hotkey if max_bytes_per_hotkey is None else max_bytes_per_hotkey,
+        )
+        policies.append((Q(subnet_slot__subnet_id=subnet_id), policy))
+    overridden_subnet_ids = [subnet_id for subnet_id, _, _ in overrides]
+    policies.append(
+        (Q(subnet_slot__subnet__isnull=True) | ~Q(subnet_slot__subnet_id__in=overridden_subnet_ids), default)
+    )
+    return policies
+
+
+def get_expired_files(files: Q, policy: RetentionPolicy, now: datetime) -> Iterator[tuple[str, QuerySet]]:
+    if policy.max_age_days:
+        cutoff = now - timedelta(days=policy.max_age_days)
+        yield DeletedFile.Reason.MAX_AGE, UploadedFile.objects.filter(files, created_at__lt=cutoff).order_by("id")
+    if policy.max_bytes_per_hotkey:
+        # bytes of the file and of all newer files of the same hotkey and subnet
+        kept_bytes = Window(
+            Sum("file_size"),
+            partition_by=[F("hotkey_id"), F("subnet_slot__subnet_id")],
+            order_by=[F("created_at").desc(), F("id").desc()],
+        )
+        over_quota = (
+            UploadedFile.objects.filter(files)
+            .annotate(kept_bytes=kept_bytes)
+            .filter(kept_bytes__gt=policy.max_bytes_per_hotkey)
+            .order_by("id")
+        )
+        yield DeletedFile.Reason.MAX_BYTES, over_quota
+
+
+def delete_storage_objects(storage_file_names: list[str]) -> set[str]:
+    """
+    Delete the files from the default storage and return the names of those which could not be deleted.
+    """
+    failed = set()
+    if not hasattr(default_storage, "bucket"):
+        for name in storage_file_names:
+            try:
+                default_storage.delete(name)
+            except OSError:
+                logger.exception("Failed to delete %s from storage", name)
+                failed.add(name)
+        return failed
+
+    from storages.utils import clean_name
+
+    keys = {default_storage._normalize_name(clean_name(name)): name for name in storage_file_names}
+    response = default_storage.bucket.meta.client.delete_objects(
+        Bucket=default_storage.bucket.name,
+        Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+    )
+    for error in response.get("Errors", []):
+        logger.error("Failed to delete %s from storage: %s", error["Key"], error.get("Message"))
+        failed.add(keys[error["Key"]])
+    return failed
+
+
+def delete_batch(batch: list[dict], reason: str, report: RetentionReport) -> bool:
+    """
+    Delete a batch of files and leave their tombstones; return whether all of them were deleted.
+    """
+    failed = delete_storage_objects(
+        [uploaded_file["storage_file_name"] for uploaded_file in batch if uploaded_file["content_id"] is None]
+    )
+    deleted = [uploaded_file for uploaded_file in batch if uploaded_file["storage_file_name"] not in failed]
+    with transaction.atomic():
+        DeletedFile.objects.bulk_create(
+            [
+                DeletedFile(
+                    storage_file_name=uploaded_file["storage_file_name"],
+                    hotkey=uploaded_file["hotkey__hotkey"],
+                    file_name=uploaded_file["file_name"],
+                    file_size=uploaded_file["file_size"],
+                    created_at=uploaded_file["created_at"],
+                    reason=reason,
+                )
+                for uploaded_file in deleted
+            ],
+            ignore_conflicts=True,
+        )
+        UploadedFile.objects.filter(id__in=[uploaded_file["id"] for uploaded_file in deleted]).delete()
+        references = Counter(uploaded_file["content_id"] for uploaded_file in deleted if uploaded_file["content_id"])
+        for content_id, count in references.items():
+            FileContent.objects.filter(id=content_id).update(ref_count=F("ref_count") - count)
+    report.batches += 1
+    report.failed_storage_deletes += len(failed)
+    report.add(reason, len(deleted), sum(uploaded_file["file_size"] for uploaded_file in deleted))
+    return not failed
+
+
+def delete_unreferenced_contents(report: RetentionReport, max_batches: int) -> None:
+    while report.batches < max_batches:
+        with transaction.atomic():
+            # uploads of the same content lock it before adding a reference, see `store_content`
+            contents = list(
+                FileContent.objects.select_for_update(skip_locked=True)
+                .filter(ref_count=0)
+                .order_by("id")[:DELETE_BATCH_SIZE]
+            )
+            if not contents:
+                return
+            failed = delete_storage_objects([content.storage_file_name for content in contents])
+            deleted = [content for content in contents if content.storage_file_name not in failed]
+            FileContent.objects.filter(id__in=[content.id for content in deleted]).delete()
+        report.batches += 1
+        report.failed_storage_deletes += len(failed)
+        report.contents_deleted += len(deleted)
+        report.content_bytes_reclaimed += sum(content.stored_size for content in deleted)
+        if failed:
+            return
+
+
+def apply_retention_policies(now: datetime | None = None, max_batches: int = MAX_BATCHES) -> RetentionReport:
+    now = now or timezone.now()
+    report = RetentionReport()
+    for files, policy in get_policies():
+        for reason, expired_files in get_expired_files(files, policy, now):
+            while report.batches < max_batches:
+                batch = list(expired_files.values(*BATCH_FIELDS)[:DELETE_BATCH_SIZE])
+                # files which failed to be deleted from storage are retried by the next run
+                if not batch or not delete_batch(batch, reason, report):
+                    break
+    delete_unreferenced_contents(report, max_batches)
+    logger.info(
+        "Retention deleted %s files of %s bytes and %s compressed contents of %s bytes in %s batches "
+        "(%s storage deletes failed)",
+        sum(report.files_deleted.values()),
+        report.total_bytes_reclaimed,
+        report.contents_deleted,
+        report.content_bytes_reclaimed,
+        report.batches,
+        report.failed_storage_deletes,
+    )
+    return report
@@ -0,0 +1,107 @@
+"""
+Live updates for the dashboards subscribed through `ValidatorStatusConsumer`.
+
+Producers record updates in a Redis hash keyed by what they describe, so repeated updates of the same
+validator or installation within a tick collapse into the latest one. The first update of a tick schedules
+the `flush_status_updates` task `STATUS_UPDATES_TICK_SECONDS` later, which sends everything pending to the
+channel layer group as a single message, i.e. one WebSocket frame per dashboard however many validators
+a status update cycle touched.
+"""
+
+import json
+import logging
+from collections.abc import Iterable
+
+import redis
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.utils import timezone
+
+from auto_validator.celery import app
+
+from ..models import UploadedFile, ValidatorInstance
+from .redis_pool import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+GROUP_NAME = "validator_status"
+PENDING_KEY = "status_updates:pending"
+FLUSH_SCHEDULED_KEY = "status_updates:flush_scheduled"
+# only matters if the flush task is lost, e.g. when the broker is restarted
+FLUSH_SCHEDULED_TTL = 60
+FLUSH_TASK_NAME = "auto_validator.core.tasks.flush_status_updates"
+UPDATE_KINDS = ("validators", "uploads", "installs")
+
+
+def publish(updates: Iterable[tuple[str, str | int, dict]]) -> None:
+    """
+    Record (kind, key, data) updates for the next batch; a later update with the same kind and key replaces it.
+    """
+    fields = {f"{kind}:{key}": json.dumps(data) for kind, key, data in updates}
+    if not fields:
+        return
+    try:
+        with get_redis_client().pipeline(transaction=False) as pipe:
+            pipe.hset(PENDING_KEY, mapping=fields)
+            pipe.set(FLUSH_SCHEDULED_KEY, 1, nx=True, ex=FLUSH_SCHEDULED_TTL)
+            _, flush_needed = pipe.execute()
+    except redis.RedisError:
+        logger.exception("Failed to publish %d status updates", len(fields))
+        return
+    if flush_needed:
+        schedule_flush()
+
+
+def schedule_flush() -> None:
+    app.signature(FLUSH_TASK_NAME).apply_async(countdown=settings.STATUS_UPDATES_TICK_SECONDS)
+
+
+def publish_validator_statuses(validators: Iterable[ValidatorInstance]) -> None:
+    publish(
+        (
+            "validators",
+            validator.id,
+            {"id": validator.id, "status": validator.status, "last_updated": validator.last_updated},
+        )
+        for validator in validators
+    )
+
+
+def publish_upload(uploaded_file: UploadedFile, subnet_name: str, netuid: int) -> None:
+    data = {
+        "id": uploaded_file.id,
+        "hotkey": uploaded_file.hotkey.hotkey,
+        "subnet": subnet_name,
+        "netuid": netuid,
+        "file_name": uploaded_file.file_name,
+        "file_size": uploaded_file.file_size,
+    }
+    publish([("uploads", uploaded_file.id, data)])
+
+
+def publish_install_progress(ip_address: str, subnet_codename: str, step: str) -> None:
+    data = {"ip_address": ip_address, "subnet": subnet_codename, "step": step, "at": timezone.now().isoformat()}
+    publish([("installs", ip_address, data)])
+
+
+def flush_status_updates() -> int:
+    """
+    Send the pending updates to the dashboards as one batch and return their number.
+    """
+    redis_client = get_redis_client()
+    # updates recorded from now on schedule the next flush
+    redis_client.delete(FLUSH_SCHEDULED_KEY)
+    with redis_client.pipeline(transaction=True) as pipe:
+        pipe.hgetall(PENDING_KEY)
+        pipe.delete(PENDING_KEY)
+        pending, _ = pipe.execute()
+    if not pending:
+        return 0
+
+    batch: dict[str, list[dict]] = {kind: [] for kind in UPDATE_KINDS}
+    for field, data in sorted(pending.items()):
+        kind, _key = field.decode().split(":", 1)
+        batch[kind].append(json.loads(data))
+    async_to_sync(get_channel_layer().group_send)(GROUP_NAME, {"type": "status.batch", "batch": batch})
+    return len(pending)
@@ -0,0 +1,53 @@
+"""
+URLs of uploaded files in the default storage.
+
+Signing S3 URLs is done for each file on each listing, so signed URLs are cached in Redis for half of their
+lifetime; a cached URL is therefore valid for at least half of `querystring_expire` after it is returned.
+"""
+
+import logging
+from collections.abc import Iterable
+
+import redis
+from django.core.files.storage import default_storage
+
+from .redis_pool import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+SIGNED_URL_KEY = "storage_url:{storage_file_name}"
+
+
+def get_storage_urls(storage_file_names: Iterable[str]) -> dict[str, str]:
+    """
+    Return the URLs of the given files, signing only those without a cached signed URL.
+    """
+    storage_file_names = list(dict.fromkeys(storage_file_names))
+    if not getattr(default_storage, "querystring_auth", False):
+        return {name: default_storage.url(name) for name in storage_file_names}
+
+    keys = [SIGNED_URL_KEY.format(storage_file_name=name) for name in storage_file_names]
+    redis_client = get_redis_client()
+    try:
+        cached_urls = redis_client.mget(keys) if keys else []
+    except redis.RedisError:
+        logger.exception("Failed to read cached storage URLs")
+        cached_urls = [None] * len(keys)
+
+    urls = {}
+    signed_urls = {}
+    for name, key, cached_url in zip(storage_file_names, keys, cached_urls):
+        if cached_url is not None:
+            urls[name] = cached_url.decode()
+        else:
+            urls[name] = signed_urls[key] = default_storage.url(name)
+
+    if signed_urls:
+        try:
+            with redis_client.pipeline(transaction=False) as pipe:
+                for key, url in signed_urls.items():
+                    pipe.set(key, url, ex=max(default_storage.querystring_expire // 2, 1))
+                pipe.execute()
+        except redis.RedisError:
+            logger.exception("Failed to cache %d storage URLs", len(signed_urls))
+    return urls
@@ -13,6 +13,7 @@ from django.shortcuts import redirect, render  # type: ignore
 
 from ..models import Subnet
 from .ssh import SSH_Manager
+from .status_updates import publish_install_progress
 
 GITHUB_SUBNETS_CONFIG_PATH = settings.GITHUB_SUBNETS_CONFIG_PATH
 LOCAL_SUBNETS_CONFIG_PATH = settings.LOCAL_SUBNETS_CONFIG_PATH
@@ -119,6 +120,19 @@ def generate_pre_config_file(
     return pre_config_path
 
 
+def get_remote_path(subnet_codename: str) -> str:
+    """
+    Directory of the subnet's validator on the remote server, from TARGET_PATH in the subnet's .env.template.
+    """
+    local_env_template_path = os.path.expanduser(LOCAL_SUBNETS_SCRIPTS_PATH / subnet_codename / ".env.template")
+
+    with open(local_env_template_path) as env_file:
+        for line in env_file:
+            if line.startswith("TARGET_PATH"):
+                return line.split("=")[1].strip()
+    raise ValueError(f"TARGET_PATH is missing in {local_env_template_path}")
+
+
 def install_validator_on_remote_server(
     subnet_codename: str,
     blockchain: str,
@@ -138,14 +152,7 @@ def install_validator_on_remote_server(
         subnet_codename, blockchain, netuid, ssh_ip_address, subnet_config_file_path, csv_file_path
     )
 
-    # Extract remote path from .env.template file
-    local_env_template_path = os.path.expanduser(LOCAL_SUBNETS_SCRIPTS_PATH / subnet_codename / ".env.template")
-
-    with open(local_env_template_path) as env_file:
-        for line in env_file:
-            if line.startswith("TARGET_PATH"):
-                remote_path = line.split("=")[1].strip()
-                break
+    remote_path = get_remote_path(subnet_codename)
     local_directory = os.path.expanduser(LOCAL_SUBNETS_SCRIPTS_PATH / subnet_codename)
     local_files = [
         os.path.join(local_directory, file)
@@ -154,6 +161,7 @@ def install_validator_on_remote_server(
     ]
     local_generator_path = os.path.abspath("auto_validator/core/utils/generate_env.py")
     local_files.append(local_generator_path)
+    publish_install_progress(ssh_ip_address, subnet_codename, "copying files")
     with SSH_Manager(ssh_ip_address, ssh_user, ssh_key_path, ssh_passphrase) as ssh_manager:
         ssh_manager.copy_files_to_remote(local_files, remote_path)
 
@@ -172,13 +180,17 @@ def install_validator_on_remote_server(
         remote_env_path = remote / ".env"
         command = f"python3 {os.path.join(remote_path, 'generate_env.py')} {remote_env_template_path} {remote_pre_config_path} {remote_env_path}"
         try:
+            publish_install_progress(ssh_ip_address, subnet_codename, "generating env")
             ssh_manager.execute_command(command)
 
             # Run install.sh on remote server
+            publish_install_progress(ssh_ip_address, subnet_codename, "running installer")
             remote_install_script_path = remote / "install.sh"
             ssh_manager.execute_command(f"bash {remote_install_script_path}")
+            publish_install_progress(ssh_ip_address, subnet_codename, "installed")
             return {"status": "success", "message": "Validator installed successfully."}
         except Exception as e:
+            publish_install_progress(ssh_ip_address, subnet_codename, "failed")
             return {"status": "error", "message": str(e)}
 
 
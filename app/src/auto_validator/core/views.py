@@ -0,0 +1,49 @@
+import mimetypes
+
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import redirect
+from django.utils.cache import patch_vary_headers
+from django.utils.http import content_disposition_header
+from django.views.decorators.http import require_safe
+
+from .models import DeletedFile, UploadedFile
+from .utils.file_content import CHUNK_SIZE, open_decompressed
+
+
+def stream(reader):
+    try:
+        while chunk := reader.read(CHUNK_SIZE):
+            yield chunk
+    finally:
+        reader.close()
+
+
+@require_safe
+def download_uploaded_file(request, storage_file_name):
+    """
+    Serve an uploaded file; compressed files are sent as they are stored if the client accepts zstd.
+    """
+    uploaded_file = UploadedFile.objects.select_related("content").filter(storage_file_name=storage_file_name).first()
+    if uploaded_file is None:
+        if DeletedFile.objects.filter(storage_file_name=storage_file_name).exists():
+            return HttpResponse("The file was deleted by the retention policy of its subnet.", status=410)
+        raise Http404
+    if uploaded_file.content is None:
+        return redirect(default_storage.url(uploaded_file.storage_file_name))
+
+    content = uploaded_file.content
+    content_type = mimetypes.guess_type(uploaded_file.file_name)[0] or "application/octet-stream"
+    accepted_encodings = {
+        encoding.split(";")[0].strip() for encoding in request.headers.get("Accept-Encoding", "").split(",")
+    }
+    if "zstd" in accepted_encodings:
+        response = FileResponse(default_storage.open(content.storage_file_name, "rb"), content_type=content_type)
+        response["Content-Encoding"] = "zstd"
+        response["Content-Length"] = content.stored_size
+    else:
+        response = StreamingHttpResponse(stream(open_decompressed(content)), content_type=content_type)
+        response["Content-Length"] = content.size
+    response["Content-Disposition"] = content_disposition_header(False, uploaded_file.file_name)
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
@@ -3,41 +3,51 @@ This module defines a Discord bot with commands and utilities for sending messag
 managing invites, and setting permissions in Discord channels.
 
 Classes:
-- DiscordBot: A custom Discord bot that extends `commands.Bot` to include additional functionality
+- DiscordBot: A custom Discord bot that extends `commands.AutoShardedBot` to include additional functionality
 such as sending messages, creating invite links, and managing channel permissions.
 
+Subnet channels are spread over the guilds in `GUILD_IDS` according to `PlacementMap`.
+
 Usage:
 Instantiate `DiscordBot` with a configuration and call `start_bot()` to run the bot.
 """
 
 import asyncio
-import json
 import logging
-import re
 from typing import Any
 
 import discord
-import redis
 from discord.ext import commands
 from django.conf import settings
 
+from auto_validator.core import metrics
+from auto_validator.core.utils.redis_pool import get_async_redis_client
+
 from .bot_utils import validate_bot_settings
+from .channel_index import ChannelIndex, parse_channel_name
+from .channel_sender import ChannelSender
+from .command_stream import CommandStreamConsumer
+from .pending_invites import PendingInviteStore
+from .placement import PlacementMap
 from .subnet_config import ChannelName, SubnetConfigManager, UserID
 
 
-class DiscordBot(commands.Bot):
+class DiscordBot(commands.AutoShardedBot):
     def __init__(self, logger: logging.Logger | None = None) -> None:
         validate_bot_settings()
         self.config: dict[str, Any] = {
             "DISCORD_BOT_TOKEN": settings.DISCORD_BOT_TOKEN,
-            "GUILD_ID": settings.GUILD_ID,
+            "GUILD_IDS": [int(guild_id) for guild_id in settings.GUILD_IDS],
             "SUBNET_CONFIG_URL": settings.SUBNET_CONFIG_URL,
             "BOT_NAME": settings.BOT_NAME,
             "CATEGORY_NAME": settings.CATEGORY_NAME,
         }
         self.logger: logging.Logger = logger
+        self.placement_map = PlacementMap(self.config["GUILD_IDS"], self.config["CATEGORY_NAME"])
         self.config_manager = SubnetConfigManager(self, self.logger, self.config)
         self.category_creation_lock = asyncio.Lock()
+        self.channel_sender = ChannelSender(self.logger)
+        self.channel_index = ChannelIndex(self.placement_map.is_bot_category)
 
         # Define intents
         intents = discord.Intents.default()
@@ -51,31 +61,38 @@ class DiscordBot(commands.Bot):
         self.logger.debug("DiscordBot initialized.")
 
         # Connect to Redis
-        self.redis_client = redis.Redis(host="localhost", port=8379, db=0)
+        self.redis_client = get_async_redis_client()
+        self.command_consumer = CommandStreamConsumer(
+            self.redis_client,
+            self.handle_command,
+            self.logger,
+            permanent_errors=(ValueError, KeyError, discord.Forbidden, discord.NotFound),
+        )
+        self.pending_invites = PendingInviteStore(self.redis_client)
 
     async def start_bot(self) -> None:
         await self.start(self.config["DISCORD_BOT_TOKEN"])
 
     async def setup_hook(self) -> None:
-        asyncio.create_task(self.listen_to_redis())
-
-    async def listen_to_redis(self):
-        pubsub = self.redis_client.pubsub()
-        pubsub.subscribe("bot_commands")
-        while True:
-            message = pubsub.get_message()
-            if message and message["type"] == "message":
-                data = json.loads(message["data"])
-                await self.handle_command(data)
-            await asyncio.sleep(0.1)
+        self._command_consumer_task = asyncio.create_task(self.consume_commands())
+
+    async def consume_commands(self) -> None:
+        """
+        Handle bot commands from the command stream once the bot is ready; commands sent while the bot
+        is down or starting up wait in the stream.
+        """
+        await self.wait_until_ready()
+        await self.command_consumer.run()
 
     async def handle_command(self, data):
         action = data.get("action")
         if action == "send_message":
-            subnet_codename = data["channel_name"]
+            subnet_identifier = data["channel_name"]
             message = data["message"]
             realm = data["realm"]
-            await self.send_message_to_channel(subnet_codename, message, realm)
+            await self.send_message_to_channel(subnet_identifier, message, realm)
+        else:
+            raise ValueError(f"Unknown bot command action: {action!r}")
 
     async def on_ready(self) -> None:
         """
@@ -85,6 +102,7 @@ class DiscordBot(commands.Bot):
         self.logger.info(f"Bot connected as {self.user}")
         for guild in self.guilds:
             self.logger.info(f"Connected to guild: {guild.name}")
+        self.channel_index.rebuild(await self._get_guilds())
         await self.config_manager.update_config_and_synchronize.start()
 
     async def on_member_join(self, member: discord.Member) -> None:
@@ -92,22 +110,19 @@ class DiscordBot(commands.Bot):
         Called when a new member joins a guild. Grants channel permissions based on the pending invite.
         """
         self.logger.info(f"Member {member.name} joined guild {member.guild.name}.")
+        if member.guild.id not in self.config["GUILD_IDS"]:
+            return
+        self.config_manager.member_cache.refresh_member(member)
 
         user_id = UserID(member.id)
 
-        # Check if the user has a pending invite with a specific channel
-        channels = await self._get_pending_user_channels(user_id)
-        for channel in channels:
-            if channel:
-                # Grant the user permissions to the specified channel
-                await self._grant_channel_permissions(user_id, channel)
-                self.logger.info(f"Granted permissions to {member.name} for channel '{channel}'.")
+        # Grant the channels the user was invited to, and forget the invite as it's no longer needed
+        for channel in await self.pending_invites.pop(member.guild.id, user_id):
+            await self._grant_channel_permissions(user_id, channel)
+            self.logger.info(f"Granted permissions to {member.name} for channel '{channel}'.")
 
-        # Clean up the pending invite entry as it's no longer needed
-        await self._remove_pending_user(user_id)
-
-    async def _create_channel(self, guild: discord.Guild, channel_name: ChannelName) -> None:
-        normalized_category_name = self.config["CATEGORY_NAME"].strip().lower()
+    async def _get_or_create_category(self, guild: discord.Guild, category_name: str) -> discord.CategoryChannel:
+        normalized_category_name = category_name.strip().lower()
         category = discord.utils.find(lambda c: c.name.strip().lower() == normalized_category_name, guild.categories)
 
         # If the category doesn't exist, create it
@@ -118,9 +133,25 @@ class DiscordBot(commands.Bot):
                     lambda c: c.name.strip().lower() == normalized_category_name, guild.categories
                 )
                 if category is None:
-                    self.logger.info(f"Category '{self.config['CATEGORY_NAME']}' not found. Creating new category.")
-                    category = await guild.create_category(name=self.config["CATEGORY_NAME"])
-                    self.logger.info(f"Category '{self.config['CATEGORY_NAME']}' created in guild {guild.name}.")
+                    self.logger.info(f"Category '{category_name}' not found. Creating new category.")
+                    category = await guild.create_category(name=category_name)
+                    self.logger.info(f"Category '{category_name}' created in guild {guild.name}.")
+        return category
+
+    async def _create_channel(self, guild: discord.Guild, channel_name: ChannelName) -> None:
+        category = await self._get_or_create_category(
+            guild, self.placement_map.place_channel(channel_name).category_name
+        )
+
+        # An archived channel of the subnet is restored instead of creating a new one
+        archived_channel = discord.utils.find(
+            lambda c: c.name == channel_name and c.category is not None and c.category.name == "Archive",
+            guild.text_channels,
+        )
+        if archived_channel is not None:
+            await archived_channel.edit(category=category, reason="Channel listed in the subnet config again.")
+            self.logger.info(f"Channel '{channel_name}' restored from the 'Archive' category in guild {guild.name}.")
+            return
 
         # Overwriting default permissions for the channel to make it private
         overwrites = {
@@ -130,6 +161,20 @@ class DiscordBot(commands.Bot):
         await guild.create_text_channel(name=channel_name, overwrites=overwrites, category=category)
         self.logger.info(f"Channel '{channel_name}' created in guild {guild.name}.")
 
+    async def _move_channel(self, guild: discord.Guild, channel_name: ChannelName, category_name: str) -> None:
+        category = await self._get_or_create_category(guild, category_name)
+        channel = discord.utils.find(
+            lambda c: c.name == channel_name
+            and c.category is not None
+            and self.placement_map.is_bot_category(c.category.name),
+            guild.text_channels,
+        )
+        if channel is None:
+            self.logger.error(f"Channel '{channel_name}' not found.")
+            raise ValueError(f"Channel '{channel_name}' not found.")
+        await channel.edit(category=category, reason="Channel placed in another category.")
+        self.logger.info(f"Channel '{channel_name}' moved to category '{category_name}' in guild {guild.name}.")
+
     async def _archieve_channel(self, guild: discord.Guild, channel_name: ChannelName) -> None:
         archive_category = discord.utils.get(guild.categories, name="Archive")
 
@@ -145,40 +190,54 @@ class DiscordBot(commands.Bot):
                 category=archive_category, reason="Channel moved to Archive as it's not listed in the subnet config."
             )
 
-    async def send_message_to_channel(self, subnet_codename: str, message: str, realm: str) -> None:
+    async def send_message_to_channel(self, subnet_identifier: str, message: str, realm: str) -> None:
+        """
+        Send a message to the channel of a subnet, identified by its codename or netuid.
+        """
         await self.wait_until_ready()
 
-        guild = await self._get_guild_or_raise(int(self.config["GUILD_ID"]))
-        category = discord.utils.get(guild.categories, name=self.config["CATEGORY_NAME"])
-
-        if category is None:
-            self.logger.error(f"Category named '{self.config['CATEGORY_NAME']}' not found in guild '{guild.name}'")
-            raise ValueError(f"Category named '{self.config['CATEGORY_NAME']}' not found in guild '{guild.name}'")
-
-        channels = category.text_channels
-        channel = await self._get_channel(channels, subnet_codename, realm)
+        if realm not in ("testnet", "devnet"):
+            realm = "mainnet"
+        channel_id = self.channel_index.get_channel_id(realm, subnet_identifier)
+        channel = self.get_channel(channel_id) if channel_id is not None else None
 
         if channel is None:
-            self.logger.error(f"Channel named '{channel.name}' not found in guild '{guild.name}'")
-            raise ValueError(f"Channel named '{channel.name}' not found in guild '{guild.name}'")
-        await channel.send(message)
-
-    async def _get_channel(self, channels, subnet_codename, realm):
-        prefix = "t" if realm == "testnet" else "d" if realm == "devnet" else ""
-        pattern = re.compile(rf"^{prefix}\d{{3}}-{subnet_codename}$")
-
-        for channel in channels:
-            if pattern.match(channel.name):
-                return channel
-
-        return None
+            self.logger.error(f"Channel for subnet '{subnet_identifier}' ({realm}) not found.")
+            raise ValueError(f"Channel for subnet '{subnet_identifier}' ({realm}) not found.")
+        with metrics.DISCORD_SEND_DURATION.labels(realm=realm).time():
+            await self.channel_sender.send(channel, message)
+
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel) -> None:
+        if channel.guild.id in self.config["GUILD_IDS"]:
+            self.channel_index.add(channel)
+            self.config_manager.member_cache.refresh_channel(channel)
+
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel) -> None:
+        if after.guild.id in self.config["GUILD_IDS"]:
+            self.channel_index.update(before, after)
+            if before.name != after.name:
+                self.config_manager.member_cache.remove_channel(before)
+            self.config_manager.member_cache.refresh_channel(after)
+
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        if channel.guild.id in self.config["GUILD_IDS"]:
+            self.channel_index.remove(channel)
+            self.config_manager.member_cache.remove_channel(channel)
+
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        if after.guild.id in self.config["GUILD_IDS"] and before.roles != after.roles:
+            self.config_manager.member_cache.refresh_member(after)
+
+    async def on_member_remove(self, member: discord.Member) -> None:
+        if member.guild.id in self.config["GUILD_IDS"]:
+            self.config_manager.member_cache.remove_member(member)
 
     async def _send_invite_link(self, user_id: UserID, channel_name: ChannelName) -> None:
         """
         Sends a one-time invite link to a user for a specific guild and channel.
         """
 
-        guild = await self._get_guild_or_raise(int(self.config["GUILD_ID"]))
+        guild = await self._get_channel_guild(channel_name)
 
         channel: discord.TextChannel | None = discord.utils.get(guild.text_channels, name=channel_name)
         if channel is None:
@@ -200,7 +259,7 @@ class DiscordBot(commands.Bot):
         Grants a user read and write permissions to a specified channel in a guild.
         """
 
-        guild = await self._get_guild_or_raise(int(self.config["GUILD_ID"]))
+        guild = await self._get_channel_guild(channel_name)
 
         # Check if the user is already a member of the server
         member: discord.Member | None = guild.get_member(user_id)
@@ -226,30 +285,12 @@ class DiscordBot(commands.Bot):
         self.logger.info(f"Granted read/write permissions to {member.name} for channel '{channel_name}'.")
         await member.send(f"You have been granted access to the channel '{channel_name}'.")
 
-    async def _send_invite_or_grant_permissions(self, user_id: UserID, channel_name: ChannelName):
-        """
-        Sends an invite link to a user if they are not a member of the server,
-        or grants permissions to a user if they are already a member.
-        """
-
-        guild = await self._get_guild_or_raise(int(self.config["GUILD_ID"]))
-
-        member: discord.Member | None = guild.get_member(user_id)
-        pending_user_channels: list[ChannelName] = await self._get_pending_user_channels(user_id)
-        if member is None and len(pending_user_channels) == 0:
-            await self._add_pending_user(user_id, channel_name)
-            await self._send_invite_link(user_id, channel_name)
-        elif member is None:
-            await self._add_pending_user(user_id, channel_name)
-        else:
-            await self._grant_channel_permissions(user_id, channel_name)
-
     async def _revoke_channel_permissions(self, user_id: UserID, channel_name: ChannelName):
         """
         Revokes permissions for a user in a specified channel in a guild.
         """
 
-        guild = await self._get_guild_or_raise(int(self.config["GUILD_ID"]))
+        guild = await self._get_channel_guild(channel_name)
 
         # Check if the user is already a member of the server
         member: discord.Member | None = guild.get_member(user_id)
@@ -279,12 +320,37 @@ class DiscordBot(commands.Bot):
         await member.send(f"Yor access to the '{channel_name}' channel has been revoked.")
 
     def _is_bot_channel(self, channel_name: ChannelName) -> bool:
-        bot_channel_regex = r"^[td]?\d{3}-[\S]+$"
-        return re.match(bot_channel_regex, channel_name) is not None
+        return parse_channel_name(channel_name) is not None
 
     async def close(self):
         self.config_manager.update_config_and_synchronize.cancel()
+        await self.channel_sender.close()
         await super().close()
+        await self.redis_client.close()
+
+    def _is_managed_channel(self, channel: discord.abc.GuildChannel) -> bool:
+        """
+        Whether the channel is a subnet channel in a bot category of one of the bot's guilds.
+        """
+        return (
+            isinstance(channel, discord.TextChannel)
+            and channel.guild.id in self.config["GUILD_IDS"]
+            and channel.category is not None
+            and self.placement_map.is_bot_category(channel.category.name)
+            and self._is_bot_channel(channel.name)
+        )
+
+    def _get_channel_guild_id(self, channel_name: ChannelName) -> int:
+        placement = self.placement_map.place_channel(channel_name)
+        if placement is None:
+            raise ValueError(f"'{channel_name}' is not a subnet channel name.")
+        return placement.guild_id
+
+    async def _get_channel_guild(self, channel_name: ChannelName) -> discord.Guild:
+        return await self._get_guild_or_raise(self._get_channel_guild_id(channel_name))
+
+    async def _get_guilds(self) -> list[discord.Guild]:
+        return [await self._get_guild_or_raise(guild_id) for guild_id in self.config["GUILD_IDS"]]
 
     async def _get_guild_or_raise(self, guild_id: int) -> discord.Guild:
         guild: discord.Guild | None = self.get_guild(guild_id)
@@ -293,19 +359,6 @@ class DiscordBot(commands.Bot):
             raise ValueError(f"Guild with ID {guild_id} not found.")
         return guild
 
-    async def _add_pending_user(self, user_id: UserID, channel_name: ChannelName):
-        redis_key = f"pending_users:{user_id}"
-        self.redis_client.sadd(redis_key, channel_name)
-
-    async def _remove_pending_user(self, user_id: UserID):
-        redis_key = f"pending_users:{user_id}"
-        self.redis_client.delete(redis_key)
-
-    async def _get_pending_user_channels(self, user_id: UserID) -> list[ChannelName]:
-        redis_key = f"pending_users:{user_id}"
-        channels = self.redis_client.smembers(redis_key)
-        return [ChannelName(ch.decode("utf-8")) for ch in channels]
-
     async def __aenter__(self):
         self._bot_task = asyncio.create_task(self.start_bot())
         await asyncio.sleep(1)  # Small delay to ensure the bot is starting up
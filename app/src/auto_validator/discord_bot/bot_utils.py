@@ -2,7 +2,7 @@ from django.conf import settings
 
 
 def validate_bot_settings():
-    required_settings = ["DISCORD_BOT_TOKEN", "GUILD_ID", "SUBNET_CONFIG_URL", "BOT_NAME", "CATEGORY_NAME"]
+    required_settings = ["DISCORD_BOT_TOKEN", "GUILD_IDS", "SUBNET_CONFIG_URL", "BOT_NAME", "CATEGORY_NAME"]
 
     missing_settings = []
     for setting in required_settings:
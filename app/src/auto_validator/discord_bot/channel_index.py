@@ -0,0 +1,81 @@
+"""
+In-memory index of the bot's subnet channels.
+
+Subnet channels are named `[t|d]<netuid>-<codename>` (see `DiscordSubnetConfig.generate_channel_name`);
+the index maps both (realm, codename) and (realm, netuid) to the channel id, so a notification does
+not have to scan the guild's channels.
+"""
+
+import re
+from collections.abc import Callable
+
+import discord
+
+CHANNEL_NAME_REGEX = re.compile(r"^(?P<prefix>[td]?)(?P<netuid>\d{3,})-(?P<codename>\S+)$")
+REALM_BY_PREFIX = {"": "mainnet", "t": "testnet", "d": "devnet"}
+
+
+def parse_channel_name(channel_name: str) -> tuple[str, int, str] | None:
+    """
+    Return the (realm, netuid, codename) of a subnet channel name, or None for other channels.
+    """
+    match = CHANNEL_NAME_REGEX.match(channel_name)
+    if match is None:
+        return None
+    return REALM_BY_PREFIX[match["prefix"]], int(match["netuid"]), match["codename"]
+
+
+class ChannelIndex:
+    def __init__(self, is_bot_category: Callable[[str], bool]) -> None:
+        self.is_bot_category = is_bot_category
+        self._by_codename: dict[tuple[str, str], int] = {}
+        self._by_netuid: dict[tuple[str, int], int] = {}
+        self._keys_by_channel_id: dict[int, tuple[tuple[str, str], tuple[str, int]]] = {}
+
+    def rebuild(self, guilds: list[discord.Guild]) -> None:
+        self._by_codename.clear()
+        self._by_netuid.clear()
+        self._keys_by_channel_id.clear()
+        for guild in guilds:
+            for channel in guild.text_channels:
+                self.add(channel)
+
+    def add(self, channel: discord.abc.GuildChannel) -> None:
+        """
+        Index a channel if it is a subnet channel in one of the bot's categories.
+        """
+        if not isinstance(channel, discord.TextChannel) or channel.category is None:
+            return
+        if not self.is_bot_category(channel.category.name):
+            return
+        parsed = parse_channel_name(channel.name)
+        if parsed is None:
+            return
+        realm, netuid, codename = parsed
+        self.remove(channel)
+        keys = ((realm, codename), (realm, netuid))
+        self._by_codename[keys[0]] = channel.id
+        self._by_netuid[keys[1]] = channel.id
+        self._keys_by_channel_id[channel.id] = keys
+
+    def remove(self, channel: discord.abc.GuildChannel) -> None:
+        keys = self._keys_by_channel_id.pop(channel.id, None)
+        if keys is None:
+            return
+        codename_key, netuid_key = keys
+        if self._by_codename.get(codename_key) == channel.id:
+            del self._by_codename[codename_key]
+        if self._by_netuid.get(netuid_key) == channel.id:
+            del self._by_netuid[netuid_key]
+
+    def update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel) -> None:
+        self.remove(before)
+        self.add(after)
+
+    def get_channel_id(self, realm: str, subnet_identifier: str | int) -> int | None:
+        """
+        Look up a channel by subnet codename, or by netuid if the identifier is a number.
+        """
+        if isinstance(subnet_identifier, int) or subnet_identifier.isdigit():
+            return self._by_netuid.get((realm, int(subnet_identifier)))
+        return self._by_codename.get((realm, subnet_identifier))
@@ -0,0 +1,147 @@
+"""
+Per-channel outbound buffer for bot messages.
+
+Messages sent to the same channel within `COALESCE_WINDOW_SECONDS` are joined into as few Discord
+messages as `MAX_MESSAGE_LENGTH` allows, and sends are paced to stay under Discord's per-channel
+rate limit instead of waiting for 429 responses.
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+
+import discord
+
+from auto_validator.core import metrics
+
+MAX_MESSAGE_LENGTH = 2000
+COALESCE_WINDOW_SECONDS = 2.0
+# Discord allows 5 messages per 5 seconds in a channel
+RATE_LIMIT_MESSAGES = 5
+RATE_LIMIT_PERIOD_SECONDS = 5.0
+
+
+@dataclass
+class Chunk:
+    text: str
+    # futures of the messages that are fully sent once this chunk is
+    completes: list[asyncio.Future] = field(default_factory=list)
+
+
+def split_message(message: str, max_length: int = MAX_MESSAGE_LENGTH) -> list[str]:
+    """
+    Split a message into parts of at most `max_length` characters, preferring line breaks.
+    """
+    parts = []
+    while len(message) > max_length:
+        cut = message.rfind("\n", 0, max_length + 1)
+        if cut <= 0:
+            parts.append(message[:max_length])
+            message = message[max_length:]
+        else:
+            parts.append(message[:cut])
+            message = message[cut + 1 :]
+    parts.append(message)
+    return parts
+
+
+def build_chunks(messages: list[tuple[str, asyncio.Future]], max_length: int = MAX_MESSAGE_LENGTH) -> list[Chunk]:
+    """
+    Join messages line by line into chunks of at most `max_length` characters.
+    """
+    chunks: list[Chunk] = []
+    for message, future in messages:
+        for part in split_message(message, max_length):
+            if chunks and len(chunks[-1].text) + 1 + len(part) <= max_length:
+                chunks[-1].text += "\n" + part
+            else:
+                chunks.append(Chunk(part))
+        chunks[-1].completes.append(future)
+    return chunks
+
+
+class ChannelSender:
+    def __init__(
+        self,
+        logger: logging.Logger,
+        coalesce_window: float = COALESCE_WINDOW_SECONDS,
+        rate_limit_messages: int = RATE_LIMIT_MESSAGES,
+        rate_limit_period: float = RATE_LIMIT_PERIOD_SECONDS,
+    ) -> None:
+        self.logger = logger
+        self.coalesce_window = coalesce_window
+        self.rate_limit_messages = rate_limit_messages
+        self.rate_limit_period = rate_limit_period
+        self._buffers: dict[int, list[tuple[str, asyncio.Future]]] = {}
+        self._flush_tasks: dict[int, asyncio.Task] = {}
+        self._sent_at: dict[int, deque[float]] = defaultdict(deque)
+
+    async def send(self, channel: discord.abc.Messageable, message: str) -> None:
+        """
+        Queue a message for the channel and wait until it has been sent as part of a coalesced message.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._buffers.setdefault(channel.id, []).append((message, future))
+        self._update_queue_depth()
+        if channel.id not in self._flush_tasks:
+            self._flush_tasks[channel.id] = asyncio.create_task(self._flush(channel))
+        await future
+
+    def queue_depths(self) -> dict[int, int]:
+        """
+        Number of messages waiting to be sent, by channel id.
+        """
+        return {channel_id: len(buffer) for channel_id, buffer in self._buffers.items()}
+
+    async def close(self) -> None:
+        for task in self._flush_tasks.values():
+            task.cancel()
+        await asyncio.gather(*self._flush_tasks.values(), return_exceptions=True)
+
+    async def _flush(self, channel: discord.abc.Messageable) -> None:
+        try:
+            await asyncio.sleep(self.coalesce_window)
+            # messages queued while a batch is rate limited go out together in the next one
+            while buffer := self._buffers.pop(channel.id, None):
+                self._update_queue_depth()
+                await self._send_batch(channel, buffer)
+        finally:
+            del self._flush_tasks[channel.id]
+            for _message, future in self._buffers.pop(channel.id, []):
+                future.cancel()
+            self._update_queue_depth()
+
+    def _update_queue_depth(self) -> None:
+        # set on every change, since a callback gauge is not collected in multiprocess mode
+        metrics.DISCORD_SEND_QUEUE_DEPTH.set(sum(self.queue_depths().values()))
+
+    async def _send_batch(self, channel: discord.abc.Messageable, buffer: list[tuple[str, asyncio.Future]]) -> None:
+        chunks = build_chunks(buffer)
+        self.logger.debug(f"Sending {len(buffer)} messages to channel {channel.id} in {len(chunks)} chunks.")
+        try:
+            for chunk in chunks:
+                await self._wait_for_rate_limit(channel.id)
+                await channel.send(chunk.text)
+                for future in chunk.completes:
+                    if not future.done():
+                        future.set_result(None)
+        except asyncio.CancelledError:
+            for _message, future in buffer:
+                future.cancel()
+            raise
+        except Exception as e:
+            self.logger.error(f"Failed to send messages to channel {channel.id}: {e}")
+            for _message, future in buffer:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def _wait_for_rate_limit(self, channel_id: int) -> None:
+        sent_at = self._sent_at[channel_id]
+        if len(sent_at) >= self.rate_limit_messages:
+            delay = sent_at[0] + self.rate_limit_period - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            sent_at.popleft()
+        sent_at.append(time.monotonic())
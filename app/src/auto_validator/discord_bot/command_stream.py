@@ -0,0 +1,159 @@
+"""
+Consumes bot commands from the Redis stream written by `auto_validator.core.utils.bot.BotNotifier`.
+
+Commands are read through a consumer group and acknowledged (and deleted) only after the handler
+succeeds. Commands left unacknowledged by a crashed or stuck consumer are reclaimed after
+`RECLAIM_IDLE_MS`; commands failing permanently or `MAX_DELIVERIES` times go to the dead-letter stream.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import redis
+import redis.asyncio
+
+from auto_validator.core.utils.bot import (
+    BOT_COMMANDS_DEAD_LETTER_STREAM,
+    BOT_COMMANDS_GROUP,
+    BOT_COMMANDS_STATS_KEY,
+    BOT_COMMANDS_STREAM,
+    BOT_COMMANDS_STREAM_MAX_LENGTH,
+)
+
+READ_COUNT = 50
+READ_BLOCK_MS = 5_000
+RECLAIM_IDLE_MS = 60_000
+MAX_DELIVERIES = 5
+# most handlers wait for a coalesced channel message, so this bounds how many can be coalesced at once
+MAX_CONCURRENT_COMMANDS = 50
+
+
+class CommandStreamConsumer:
+    def __init__(
+        self,
+        redis_client: redis.asyncio.Redis,
+        handler: Callable[[dict[str, Any]], Awaitable[None]],
+        logger: logging.Logger,
+        consumer_name: str = "discord-bot",
+        permanent_errors: tuple[type[Exception], ...] = (ValueError, KeyError),
+    ) -> None:
+        self.redis_client = redis_client
+        self.handler = handler
+        self.logger = logger
+        self.consumer_name = consumer_name
+        self.permanent_errors = permanent_errors
+        self.semaphore = asyncio.BoundedSemaphore(MAX_CONCURRENT_COMMANDS)
+        self._in_flight: set[bytes] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def run(self) -> None:
+        await self.create_group()
+        loop = asyncio.get_running_loop()
+        last_reclaim = None
+        while True:
+            if last_reclaim is None or loop.time() - last_reclaim >= RECLAIM_IDLE_MS / 1000:
+                await self.reclaim()
+                last_reclaim = loop.time()
+            await self.consume()
+
+    async def create_group(self) -> None:
+        try:
+            await self.redis_client.xgroup_create(BOT_COMMANDS_STREAM, BOT_COMMANDS_GROUP, id="0", mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def consume(self) -> None:
+        """
+        Wait for new commands and dispatch everything that arrived, up to READ_COUNT at once.
+        """
+        response = await self.redis_client.xreadgroup(
+            BOT_COMMANDS_GROUP,
+            self.consumer_name,
+            {BOT_COMMANDS_STREAM: ">"},
+            count=READ_COUNT,
+            block=READ_BLOCK_MS,
+        )
+        for _stream, entries in response:
+            for entry_id, fields in entries:
+                await self._dispatch(entry_id, fields, deliveries=1)
+
+    async def reclaim(self) -> None:
+        """
+        Take over commands that were delivered but not acknowledged for RECLAIM_IDLE_MS.
+        """
+        pending = await self.redis_client.xpending_range(
+            BOT_COMMANDS_STREAM, BOT_COMMANDS_GROUP, min="-", max="+", count=READ_COUNT, idle=RECLAIM_IDLE_MS
+        )
+        pending = [entry for entry in pending if entry["message_id"] not in self._in_flight]
+        if not pending:
+            return
+
+        claimed = await self.redis_client.xclaim(
+            BOT_COMMANDS_STREAM,
+            BOT_COMMANDS_GROUP,
+            self.consumer_name,
+            min_idle_time=RECLAIM_IDLE_MS,
+            message_ids=[entry["message_id"] for entry in pending],
+        )
+        await self.redis_client.hincrby(BOT_COMMANDS_STATS_KEY, "retried", len(claimed))
+        deliveries = {entry["message_id"]: entry["times_delivered"] + 1 for entry in pending}
+        for entry_id, fields in claimed:
+            self.logger.info("Retrying bot command %s (delivery %d)", entry_id, deliveries[entry_id])
+            await self._dispatch(entry_id, fields, deliveries[entry_id])
+
+    async def _dispatch(self, entry_id: bytes, fields: dict[bytes, bytes] | None, deliveries: int) -> None:
+        await self.semaphore.acquire()
+        self._in_flight.add(entry_id)
+        task = asyncio.create_task(self._handle(entry_id, fields, deliveries))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _handle(self, entry_id: bytes, fields: dict[bytes, bytes] | None, deliveries: int) -> None:
+        try:
+            if fields is None:  # trimmed from the stream before it was handled
+                await self._ack(entry_id)
+                return
+            try:
+                await self.handler(json.loads(fields[b"command"]))
+            except self.permanent_errors as e:
+                self.logger.exception("Bot command %s failed permanently", entry_id)
+                await self._dead_letter(entry_id, fields, deliveries, e)
+            except Exception as e:
+                if deliveries >= MAX_DELIVERIES:
+                    self.logger.exception("Bot command %s failed %d times", entry_id, deliveries)
+                    await self._dead_letter(entry_id, fields, deliveries, e)
+                else:
+                    self.logger.warning("Bot command %s failed, will be retried: %s", entry_id, e)
+            else:
+                await self._ack(entry_id)
+        except redis.RedisError:
+            self.logger.exception("Failed to settle bot command %s", entry_id)
+        finally:
+            self._in_flight.discard(entry_id)
+            self.semaphore.release()
+
+    async def _ack(self, entry_id: bytes) -> None:
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.xack(BOT_COMMANDS_STREAM, BOT_COMMANDS_GROUP, entry_id)
+            pipe.xdel(BOT_COMMANDS_STREAM, entry_id)
+            pipe.hincrby(BOT_COMMANDS_STATS_KEY, "acked")
+            await pipe.execute()
+
+    async def _dead_letter(
+        self, entry_id: bytes, fields: dict[bytes, bytes], deliveries: int, error: Exception
+    ) -> None:
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.xadd(
+                BOT_COMMANDS_DEAD_LETTER_STREAM,
+                {**fields, "entry_id": entry_id, "deliveries": deliveries, "error": repr(error)},
+                maxlen=BOT_COMMANDS_STREAM_MAX_LENGTH,
+                approximate=True,
+            )
+            pipe.xack(BOT_COMMANDS_STREAM, BOT_COMMANDS_GROUP, entry_id)
+            pipe.xdel(BOT_COMMANDS_STREAM, entry_id)
+            pipe.hincrby(BOT_COMMANDS_STATS_KEY, "dead_lettered")
+            await pipe.execute()
@@ -1,7 +1,9 @@
 import asyncio
 import logging
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
+from prometheus_client import start_http_server
 
 from auto_validator.discord_bot.bot import DiscordBot
 
@@ -13,4 +15,7 @@ class Command(BaseCommand):
         logger = logging.getLogger("bot")
         bot = DiscordBot(logger)
 
+        if settings.DISCORD_BOT_METRICS_PORT:
+            start_http_server(settings.DISCORD_BOT_METRICS_PORT)
+
         asyncio.run(bot.start_bot())
@@ -0,0 +1,69 @@
+"""
+Registry of maintainers invited to a guild who have not joined it yet.
+
+For each (guild, user) it keeps the set of channels to grant on join, and a marker that an invite
+link was already sent, so synchronization cycles do not send a new one each time. Both expire after
+`PENDING_INVITE_TTL` seconds, so a stale invite is eventually sent again.
+"""
+
+import redis.asyncio
+
+from .subnet_config import ChannelName, UserID
+
+PENDING_INVITE_TTL = 7 * 24 * 60 * 60
+
+
+def get_pending_channels_key(guild_id: int, user_id: UserID) -> str:
+    return f"pending_users:{guild_id}:{user_id}"
+
+
+def get_invited_key(guild_id: int, user_id: UserID) -> str:
+    return f"invited_users:{guild_id}:{user_id}"
+
+
+class PendingInviteStore:
+    def __init__(self, redis_client: redis.asyncio.Redis) -> None:
+        self.redis_client = redis_client
+
+    async def add(self, pending: list[tuple[int, UserID, ChannelName]]) -> dict[tuple[int, UserID], ChannelName]:
+        """
+        Register (guild_id, user_id, channel_name) pending invites in one round-trip.
+
+        Returns the (guild_id, user_id) pairs that have not been sent an invite link yet, with the channel
+        to create it for; they are marked as invited.
+        """
+        if not pending:
+            return {}
+        first_channels: dict[tuple[int, UserID], ChannelName] = {}
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            for guild_id, user_id, channel_name in pending:
+                key = get_pending_channels_key(guild_id, user_id)
+                pipe.sadd(key, channel_name)
+                pipe.expire(key, PENDING_INVITE_TTL)
+                first_channels.setdefault((guild_id, user_id), channel_name)
+            for (guild_id, user_id), channel_name in first_channels.items():
+                pipe.set(get_invited_key(guild_id, user_id), channel_name, nx=True, ex=PENDING_INVITE_TTL)
+            results = await pipe.execute()
+        invite_results = results[2 * len(pending) :]
+        return {
+            invitee: channel_name
+            for (invitee, channel_name), not_invited_yet in zip(first_channels.items(), invite_results)
+            if not_invited_yet
+        }
+
+    async def forget_invite(self, guild_id: int, user_id: UserID) -> None:
+        """
+        Allow another invite link to be sent, e.g. because sending this one failed.
+        """
+        await self.redis_client.delete(get_invited_key(guild_id, user_id))
+
+    async def pop(self, guild_id: int, user_id: UserID) -> list[ChannelName]:
+        """
+        Return and remove the pending channels of a user who joined the guild.
+        """
+        key = get_pending_channels_key(guild_id, user_id)
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.smembers(key)
+            pipe.delete(key, get_invited_key(guild_id, user_id))
+            channels, _deleted = await pipe.execute()
+        return sorted(ChannelName(channel.decode()) for channel in channels)
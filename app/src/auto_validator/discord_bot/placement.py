@@ -0,0 +1,75 @@
+"""
+Deterministic placement of subnet channels across the bot's guilds and categories.
+
+A guild holds at most 500 channels, categories included, and a category 50 channels, so subnet channels
+are spread over several guilds, each with as many numbered bot categories as needed. Each guild holds a
+fixed block of `NETUIDS_PER_GUILD` netuids, in the order of `GUILD_IDS`, so the placement of a channel only
+depends on its realm and netuid and on the position of its guild: it does not change when other subnets come
+and go, and a guild appended to `GUILD_IDS` only receives netuids no other guild has room for.
+"""
+
+import re
+from typing import NamedTuple
+
+from .channel_index import parse_channel_name
+
+REALMS = ("mainnet", "testnet", "devnet")
+CHANNELS_PER_CATEGORY = 50
+MAX_CHANNELS_PER_GUILD = 500
+# 450 channels in 9 categories, which leaves room in each guild for channels which are not subnet channels
+NETUIDS_PER_GUILD = 150
+
+
+class PlacementError(ValueError):
+    pass
+
+
+class ChannelPlacement(NamedTuple):
+    guild_id: int
+    category_name: str
+
+
+class PlacementMap:
+    def __init__(
+        self,
+        guild_ids: list[int],
+        category_name: str,
+        channels_per_category: int = CHANNELS_PER_CATEGORY,
+        netuids_per_guild: int = NETUIDS_PER_GUILD,
+    ):
+        if not guild_ids:
+            raise ValueError("At least one guild is required.")
+        self.guild_ids = guild_ids
+        self.category_name = category_name
+        self.channels_per_category = channels_per_category
+        self.netuids_per_guild = netuids_per_guild
+        self._category_regex = re.compile(rf"^{re.escape(category_name.strip().lower())}(-\d+)?$")
+
+    def place(self, realm: str, netuid: int) -> ChannelPlacement:
+        """
+        Netuids fill the guilds in blocks of `netuids_per_guild`; within a guild, the channels of a netuid in
+        all realms are adjacent and fill the guild's bot categories in order.
+
+        Raise `PlacementError` if the netuid is beyond the blocks of all guilds.
+        """
+        guild_index, slot = divmod(netuid, self.netuids_per_guild)
+        if guild_index >= len(self.guild_ids):
+            raise PlacementError(
+                f"No guild has room for netuid {netuid}: {len(self.guild_ids)} guilds hold "
+                f"{len(self.guild_ids) * self.netuids_per_guild} netuids, add a guild to GUILD_IDS."
+            )
+        category_index = (slot * len(REALMS) + REALMS.index(realm)) // self.channels_per_category
+        return ChannelPlacement(self.guild_ids[guild_index], self.get_category_name(category_index))
+
+    def place_channel(self, channel_name: str) -> ChannelPlacement | None:
+        parsed = parse_channel_name(channel_name)
+        if parsed is None:
+            return None
+        realm, netuid, _codename = parsed
+        return self.place(realm, netuid)
+
+    def get_category_name(self, category_index: int) -> str:
+        return self.category_name if category_index == 0 else f"{self.category_name}-{category_index + 1}"
+
+    def is_bot_category(self, category_name: str) -> bool:
+        return self._category_regex.match(category_name.strip().lower()) is not None
@@ -1,34 +1,41 @@
-import asyncio
+import hashlib
+import json
 import logging
-from typing import Any, Literal, NewType
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Annotated, Any, Literal, NewType
 
 import aiohttp
 import discord
 from discord.ext import tasks
-from pydantic import BaseModel, Field, ValidationError, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+
+from .placement import ChannelPlacement, PlacementError
+from .sync_executor import SyncExecutor, SyncOperation
 
 ChannelName = NewType("ChannelName", str)
 UserID = NewType("UserID", int)
 
+SYNC_STATE_KEY = "discord_sync:last_applied"
+SYNC_JOURNAL_KEY = "discord_sync:journal"
+SYNC_JOURNAL_MAX_LENGTH = 100
+
+
+class SynchronizationError(Exception):
+    pass
+
+
+MaintainerID = Annotated[UserID, Field(strict=True, ge=10**17)]
+
 
 class DiscordSubnetConfig(BaseModel):
-    maintainers_ids: list[UserID] = Field(
-        ..., min_length=1, description="List of maintainer IDs, each must be an 18-digit integer"
+    maintainers_ids: list[MaintainerID] = Field(
+        ..., min_length=1, strict=True, description="List of maintainer IDs, each must be at least an 18-digit integer"
     )
     subnet_codename: str = Field(..., min_length=1)
     netuid: int = Field(..., ge=0, le=32767)
     realm: Literal["testnet", "mainnet", "devnet"] = Field(...)
 
-    @field_validator("maintainers_ids", mode="before")
-    def validate_maintainer_ids(cls, users):
-        if not isinstance(users, list):
-            raise ValueError("maintainers_ids must be a list")
-
-        for user in users:
-            if not isinstance(user, int) or len(str(user)) < 18:
-                raise ValueError("Each maintainer ID must be at least 18-digit integer")
-        return users
-
     def generate_channel_name(self) -> ChannelName:
         prefix = "t" if self.realm == "testnet" else "d" if self.realm == "devnet" else ""
         return f"{prefix}{self.netuid:03d}-{self.subnet_codename}"
@@ -37,34 +44,140 @@ class DiscordSubnetConfig(BaseModel):
         return f"{self.__class__.__name__}({self.subnet_codename}, {self.netuid}, {self.realm})"
 
 
-class DiscordSubnetConfigFactory:
-    _used_realm_netuid_pairs: set[tuple[str, int]] = set()
-
-    @classmethod
-    def reset_state(cls):
-        cls._used_realm_netuid_pairs.clear()
+SUBNETS_CONFIG_ADAPTER = TypeAdapter(list[DiscordSubnetConfig])
+SUBNETS_CONFIG_CACHE_SIZE = 4
 
-    def validate_unique(subnet: DiscordSubnetConfig) -> None:
-        if (realm_netuid_pair := (subnet.realm, subnet.netuid)) in DiscordSubnetConfigFactory._used_realm_netuid_pairs:
-            raise ValueError(f"The combination of realm '{subnet.realm}' and netuid '{subnet.netuid}' must be unique.")
 
-        DiscordSubnetConfigFactory._used_realm_netuid_pairs.add(realm_netuid_pair)
+class DiscordSubnetConfigFactory:
+    # validated subnets by the content hash of their config
+    _validated_subnets: dict[str, tuple[DiscordSubnetConfig, ...]] = {}
+
+    @staticmethod
+    def validate_unique(subnets: list[DiscordSubnetConfig]) -> None:
+        used_realm_netuid_pairs: set[tuple[str, int]] = set()
+        for subnet in subnets:
+            if (realm_netuid_pair := (subnet.realm, subnet.netuid)) in used_realm_netuid_pairs:
+                raise ValueError(
+                    f"The combination of realm '{subnet.realm}' and netuid '{subnet.netuid}' must be unique."
+                )
+            used_realm_netuid_pairs.add(realm_netuid_pair)
 
     @classmethod
     def get_subnets_config(cls, logger: logging.Logger, config_data: dict) -> list[DiscordSubnetConfig]:
-        subnets = []
-        for subnet_config in config_data.get("subnets", []):
-            try:
-                subnet = DiscordSubnetConfig(**subnet_config)
-                cls.validate_unique(subnet)
-                subnets.append(subnet)
-            except (ValidationError, ValueError) as e:
-                logger.exception(f"Validation error for subnet {subnet_config.get('subnet_codename', 'unknown')}: {e}")
-                raise
+        """
+        Validate all subnets of the config at once.
+        """
+        try:
+            subnets = SUBNETS_CONFIG_ADAPTER.validate_python(config_data.get("subnets", []))
+            cls.validate_unique(subnets)
+        except (ValidationError, ValueError) as e:
+            logger.exception(f"Validation error in subnets config: {e}")
+            raise
+        return subnets
 
+    @classmethod
+    def get_subnets_config_from_json(cls, logger: logging.Logger, raw_config: bytes) -> list[DiscordSubnetConfig]:
+        """
+        Like `get_subnets_config`, for a JSON config; an unchanged config is returned from the cache.
+        """
+        content_hash = hashlib.sha256(raw_config).hexdigest()
+        if (subnets := cls._validated_subnets.get(content_hash)) is not None:
+            return list(subnets)
+
+        subnets = cls.get_subnets_config(logger, json.loads(raw_config))
+        if len(cls._validated_subnets) >= SUBNETS_CONFIG_CACHE_SIZE:
+            del cls._validated_subnets[next(iter(cls._validated_subnets))]
+        cls._validated_subnets[content_hash] = tuple(subnets)
         return subnets
 
 
+def hash_channel_user_mapping(mapping: dict[ChannelName, list[UserID]]) -> str:
+    serialized = json.dumps({channel: sorted(users) for channel, users in mapping.items()}, sort_keys=True)
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+class ChannelMemberCache:
+    """
+    Users who can view each bot channel, and where the channel is placed, kept up to date from gateway events.
+
+    `changed` is set whenever an event alters the cached state, so a synchronization can tell whether
+    the server may have drifted from the last applied config.
+    """
+
+    def __init__(self, is_bot_channel: Callable[[discord.abc.GuildChannel], bool]):
+        self.is_bot_channel = is_bot_channel
+        self.channels: dict[ChannelName, set[UserID]] | None = None
+        self.locations: dict[ChannelName, ChannelPlacement] = {}
+        self.changed = True
+
+    def rebuild(self, guilds: list[discord.Guild]) -> None:
+        self.channels = {}
+        self.locations = {}
+        for guild in guilds:
+            for channel in guild.text_channels:
+                if self.is_bot_channel(channel):
+                    self.channels[ChannelName(channel.name)] = self._get_viewers(channel)
+                    self.locations[ChannelName(channel.name)] = self._get_location(channel)
+        self.changed = True
+
+    def mapping(self) -> dict[ChannelName, set[UserID]]:
+        return {channel_name: set(users) for channel_name, users in (self.channels or {}).items()}
+
+    def refresh_channel(self, channel: discord.abc.GuildChannel) -> None:
+        if self.channels is None:
+            return
+        if not self.is_bot_channel(channel):
+            # e.g. moved to the archive
+            self.remove_channel(channel)
+            return
+        channel_name, viewers, location = (
+            ChannelName(channel.name),
+            self._get_viewers(channel),
+            self._get_location(channel),
+        )
+        if self.channels.get(channel_name) != viewers or self.locations.get(channel_name) != location:
+            self.channels[channel_name] = viewers
+            self.locations[channel_name] = location
+            self.changed = True
+
+    def remove_channel(self, channel: discord.abc.GuildChannel) -> None:
+        location = self.locations.get(ChannelName(channel.name))
+        if self.channels is None or location is None or location.guild_id != channel.guild.id:
+            return
+        del self.channels[ChannelName(channel.name)]
+        del self.locations[ChannelName(channel.name)]
+        self.changed = True
+
+    def refresh_member(self, member: discord.Member) -> None:
+        if self.channels is None:
+            return
+        for channel in member.guild.text_channels:
+            if not self._is_cached(channel):
+                continue
+            viewers = self.channels[ChannelName(channel.name)]
+            can_view = channel.permissions_for(member).view_channel
+            if can_view != (member.id in viewers):
+                viewers.symmetric_difference_update({UserID(member.id)})
+                self.changed = True
+
+    def remove_member(self, member: discord.Member) -> None:
+        for channel_name, viewers in (self.channels or {}).items():
+            if self.locations[channel_name].guild_id == member.guild.id and member.id in viewers:
+                viewers.discard(UserID(member.id))
+                self.changed = True
+
+    def _is_cached(self, channel: discord.abc.GuildChannel) -> bool:
+        location = self.locations.get(ChannelName(channel.name))
+        return location is not None and location == self._get_location(channel)
+
+    def _get_viewers(self, channel: discord.TextChannel) -> set[UserID]:
+        # channel.members already filters the guild members by the view channel permission
+        return {UserID(member.id) for member in channel.members}
+
+    def _get_location(self, channel: discord.abc.GuildChannel) -> ChannelPlacement:
+        return ChannelPlacement(channel.guild.id, channel.category.name if channel.category else "")
+
+
 class SubnetConfigManager:
     """
     This class provides functionality for updating the config
@@ -76,6 +189,8 @@ class SubnetConfigManager:
         self.config = config
         self.logger = logger
         self.subnets_config: list[DiscordSubnetConfig]
+        self.member_cache = ChannelMemberCache(bot._is_managed_channel)
+        self.sync_executor = SyncExecutor(logger)
 
     @tasks.loop(minutes=10)  # Adjust the interval as needed
     async def update_config_and_synchronize(self) -> None:
@@ -88,7 +203,6 @@ class SubnetConfigManager:
             await self.load_config_from_remote_repo()
             await self.synchronize_discord_with_subnet_config()
             self.logger.info("Synchronization complete.")
-            DiscordSubnetConfigFactory.reset_state()
         except Exception:
             self.logger.exception("Unexpected error during remote repo synchronization")
 
@@ -99,9 +213,11 @@ class SubnetConfigManager:
         async with aiohttp.ClientSession() as session:
             async with session.get(self.config["SUBNET_CONFIG_URL"]) as response:
                 if response.status == 200:
-                    json_config = await response.json()
+                    raw_config = await response.read()
                     try:
-                        self.subnets_config = DiscordSubnetConfigFactory.get_subnets_config(self.logger, json_config)
+                        self.subnets_config = DiscordSubnetConfigFactory.get_subnets_config_from_json(
+                            self.logger, raw_config
+                        )
                         self.logger.info("Configuration fetched and processed successfully.")
                     except (ValidationError, ValueError) as e:
                         self.logger.exception(f"Configuration processing failed: {e}")
@@ -113,52 +229,194 @@ class SubnetConfigManager:
     async def synchronize_discord_with_subnet_config(self) -> None:
         """
         Synchronizes the Discord server's users and channels with the subnet config from the remote repo:
-        - Invites users that are not yet on the server but listed in the config.
+        - Invites users that are not yet on the server but listed in the config, and grants them
+          access to the channels once they join.
         - Revokes users access if their ID is not listed on subnet config.
         - Creates channels that are not yet on the server but listed in the config.
         - Archives channels that are on the server but not listed in the config.
-        """
+        - Moves channels to the guild and category assigned by the bot's placement map.
 
-        guild = await self.bot._get_guild_or_raise(int(self.config["GUILD_ID"]))
+        Only the difference against the cached server state is applied. The cycle is skipped altogether
+        if the config matches the last applied one and no gateway event has changed the cached state since.
+        Operations run through the sync executor; if any of them fails, the remaining ones still run and
+        the cycle raises `SynchronizationError` without recording the config as applied.
+        """
 
-        current_channels_users_mapping = self.get_current_channel_user_mapping(guild)
         desired_channels_to_users_mapping = self.get_desired_channel_user_mapping()
+        desired_hash = hash_channel_user_mapping(desired_channels_to_users_mapping)
+        if not self.member_cache.changed and desired_hash == await self.get_last_applied_hash():
+            self.logger.info("Subnet config and Discord server unchanged since last synchronization, skipping.")
+            return
+
+        guilds = {guild.id: guild for guild in await self.bot._get_guilds()}
+        if self.member_cache.channels is None:
+            self.member_cache.rebuild(list(guilds.values()))
+        # events caused by the changes below mark the cache changed again
+        self.member_cache.changed = False
+        try:
+            await self._apply_changes(guilds, desired_channels_to_users_mapping, desired_hash)
+        except BaseException:
+            self.member_cache.changed = True
+            raise
+
+    async def _apply_changes(
+        self,
+        guilds: dict[int, discord.Guild],
+        desired_channels_to_users_mapping: dict[ChannelName, list[UserID]],
+        desired_hash: str,
+    ) -> None:
+        current_channels_users_mapping = self.member_cache.mapping()
+        current_locations = dict(self.member_cache.locations)
+        placement_map = self.bot.placement_map
 
         missing_channels, channels_to_archieve = self.determine_missing_and_unnecessary_channels(
             current_channels_users_mapping.keys(), desired_channels_to_users_mapping.keys()
         )
-        tasks = [
-            *(self.bot._archieve_channel(guild, channel_name) for channel_name in channels_to_archieve),
-            *(self.bot._create_channel(guild, channel_name) for channel_name in missing_channels),
-        ]
-
-        await asyncio.gather(*tasks)
+        # channels in the wrong category are moved within their guild; channels in the wrong guild
+        # are archived there and created in the right one
+        channels_to_move = {}
+        for channel_name in current_channels_users_mapping.keys() & desired_channels_to_users_mapping.keys():
+            location, placement = current_locations[channel_name], placement_map.place_channel(channel_name)
+            if location.guild_id != placement.guild_id:
+                channels_to_archieve.add(channel_name)
+                missing_channels.add(channel_name)
+                current_channels_users_mapping[channel_name] = set()
+            elif location != placement:
+                channels_to_move[channel_name] = placement
+
+        channels_report = await self.sync_executor.run_phase(
+            "channels",
+            [
+                *(
+                    SyncOperation(
+                        "edit_channel",
+                        f"archive {name}",
+                        self.bot._archieve_channel(guilds[current_locations[name].guild_id], name),
+                    )
+                    for name in channels_to_archieve
+                ),
+                *(
+                    SyncOperation(
+                        "edit_channel",
+                        f"move {name} to {placement.category_name}",
+                        self.bot._move_channel(guilds[placement.guild_id], name, placement.category_name),
+                    )
+                    for name, placement in channels_to_move.items()
+                ),
+                *(
+                    SyncOperation(
+                        "create_channel",
+                        f"create {name}",
+                        self.bot._create_channel(guilds[placement_map.place_channel(name).guild_id], name),
+                    )
+                    for name in missing_channels
+                ),
+            ],
+        )
 
-        tasks = []
-        updated_channels_to_users_mapping = self.get_current_channel_user_mapping(guild)
+        bot_user_ids = {UserID(guild.me.id) for guild in guilds.values()}
+        operations = []
+        users_to_add, users_to_revoke = [], []
         for channel_name, desired_maintainer_ids in desired_channels_to_users_mapping.items():
             missing_users, users_to_remove = self.determine_missing_and_unnecessary_users(
-                set(updated_channels_to_users_mapping[channel_name]), set(desired_maintainer_ids)
+                current_channels_users_mapping.get(channel_name, set()), set(desired_maintainer_ids)
+            )
+            users_to_remove -= bot_user_ids
+            users_to_add.extend((channel_name, user) for user in missing_users)
+            users_to_revoke.extend((channel_name, member_id) for member_id in users_to_remove)
+            operations.extend(
+                SyncOperation(
+                    "set_permissions",
+                    f"revoke {member_id} from {channel_name}",
+                    self.bot._revoke_channel_permissions(member_id, channel_name),
+                )
+                for member_id in users_to_remove
             )
-            tasks.extend(self.bot._send_invite_or_grant_permissions(user, channel_name) for user in missing_users)
-            tasks.extend(self.bot._revoke_channel_permissions(member_id, channel_name) for member_id in users_to_remove)
 
-        await asyncio.gather(*tasks)
+        # users already on the server are granted access, the others are invited (once per guild)
+        # and granted access when they join
+        pending_invites = []
+        for channel_name, user in users_to_add:
+            guild = guilds[placement_map.place_channel(channel_name).guild_id]
+            if guild.get_member(user) is None:
+                pending_invites.append((guild.id, user, channel_name))
+            else:
+                operations.append(
+                    SyncOperation(
+                        "set_permissions",
+                        f"grant {user} {channel_name}",
+                        self.bot._grant_channel_permissions(user, channel_name),
+                    )
+                )
+        invites_to_send = await self.bot.pending_invites.add(pending_invites)
+        operations.extend(
+            SyncOperation(
+                "invite",
+                f"invite {user} to {channel_name}",
+                self._send_invite_link(guild_id, user, channel_name),
+            )
+            for (guild_id, user), channel_name in invites_to_send.items()
+        )
 
-    def get_current_channel_user_mapping(self, guild: discord.Guild) -> dict[ChannelName, list[UserID]]:
-        channels_to_users = {}
-        for channel in guild.text_channels:
-            if self.bot._is_bot_channel(channel.name):
-                users_in_channel = [
-                    UserID(member.id) for member in channel.members if channel.permissions_for(member).view_channel
-                ]
-                channels_to_users[ChannelName(channel.name)] = users_in_channel
-        return channels_to_users
+        members_report = await self.sync_executor.run_phase("members", operations)
+
+        failed = len(channels_report.errors) + len(members_report.errors)
+        if failed:
+            raise SynchronizationError(f"{failed} synchronization operations failed.")
+
+        await self.record_applied_state(
+            desired_channels_to_users_mapping,
+            desired_hash,
+            changes={
+                "created_channels": sorted(missing_channels),
+                "archived_channels": sorted(channels_to_archieve),
+                "moved_channels": sorted(channels_to_move),
+                "added_users": sorted(users_to_add),
+                "revoked_users": sorted(users_to_revoke),
+                "phase_durations": {
+                    report.name: round(report.duration, 3) for report in (channels_report, members_report)
+                },
+            },
+        )
+
+    async def _send_invite_link(self, guild_id: int, user_id: UserID, channel_name: ChannelName) -> None:
+        try:
+            await self.bot._send_invite_link(user_id, channel_name)
+        except Exception:
+            await self.bot.pending_invites.forget_invite(guild_id, user_id)
+            raise
+
+    async def get_last_applied_hash(self) -> str | None:
+        state = await self.bot.redis_client.get(SYNC_STATE_KEY)
+        return json.loads(state)["hash"] if state else None
+
+    async def record_applied_state(
+        self, mapping: dict[ChannelName, list[UserID]], mapping_hash: str, changes: dict[str, Any]
+    ) -> None:
+        """
+        Persist the applied config with its hash, and append the applied changes to the sync journal.
+        """
+        synchronized_at = datetime.now(tz=UTC).isoformat()
+        async with self.bot.redis_client.pipeline(transaction=True) as pipe:
+            pipe.set(
+                SYNC_STATE_KEY,
+                json.dumps({"hash": mapping_hash, "synchronized_at": synchronized_at, "mapping": mapping}),
+            )
+            pipe.lpush(
+                SYNC_JOURNAL_KEY, json.dumps({"hash": mapping_hash, "synchronized_at": synchronized_at, **changes})
+            )
+            pipe.ltrim(SYNC_JOURNAL_KEY, 0, SYNC_JOURNAL_MAX_LENGTH - 1)
+            await pipe.execute()
 
     def get_desired_channel_user_mapping(self) -> dict[ChannelName, list[UserID]]:
         channels_to_users = {}
         for subnet_config in self.subnets_config:
             channel_name = subnet_config.generate_channel_name()
+            try:
+                self.bot.placement_map.place_channel(channel_name)
+            except PlacementError as e:
+                self.logger.error(f"Not synchronizing channel {channel_name}: {e}")
+                continue
             channels_to_users[channel_name] = subnet_config.maintainers_ids
         return channels_to_users
 
@@ -0,0 +1,115 @@
+"""
+Executor for the REST calls issued by a Discord synchronization.
+
+Operations run with a bounded concurrency and are paced per route by token buckets, so a large
+synchronization does not burst into Discord's rate limits. Every operation's outcome is collected:
+one failing operation does not abort the others.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Coroutine
+from dataclasses import dataclass, field
+from typing import Any
+
+MAX_CONCURRENT_OPERATIONS = 5
+# route: (burst capacity, tokens refilled per second)
+ROUTE_RATE_LIMITS: dict[str, tuple[int, float]] = {
+    "create_channel": (2, 0.5),
+    "edit_channel": (2, 0.5),
+    "set_permissions": (5, 1.0),
+    "invite": (5, 1.0),
+}
+DEFAULT_RATE_LIMIT = (5, 1.0)
+
+
+class TokenBucket:
+    def __init__(self, capacity: int, refill_per_second: float) -> None:
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.refill_per_second)
+
+
+@dataclass
+class SyncOperation:
+    route: str
+    description: str
+    coroutine: Coroutine[Any, Any, Any]
+
+
+@dataclass
+class OperationResult:
+    description: str
+    duration: float
+    error: BaseException | None = None
+
+
+@dataclass
+class SyncPhaseReport:
+    name: str
+    duration: float = 0.0
+    results: list[OperationResult] = field(default_factory=list)
+
+    @property
+    def errors(self) -> list[OperationResult]:
+        return [result for result in self.results if result.error is not None]
+
+
+class SyncExecutor:
+    def __init__(
+        self,
+        logger: logging.Logger,
+        max_concurrency: int = MAX_CONCURRENT_OPERATIONS,
+        rate_limits: dict[str, tuple[int, float]] | None = None,
+    ) -> None:
+        self.logger = logger
+        self.max_concurrency = max_concurrency
+        self.rate_limits = ROUTE_RATE_LIMITS if rate_limits is None else rate_limits
+        self._buckets: dict[str, TokenBucket] = {}
+
+    async def run_phase(self, name: str, operations: list[SyncOperation]) -> SyncPhaseReport:
+        """
+        Run the operations of a synchronization phase and report the outcome of each of them.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        report = SyncPhaseReport(name)
+        started_at = time.monotonic()
+        report.results = await asyncio.gather(*(self._run(operation, semaphore) for operation in operations))
+        report.duration = time.monotonic() - started_at
+
+        self.logger.info(
+            f"Sync phase '{name}': {len(operations)} operations, {len(report.errors)} failed, "
+            f"took {report.duration:.2f}s."
+        )
+        for result in report.errors:
+            self.logger.error(f"Sync operation '{result.description}' failed: {result.error!r}")
+        return report
+
+    async def _run(self, operation: SyncOperation, semaphore: asyncio.Semaphore) -> OperationResult:
+        async with semaphore:
+            await self._get_bucket(operation.route).acquire()
+            started_at = time.monotonic()
+            try:
+                await operation.coroutine
+            except Exception as e:
+                return OperationResult(operation.description, time.monotonic() - started_at, e)
+            return OperationResult(operation.description, time.monotonic() - started_at)
+
+    def _get_bucket(self, route: str) -> TokenBucket:
+        if route not in self._buckets:
+            self._buckets[route] = TokenBucket(*self.rate_limits.get(route, DEFAULT_RATE_LIMIT))
+        return self._buckets[route]
@@ -0,0 +1 @@
+from auto_validator.core.tests.conftest import redis_client  # noqa: F401
@@ -0,0 +1,82 @@
+from unittest.mock import MagicMock
+
+import discord
+import pytest
+
+from auto_validator.discord_bot.channel_index import ChannelIndex, parse_channel_name
+from auto_validator.discord_bot.placement import PlacementMap
+
+CATEGORY_NAME = "Subnets"
+
+
+def make_channel(channel_id, name, category_name=CATEGORY_NAME):
+    channel = MagicMock(spec=discord.TextChannel)
+    channel.id = channel_id
+    channel.name = name
+    channel.category.name = category_name
+    return channel
+
+
+@pytest.fixture
+def index():
+    guild = MagicMock(spec=discord.Guild)
+    guild.text_channels = [
+        make_channel(1, "001-apex"),
+        make_channel(2, "t001-apex-test"),
+        make_channel(3, "d1024-devsubnet", category_name=f"{CATEGORY_NAME}-2"),
+        make_channel(4, "012-archived", category_name="Archive"),
+        make_channel(5, "general"),
+    ]
+    index = ChannelIndex(PlacementMap([1], CATEGORY_NAME).is_bot_category)
+    index.rebuild([guild])
+    return index
+
+
+@pytest.mark.parametrize(
+    "realm,subnet_identifier,channel_id",
+    [
+        ("mainnet", "apex", 1),
+        ("mainnet", "1", 1),
+        ("mainnet", 1, 1),
+        ("testnet", "apex-test", 2),
+        ("testnet", "001", 2),
+        ("devnet", "1024", 3),
+        ("testnet", "apex", None),
+        ("mainnet", "12", None),
+        ("mainnet", "archived", None),
+    ],
+)
+def test_get_channel_id(index, realm, subnet_identifier, channel_id):
+    assert index.get_channel_id(realm, subnet_identifier) == channel_id
+
+
+def test_index_follows_channel_events(index):
+    created = make_channel(6, "t002-new")
+    index.add(created)
+    assert index.get_channel_id("testnet", "2") == 6
+
+    renamed = make_channel(6, "t002-renamed")
+    index.update(created, renamed)
+    assert index.get_channel_id("testnet", "new") is None
+    assert index.get_channel_id("testnet", "renamed") == 6
+
+    archived = make_channel(1, "001-apex", category_name="Archive")
+    index.update(make_channel(1, "001-apex"), archived)
+    assert index.get_channel_id("mainnet", "apex") is None
+
+    index.remove(renamed)
+    assert index.get_channel_id("testnet", "2") is None
+
+
+@pytest.mark.parametrize(
+    "channel_name,parsed",
+    [
+        ("001-apex", ("mainnet", 1, "apex")),
+        ("t042-sn-42", ("testnet", 42, "sn-42")),
+        ("d12345-x", ("devnet", 12345, "x")),
+        ("general", None),
+        ("01-short", None),
+    ],
+)
+def test_parse_channel_name(channel_name, parsed):
+    assert parse_channel_name(channel_name) == parsed
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from auto_validator.discord_bot.channel_sender import MAX_MESSAGE_LENGTH, ChannelSender, split_message
+
+logger = logging.getLogger(__name__)
+
+
+class FakeChannel:
+    def __init__(self, channel_id=1, fail=False):
+        self.id = channel_id
+        self.fail = fail
+        self.sent = []
+
+    async def send(self, text):
+        if self.fail:
+            raise RuntimeError("Discord is down")
+        self.sent.append((time.monotonic(), text))
+
+
+def test_messages_within_window_are_coalesced():
+    channel = FakeChannel()
+    other_channel = FakeChannel(channel_id=2)
+
+    async def main():
+        sender = ChannelSender(logger, coalesce_window=0.05)
+        sends = [sender.send(channel, f"validator {i} uploaded logs") for i in range(30)]
+        sends.append(sender.send(other_channel, "hello"))
+        tasks = [asyncio.create_task(send) for send in sends]
+        await asyncio.sleep(0)
+        assert sender.queue_depths() == {1: 30, 2: 1}
+        assert REGISTRY.get_sample_value("auto_validator_discord_send_queue_depth") == 31
+        await asyncio.gather(*tasks)
+        assert sender.queue_depths() == {}
+        assert REGISTRY.get_sample_value("auto_validator_discord_send_queue_depth") == 0
+
+    asyncio.run(main())
+
+    assert [text for _, text in channel.sent] == ["\n".join(f"validator {i} uploaded logs" for i in range(30))]
+    assert [text for _, text in other_channel.sent] == ["hello"]
+
+
+def test_long_batches_are_split_and_rate_limited():
+    channel = FakeChannel()
+    messages = ["x" * 1500 for _ in range(4)] + ["y" * 4500]
+
+    async def main():
+        sender = ChannelSender(logger, coalesce_window=0, rate_limit_messages=2, rate_limit_period=0.2)
+        await asyncio.gather(*(sender.send(channel, message) for message in messages))
+
+    asyncio.run(main())
+
+    texts = [text for _, text in channel.sent]
+    assert texts == ["x" * 1500] * 4 + ["y" * 2000, "y" * 2000, "y" * 500]
+    assert all(len(text) <= MAX_MESSAGE_LENGTH for text in texts)
+    sent_at = [at for at, _ in channel.sent]
+    assert all(later - earlier >= 0.19 for earlier, later in zip(sent_at, sent_at[2:]))
+
+
+def test_failed_send_fails_every_waiting_message():
+    channel = FakeChannel(fail=True)
+
+    async def main():
+        sender = ChannelSender(logger, coalesce_window=0)
+        return await asyncio.gather(*(sender.send(channel, str(i)) for i in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+
+    assert [str(result) for result in results] == ["Discord is down"] * 3
+
+
+@pytest.mark.parametrize(
+    "message,parts",
+    [
+        ("short", ["short"]),
+        ("a" * 1500 + "\n" + "b" * 1500, ["a" * 1500, "b" * 1500]),
+        ("c" * 2001, ["c" * 2000, "c"]),
+    ],
+)
+def test_split_message(message, parts):
+    assert split_message(message) == parts
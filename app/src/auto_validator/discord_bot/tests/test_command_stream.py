@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from auto_validator.core.utils.bot import (
+    BOT_COMMANDS_DEAD_LETTER_STREAM,
+    BOT_COMMANDS_GROUP,
+    BOT_COMMANDS_STREAM,
+    BotNotifier,
+    get_bot_command_stats,
+)
+from auto_validator.core.utils.redis_pool import get_async_redis_client
+from auto_validator.discord_bot import command_stream
+from auto_validator.discord_bot.command_stream import CommandStreamConsumer
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(*commands):
+    notifier = BotNotifier()
+    for command in commands:
+        notifier._queue.put(command)
+    notifier.flush()
+
+
+async def run_consumer(handler, until, consumer_name="discord-bot"):
+    redis_client = get_async_redis_client()
+    consumer = CommandStreamConsumer(redis_client, handler, logger, consumer_name=consumer_name)
+    task = asyncio.create_task(consumer.run())
+    try:
+        async with asyncio.timeout(5):
+            while not until():
+                await asyncio.sleep(0.01)
+            await asyncio.gather(*consumer._tasks)
+    finally:
+        task.cancel()
+        await redis_client.close()
+
+
+@pytest.fixture(autouse=True)
+def short_block(monkeypatch):
+    monkeypatch.setattr(command_stream, "READ_BLOCK_MS", 10)
+
+
+def test_commands_are_acknowledged_after_handling(redis_client):
+    enqueue(*(f'{{"action": "send_message", "message": "{i}"}}' for i in range(20)))
+    handled = []
+
+    async def handler(command):
+        handled.append(command["message"])
+
+    asyncio.run(run_consumer(handler, until=lambda: len(handled) == 20))
+
+    assert sorted(handled, key=int) == [str(i) for i in range(20)]
+    assert redis_client.xlen(BOT_COMMANDS_STREAM) == 0
+    assert get_bot_command_stats() | {"enqueued": 20, "acked": 20, "lag": 0, "pending": 0} == get_bot_command_stats()
+
+
+def test_permanent_failure_is_dead_lettered(redis_client):
+    enqueue('{"action": "unknown"}')
+
+    async def handler(command):
+        raise ValueError(f"Unknown bot command action: {command['action']!r}")
+
+    asyncio.run(run_consumer(handler, until=lambda: redis_client.xlen(BOT_COMMANDS_DEAD_LETTER_STREAM) == 1))
+
+    [(_, fields)] = redis_client.xrange(BOT_COMMANDS_DEAD_LETTER_STREAM)
+    assert fields[b"command"] == b'{"action": "unknown"}'
+    assert fields[b"deliveries"] == b"1"
+    assert redis_client.xlen(BOT_COMMANDS_STREAM) == 0
+    assert get_bot_command_stats()["dead_lettered"] == 1
+
+
+def test_unacknowledged_command_of_crashed_consumer_is_reclaimed(redis_client, monkeypatch):
+    monkeypatch.setattr(command_stream, "RECLAIM_IDLE_MS", 1)
+    enqueue('{"action": "send_message", "message": "hello"}')
+    redis_client.xgroup_create(BOT_COMMANDS_STREAM, BOT_COMMANDS_GROUP, id="0")
+    # a consumer that received the command and crashed before acknowledging it
+    redis_client.xreadgroup(BOT_COMMANDS_GROUP, "crashed-bot", {BOT_COMMANDS_STREAM: ">"})
+    time.sleep(0.01)
+    handled = []
+
+    async def handler(command):
+        handled.append(command["message"])
+
+    asyncio.run(run_consumer(handler, until=lambda: handled == ["hello"]))
+
+    assert get_bot_command_stats() | {"retried": 1, "acked": 1, "pending": 0} == get_bot_command_stats()
@@ -0,0 +1,50 @@
+import asyncio
+
+from auto_validator.core.utils.redis_pool import get_async_redis_client
+from auto_validator.discord_bot.pending_invites import PENDING_INVITE_TTL, PendingInviteStore
+
+
+async def with_store(callback):
+    redis_client = get_async_redis_client()
+    try:
+        return await callback(PendingInviteStore(redis_client))
+    finally:
+        await redis_client.close()
+
+
+def test_invite_link_is_sent_once_per_guild(redis_client):
+    async def add_twice(store):
+        first = await store.add([(1, 11, "001-apex"), (1, 11, "002-beta"), (2, 11, "t003-gamma"), (1, 12, "001-apex")])
+        second = await store.add([(1, 11, "004-delta"), (1, 12, "001-apex")])
+        return first, second
+
+    first, second = asyncio.run(with_store(add_twice))
+
+    assert first == {(1, 11): "001-apex", (2, 11): "t003-gamma", (1, 12): "001-apex"}
+    assert second == {}
+    assert redis_client.smembers("pending_users:1:11") == {b"001-apex", b"002-beta", b"004-delta"}
+    assert 0 < redis_client.ttl("pending_users:1:11") <= PENDING_INVITE_TTL
+    assert 0 < redis_client.ttl("invited_users:1:11") <= PENDING_INVITE_TTL
+
+
+def test_pop_returns_and_clears_pending_channels(redis_client):
+    async def add_and_pop(store):
+        await store.add([(1, 11, "002-beta"), (1, 11, "001-apex"), (2, 11, "t003-gamma")])
+        channels = await store.pop(1, 11)
+        return channels, await store.add([(1, 11, "001-apex")])
+
+    channels, invites = asyncio.run(with_store(add_and_pop))
+
+    assert channels == ["001-apex", "002-beta"]
+    # the user left and is invited again
+    assert invites == {(1, 11): "001-apex"}
+    assert redis_client.smembers("pending_users:2:11") == {b"t003-gamma"}
+
+
+def test_failed_invite_can_be_sent_again(redis_client):
+    async def add_forget_add(store):
+        await store.add([(1, 11, "001-apex")])
+        await store.forget_invite(1, 11)
+        return await store.add([(1, 11, "001-apex")])
+
+    assert asyncio.run(with_store(add_forget_add)) == {(1, 11): "001-apex"}
@@ -0,0 +1,66 @@
+import pytest
+
+from auto_validator.discord_bot.placement import (
+    MAX_CHANNELS_PER_GUILD,
+    NETUIDS_PER_GUILD,
+    REALMS,
+    ChannelPlacement,
+    PlacementError,
+    PlacementMap,
+)
+
+
+@pytest.mark.parametrize(
+    "guild_ids,realm,netuid,placement",
+    [
+        ([1], "mainnet", 0, (1, "bot-channels")),
+        ([1], "devnet", 15, (1, "bot-channels")),
+        ([1], "devnet", 16, (1, "bot-channels-2")),
+        ([1], "mainnet", 17, (1, "bot-channels-2")),
+        ([1, 2], "mainnet", 17, (1, "bot-channels-2")),
+        ([1, 2], "testnet", 150, (2, "bot-channels")),
+        ([1, 2, 3], "devnet", 449, (3, "bot-channels-9")),
+    ],
+)
+def test_place(guild_ids, realm, netuid, placement):
+    assert PlacementMap(guild_ids, "bot-channels").place(realm, netuid) == ChannelPlacement(*placement)
+
+
+def test_categories_are_filled_up_to_the_limit():
+    placement_map = PlacementMap([1, 2], "bot-channels")
+    placements = [placement_map.place(realm, netuid) for realm in REALMS for netuid in range(2 * NETUIDS_PER_GUILD)]
+
+    assert max(placements.count(placement) for placement in set(placements)) == 50
+
+
+def test_guilds_stay_below_the_channel_limit():
+    placement_map = PlacementMap([1, 2], "bot-channels")
+    placements = [placement_map.place(realm, netuid) for realm in REALMS for netuid in range(2 * NETUIDS_PER_GUILD)]
+
+    for guild_id in (1, 2):
+        channels = [placement for placement in placements if placement.guild_id == guild_id]
+        categories = {placement.category_name for placement in channels}
+        assert len(channels) + len(categories) <= MAX_CHANNELS_PER_GUILD
+
+
+def test_adding_a_guild_moves_no_channels():
+    channels = [(realm, netuid) for realm in REALMS for netuid in range(NETUIDS_PER_GUILD)]
+
+    before = [PlacementMap([1], "bot-channels").place(*channel) for channel in channels]
+    after = [PlacementMap([1, 2], "bot-channels").place(*channel) for channel in channels]
+
+    assert before == after
+    assert PlacementMap([1, 2], "bot-channels").place("mainnet", NETUIDS_PER_GUILD).guild_id == 2
+
+
+def test_netuid_beyond_all_guilds():
+    with pytest.raises(PlacementError, match="No guild has room for netuid 150"):
+        PlacementMap([1], "bot-channels").place("mainnet", NETUIDS_PER_GUILD)
+
+
+@pytest.mark.parametrize(
+    "category_name,is_bot_category",
+    [("bot-channels", True), (" Bot-Channels-3", True), ("Archive", False), ("bot-channels-old", False)],
+)
+def test_is_bot_category(category_name, is_bot_category):
+    assert PlacementMap([1], "bot-channels").is_bot_category(category_name) is is_bot_category
@@ -0,0 +1,227 @@
+import asyncio
+import functools
+import json
+import logging
+import re
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import discord
+import pytest
+
+from auto_validator.core.utils.redis_pool import get_async_redis_client
+from auto_validator.discord_bot.bot import DiscordBot
+from auto_validator.discord_bot.pending_invites import PendingInviteStore
+from auto_validator.discord_bot.placement import NETUIDS_PER_GUILD, PlacementMap
+from auto_validator.discord_bot.subnet_config import (
+    SYNC_JOURNAL_KEY,
+    SYNC_STATE_KEY,
+    DiscordSubnetConfig,
+    DiscordSubnetConfigFactory,
+    SubnetConfigManager,
+)
+from auto_validator.discord_bot.sync_executor import ROUTE_RATE_LIMITS, SyncExecutor
+
+BOT_ID = 100000000000000000
+ALICE = 111111111111111111
+BOB = 222222222222222222
+CAROL = 333333333333333333
+CATEGORY_NAME = "bot-channels"
+
+
+def make_member(user_id):
+    member = MagicMock(spec=discord.Member)
+    member.id = user_id
+    return member
+
+
+def make_guild(guild_id):
+    guild = MagicMock(spec=discord.Guild)
+    guild.id = guild_id
+    guild.me.id = BOT_ID
+    guild.text_channels = []
+    # Carol has not joined the server yet
+    guild.get_member.side_effect = lambda user_id: None if user_id == CAROL else make_member(user_id)
+    return guild
+
+
+def make_channel(name, member_ids, guild, category_name=CATEGORY_NAME):
+    channel = MagicMock(spec=discord.TextChannel)
+    channel.name = name
+    channel.guild = guild
+    channel.category.name = category_name
+    channel.members = [make_member(user_id) for user_id in member_ids]
+    guild.text_channels.append(channel)
+    return channel
+
+
+def make_manager(guilds):
+    bot = MagicMock()
+    bot.config = {"GUILD_IDS": [guild.id for guild in guilds]}
+    bot.placement_map = PlacementMap(bot.config["GUILD_IDS"], CATEGORY_NAME)
+    bot._is_bot_channel = functools.partial(DiscordBot._is_bot_channel, bot)
+    bot._is_managed_channel = functools.partial(DiscordBot._is_managed_channel, bot)
+    bot._get_guilds = AsyncMock(return_value=guilds)
+    bot._archieve_channel = AsyncMock()
+    bot._move_channel = AsyncMock()
+    bot._create_channel = AsyncMock()
+    bot._grant_channel_permissions = AsyncMock()
+    bot._send_invite_link = AsyncMock()
+    bot._revoke_channel_permissions = AsyncMock()
+    manager = SubnetConfigManager(bot, logging.getLogger(__name__), bot.config)
+    manager.sync_executor = SyncExecutor(manager.logger, rate_limits=dict.fromkeys(ROUTE_RATE_LIMITS, (100, 100.0)))
+    manager.subnets_config = [
+        DiscordSubnetConfig(maintainers_ids=[ALICE, BOB], subnet_codename="apex", netuid=1, realm="mainnet"),
+        DiscordSubnetConfig(maintainers_ids=[CAROL], subnet_codename="new", netuid=3, realm="testnet"),
+    ]
+    return manager
+
+
+def synchronize(manager):
+    async def main():
+        manager.bot.redis_client = get_async_redis_client()
+        manager.bot.pending_invites = PendingInviteStore(manager.bot.redis_client)
+        try:
+            await manager.synchronize_discord_with_subnet_config()
+        finally:
+            await manager.bot.redis_client.close()
+
+    asyncio.run(main())
+
+
+def test_synchronization_applies_only_changes(redis_client):
+    guild = make_guild(1)
+    apex = make_channel("001-apex", [BOT_ID, ALICE], guild)
+    make_channel("002-old", [BOT_ID, CAROL], guild)
+    make_channel("general", [ALICE], guild)
+    manager = make_manager([guild])
+    bot = manager.bot
+
+    synchronize(manager)
+
+    bot._archieve_channel.assert_awaited_once_with(guild, "002-old")
+    bot._create_channel.assert_awaited_once_with(guild, "t003-new")
+    bot._grant_channel_permissions.assert_awaited_once_with(BOB, "001-apex")
+    bot._send_invite_link.assert_awaited_once_with(CAROL, "t003-new")
+    assert redis_client.smembers(f"pending_users:1:{CAROL}") == {b"t003-new"}
+    bot._revoke_channel_permissions.assert_not_awaited()
+    [journal_entry] = [json.loads(entry) for entry in redis_client.lrange(SYNC_JOURNAL_KEY, 0, -1)]
+    assert journal_entry["added_users"] == [["001-apex", BOB], ["t003-new", CAROL]]
+    assert journal_entry["hash"] == json.loads(redis_client.get(SYNC_STATE_KEY))["hash"]
+
+    # gateway events caused by the changes
+    apex.members.append(make_member(BOB))
+    manager.member_cache.refresh_channel(apex)
+    manager.member_cache.refresh_channel(make_channel("t003-new", [BOT_ID], guild))
+    bot.reset_mock()
+    synchronize(manager)
+
+    # Carol is still pending, but not invited again
+    assert not bot._create_channel.await_count + bot._grant_channel_permissions.await_count
+    bot._send_invite_link.assert_not_awaited()
+    assert redis_client.llen(SYNC_JOURNAL_KEY) == 2
+
+    bot.reset_mock()
+    synchronize(manager)
+
+    assert not bot._archieve_channel.await_count + bot._grant_channel_permissions.await_count
+    assert redis_client.llen(SYNC_JOURNAL_KEY) == 2
+
+    # a gateway event: Alice's access to the channel was removed by hand
+    apex.members = [make_member(BOT_ID), make_member(BOB)]
+    manager.member_cache.refresh_channel(apex)
+    synchronize(manager)
+
+    bot._grant_channel_permissions.assert_awaited_once_with(ALICE, "001-apex")
+    assert redis_client.llen(SYNC_JOURNAL_KEY) == 3
+
+
+def test_synchronization_places_channels_across_guilds(redis_client):
+    first_guild, second_guild = make_guild(10), make_guild(20)
+    # netuid 1 belongs to the first guild, and t003 to the first category of the second one
+    make_channel("001-apex", [BOT_ID, ALICE, BOB], second_guild)
+    make_channel("t003-new", [BOT_ID, CAROL], second_guild, category_name=f"{CATEGORY_NAME}-2")
+    manager = make_manager([first_guild, second_guild])
+    bot = manager.bot
+    # two netuids per guild, so that the test subnets span guilds
+    bot.placement_map = PlacementMap(bot.config["GUILD_IDS"], CATEGORY_NAME, netuids_per_guild=2)
+
+    synchronize(manager)
+
+    bot._archieve_channel.assert_awaited_once_with(second_guild, "001-apex")
+    bot._create_channel.assert_awaited_once_with(first_guild, "001-apex")
+    bot._move_channel.assert_awaited_once_with(second_guild, "t003-new", CATEGORY_NAME)
+    assert sorted(call.args for call in bot._grant_channel_permissions.await_args_list) == [
+        (ALICE, "001-apex"),
+        (BOB, "001-apex"),
+    ]
+    bot._revoke_channel_permissions.assert_not_awaited()
+
+
+def test_synchronization_skips_subnets_no_guild_has_room_for(redis_client):
+    guild = make_guild(1)
+    manager = make_manager([guild])
+    manager.subnets_config.append(
+        DiscordSubnetConfig(maintainers_ids=[ALICE], subnet_codename="far", netuid=NETUIDS_PER_GUILD, realm="mainnet")
+    )
+
+    synchronize(manager)
+
+    assert sorted(call.args[1] for call in manager.bot._create_channel.await_args_list) == ["001-apex", "t003-new"]
+
+
+def make_subnets_config(count):
+    realms = ("mainnet", "testnet", "devnet")
+    return {
+        "subnets": [
+            {
+                "maintainers_ids": [ALICE + i, BOB],
+                "subnet_codename": f"subnet-{i}",
+                "netuid": i // len(realms),
+                "realm": realms[i % len(realms)],
+            }
+            for i in range(count)
+        ]
+    }
+
+
+@pytest.fixture(autouse=True)
+def empty_subnets_config_cache(monkeypatch):
+    monkeypatch.setattr(DiscordSubnetConfigFactory, "_validated_subnets", {})
+
+
+@pytest.mark.parametrize(
+    "subnet,error",
+    [
+        ({"maintainers_ids": [12345]}, "greater than or equal to 100000000000000000"),
+        ({"maintainers_ids": (ALICE,)}, "Input should be a valid list"),
+        ({"maintainers_ids": [str(ALICE)]}, "Input should be a valid integer"),
+        ({"netuid": 0, "realm": "mainnet"}, "The combination of realm 'mainnet' and netuid '0' must be unique."),
+    ],
+)
+def test_get_subnets_config_rejects_invalid_subnet(subnet, error):
+    config_data = make_subnets_config(3)
+    config_data["subnets"].append({**config_data["subnets"][0], "subnet_codename": "other", **subnet})
+
+    with pytest.raises(ValueError, match=re.escape(error)):
+        DiscordSubnetConfigFactory.get_subnets_config(logging.getLogger(__name__), config_data)
+    # uniqueness is checked per call, so a failed call does not affect the next one
+    assert len(DiscordSubnetConfigFactory.get_subnets_config(logging.getLogger(__name__), make_subnets_config(3))) == 3
+
+
+def test_get_subnets_config_benchmark_1000_subnets():
+    raw_config = json.dumps(make_subnets_config(1000)).encode()
+    logger = logging.getLogger(__name__)
+
+    started_at = time.perf_counter()
+    subnets = DiscordSubnetConfigFactory.get_subnets_config_from_json(logger, raw_config)
+    validated_at = time.perf_counter()
+    cached_subnets = DiscordSubnetConfigFactory.get_subnets_config_from_json(logger, bytes(raw_config))
+    cached_at = time.perf_counter()
+
+    logger.info(
+        f"1000 subnets: validated in {validated_at - started_at:.4f}s, "
+        f"returned from cache in {cached_at - validated_at:.4f}s"
+    )
+    assert len({subnet.generate_channel_name() for subnet in subnets}) == 1000
+    assert all(cached is subnet for cached, subnet in zip(cached_subnets, subnets, strict=True))
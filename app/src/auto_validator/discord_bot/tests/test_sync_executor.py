@@ -0,0 +1,55 @@
+import asyncio
+import logging
+import time
+
+from auto_validator.discord_bot.sync_executor import SyncExecutor, SyncOperation
+
+logger = logging.getLogger(__name__)
+
+
+def test_run_phase_bounds_concurrency_and_collects_errors():
+    running, max_running = 0, 0
+
+    async def operation(i):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if i == 3:
+            raise RuntimeError("Missing Permissions")
+
+    async def main():
+        executor = SyncExecutor(logger, max_concurrency=4, rate_limits={"invite": (20, 1.0)})
+        return await executor.run_phase(
+            "members", [SyncOperation("invite", f"operation {i}", operation(i)) for i in range(20)]
+        )
+
+    report = asyncio.run(main())
+
+    assert max_running == 4
+    assert len(report.results) == 20
+    assert [(result.description, str(result.error)) for result in report.errors] == [
+        ("operation 3", "Missing Permissions")
+    ]
+    assert report.duration >= 0.05
+
+
+def test_run_phase_paces_operations_per_route():
+    started_at = {"create_channel": [], "invite": []}
+
+    async def operation(route):
+        started_at[route].append(time.monotonic())
+
+    async def main():
+        executor = SyncExecutor(logger, rate_limits={"create_channel": (1, 20.0), "invite": (10, 1.0)})
+        await executor.run_phase(
+            "channels",
+            [SyncOperation(route, route, operation(route)) for route in ["create_channel", "invite"] * 5],
+        )
+
+    asyncio.run(main())
+
+    created = started_at["create_channel"]
+    assert all(later - earlier >= 0.04 for earlier, later in zip(created, created[1:]))
+    assert started_at["invite"][-1] - started_at["invite"][0] < 0.04
@@ -156,6 +156,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "auto_validator.wsgi.application"
+ASGI_APPLICATION = "auto_validator.asgi.application"
 
 DATABASES = {}
 if env("DATABASE_POOL_URL"):  # DB transaction-based connection pool, such as one provided PgBouncer
@@ -209,8 +210,38 @@ else:
 CONSTANCE_BACKEND = "constance.backends.database.DatabaseBackend"
 CONSTANCE_CONFIG = {
     "API_UPLOAD_MAX_SIZE": (100 * 1024 * 1024, "API upload max size in bytes", int),
+    "UPLOAD_RATE_LIMIT_REQUESTS": (60, "Uploads per hour allowed per hotkey and per server IP, 0 for no limit", int),
+    "UPLOAD_RATE_LIMIT_BYTES": (
+        2 * 1024 * 1024 * 1024,
+        "Bytes uploaded per hour allowed per hotkey and per server IP, 0 for no limit",
+        int,
+    ),
+    "UPLOAD_RATE_LIMIT_SUBNETS": (
+        "{}",
+        'Upload limits of subnets overriding the above, as JSON keyed by subnet codename, e.g. {"apex": {"requests": 120}}',
+        str,
+    ),
 }
+# request paths read constance settings from a process-local snapshot at most this many seconds old
+CONSTANCE_SNAPSHOT_TTL = env.float("CONSTANCE_SNAPSHOT_TTL", default=10.0)
 
+REDIS_HOST = env("REDIS_HOST", default="localhost")
+REDIS_PORT = env.int("REDIS_PORT", default=8379)
+REDIS_DB = env.int("REDIS_DB", default=0)
+REDIS_MAX_CONNECTIONS = env.int("REDIS_MAX_CONNECTIONS", default=50)
+
+CHANNEL_LAYERS = {
+    "default": {
+        "BACKEND": "channels_redis.core.RedisChannelLayer",
+        "CONFIG": {
+            "hosts": [{"address": f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"}],
+        },
+    },
+}
+# validator and server status API responses are served from Redis for this long
+STATUS_API_CACHE_SECONDS = env.int("STATUS_API_CACHE_SECONDS", default=5)
+# dashboards get live status updates in batches at most this often, see auto_validator.core.utils.status_updates
+STATUS_UPDATES_TICK_SECONDS = env.float("STATUS_UPDATES_TICK_SECONDS", default=2.0)
 
 CELERY_BROKER_URL = env("CELERY_BROKER_URL", default="")
 CELERY_RESULT_BACKEND = env("CELERY_BROKER_URL", default="")  # store results in Redis
@@ -230,6 +261,14 @@ CELERY_BEAT_SCHEDULE = {  # type: ignore
         "task": "auto_validator.core.tasks.schedule_update_validator_status",
         "schedule": timedelta(seconds=60),
     },
+    "watch-chain-registrations": {
+        "task": "auto_validator.core.tasks.schedule_watch_chain_registrations",
+        "schedule": timedelta(seconds=60),
+    },
+    "apply-uploaded-files-retention": {
+        "task": "auto_validator.core.tasks.apply_uploaded_files_retention",
+        "schedule": timedelta(hours=1),
+    },
 }
 CELERY_TASK_ROUTES = ["auto_validator.celery.route_task"]
 CELERY_TASK_TIME_LIMIT = int(timedelta(minutes=5).total_seconds())
@@ -428,14 +467,43 @@ PAPERSPACE_API_KEY = env("PAPERSPACE_API_KEY", default="")
 
 SIGNATURE_EXPIRE_DURATION = env("SIGNATURE_EXPIRE_DURATION", default="300")
 
+# validators which have not set weights for more blocks are reported by the `auto_validator_validators_behind` gauge
+METRICS_VALIDATOR_BEHIND_BLOCKS = env.int("METRICS_VALIDATOR_BEHIND_BLOCKS", default=100)
+# should match the Prometheus scrape interval, see auto_validator.core.business_metrics
+BUSINESS_METRICS_CACHE_SECONDS = env.int("BUSINESS_METRICS_CACHE_SECONDS", default=15)
+
+# restart or reinstall validators over the thresholds of their subnet slot, see auto_validator.core.utils.remediation
+REMEDIATION_ENABLED = env.bool("REMEDIATION_ENABLED", default=False)
+REMEDIATION_COOLDOWN_SECONDS = env.int("REMEDIATION_COOLDOWN_SECONDS", default=int(timedelta(hours=1).total_seconds()))
+REMEDIATION_MAX_CONCURRENT_ACTIONS = env.int("REMEDIATION_MAX_CONCURRENT_ACTIONS", default=3)
+REMEDIATION_MAX_STALE_VALIDATORS = env.int("REMEDIATION_MAX_STALE_VALIDATORS", default=5)
+REMEDIATION_RESTART_COMMAND = env("REMEDIATION_RESTART_COMMAND", default="cd {remote_path} && docker compose restart")
+REMEDIATION_SSH_USER = env("REMEDIATION_SSH_USER", default="root")
+REMEDIATION_SSH_PASSPHRASE = env("REMEDIATION_SSH_PASSPHRASE", default="")
+
+# defaults of the subnet retention policies of uploaded files, see auto_validator.core.utils.retention; 0 disables
+UPLOADED_FILES_RETENTION_DAYS = env.int("UPLOADED_FILES_RETENTION_DAYS", default=90)
+UPLOADED_FILES_MAX_BYTES_PER_HOTKEY = env.int("UPLOADED_FILES_MAX_BYTES_PER_HOTKEY", default=0)
+# store new uploads zstd-compressed and once per content, see auto_validator.core.utils.file_content
+UPLOADED_FILES_COMPRESSION = env.bool("UPLOADED_FILES_COMPRESSION", default=False)
+UPLOADED_FILES_ZSTD_LEVEL = env.int("UPLOADED_FILES_ZSTD_LEVEL", default=10)
+# uploaded logs are indexed for the log search API up to this many uncompressed bytes
+LOG_INDEX_MAX_BYTES = env.int("LOG_INDEX_MAX_BYTES", default=256 * 2**20)
+
 DISCORD_BOT_TOKEN = env("DISCORD_BOT_TOKEN", default="")
 GUILD_ID = env("GUILD_ID", default="")
+# subnet channels are spread over these guilds, see auto_validator.discord_bot.placement
+GUILD_IDS = env.list("GUILD_IDS", default=[GUILD_ID] if GUILD_ID else [])
 BOT_NAME = env("BOT_NAME", default="")
 CATEGORY_NAME = env("CATEGORY_NAME", default="")
+# the bot runs outside gunicorn, so it serves its own metrics if a port is set
+DISCORD_BOT_METRICS_PORT = env.int("DISCORD_BOT_METRICS_PORT", default=None)
 
 BITTENSOR_WALLET_PATH = pathlib.Path(env("BITTENSOR_WALLET_PATH", default="/root/.bittensor/wallets"))
 BITTENSOR_WALLET_NAME = env("BITTENSOR_WALLET_NAME", default="validator")
 BITTENSOR_HOTKEY_NAME = env("BITTENSOR_HOTKEY_NAME", default="validator-hotkey")
+# coldkey whose subnet registrations are tracked; defaults to the coldkeypub of BITTENSOR_WALLET_NAME
+BITTENSOR_COLDKEY_SS58_ADDRESS = env("BITTENSOR_COLDKEY_SS58_ADDRESS", default="")
 
 LOCAL_SUBNETS_CONFIG_PATH = pathlib.Path(
     env("LOCAL_SUBNETS_CONFIG_PATH", default="~/.config/auto-validator/subnets.yaml")
@@ -4,13 +4,21 @@ from django.contrib.admin.sites import site
 from django.urls import include, path
 from fingerprint.views import FingerprintView
 
+from .core.consumers import ValidatorStatusConsumer
+from .core.metrics import metrics_view
+
 urlpatterns = [
     path("admin/", site.urls),
     path("redirect/", FingerprintView.as_view(), name="fingerprint"),
+    path("metrics", metrics_view, name="prometheus-metrics"),
     path("", include("django.contrib.auth.urls")),
     path("", include("auto_validator.core.urls")),
 ]
 
+ws_urlpatterns = [
+    path("ws/v1/validator-status/", ValidatorStatusConsumer.as_asgi()),
+]
+
 if settings.DEBUG:
     # serving media files from same domain is dangerous and should never be the case in production
     urlpatterns.extend(static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT))